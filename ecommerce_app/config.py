@@ -1,3 +1,5 @@
+import os
+
 # Database configuration
 DB_CONFIG = {
     'host': 'localhost',
@@ -6,9 +8,101 @@ DB_CONFIG = {
     'database': 'bestdatafordata'
 }
 
+# Read replicas for catalog queries; each entry overrides keys of DB_CONFIG,
+# e.g. {'host': 'replica1.example.com'}. Writes always go to DB_CONFIG.
+DB_REPLICA_CONFIG = {
+    'replicas': [],
+    'retry_after': 30,       # seconds before a failed replica is tried again
+    'read_your_writes': 5    # seconds reads stay on the primary after a write
+}
+
+# Storage backend: 'mysql' uses DB_CONFIG, 'sqlite' an embedded database file
+STORAGE_CONFIG = {
+    'backend': 'mysql',
+    'sqlite_path': os.path.join(os.path.expanduser("~"), ".cartx", "cartx.db"),
+    'mmap_size': 256 * 1024 * 1024,  # bytes of the SQLite file read through mmap
+    'cache_size_kb': 64 * 1024       # SQLite page cache per connection
+}
+
+# Connection pool settings
+DB_POOL_CONFIG = {
+    'pool_size': 5,
+    'checkout_timeout': 5,  # seconds to wait for a free connection
+    'max_idle_time': 300,   # recycle connections idle longer than this
+    'ping_interval': 30     # health-check connections idle longer than this
+}
+
+# Background query executor settings
+EXECUTOR_CONFIG = {
+    'max_workers': 4,
+    'poll_interval': 20  # milliseconds between result deliveries on the Tk thread
+}
+
+# Product catalog cache settings
+CATALOG_CONFIG = {
+    'ttl': 60,       # seconds before the cache checks the database for changes
+    'page_size': 60  # products per page while browsing an uncached catalog
+}
+
+# Product search settings
+SEARCH_CONFIG = {
+    'debounce_ms': 250,  # wait this long after the last keystroke before searching
+    'mode': 'client',    # 'client': in-memory index, 'server': ranked FULLTEXT query
+    'page_size': 50      # results per server-side search
+}
+
+# Product thumbnail cache settings
+THUMBNAIL_CONFIG = {
+    'cache_dir': os.path.join(os.path.expanduser("~"), ".cartx", "thumbnails"),
+    'max_size': 200,     # longest edge of a product thumbnail in pixels
+    'memory_items': 128,  # decoded thumbnails kept in memory
+    'workers': 2          # threads decoding and scaling images
+}
+
+# Stock reservation settings
+RESERVATION_CONFIG = {
+    'hold_seconds': 900,    # how long items in a cart are held for the customer
+    'sweep_interval': 60,   # seconds between sweeps of expired holds
+    'sweep_batch_size': 1000,
+    'entry_debounce_ms': 400  # wait this long after typing a cart quantity before resizing its hold
+}
+
+CART_CONFIG = {
+    'flush_delay': 2.0,   # seconds to collect cart changes before writing them
+    'batch_size': 500     # rows per INSERT/DELETE statement
+}
+
+PASSWORD_CONFIG = {
+    'bcrypt_rounds': 12,        # hashes below this cost are upgraded at login
+    'verify_cache_size': 256    # recently verified logins that skip bcrypt
+}
+
+# Schema migration settings
+MIGRATION_CONFIG = {
+    'directory': os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations"),
+    'batch_size': 1000,   # rows per batch when a migration copies a large table
+    'batch_pause': 0.05   # seconds between batches, so other sessions keep up
+}
+
+# Bulk product import settings
+IMPORT_CONFIG = {
+    'batch_size': 1000,    # products per multi-row INSERT
+    'commit_size': 20000   # products per transaction
+}
+
+# Data export settings
+EXPORT_CONFIG = {
+    'directory': os.path.join(os.path.expanduser("~"), ".cartx", "exports"),
+    'chunk_rows': 100000,  # rows per compressed output file
+    'fetch_size': 1000,    # rows fetched from the server per round trip
+    'safety_lag': 300      # seconds before a new row is exported; must exceed the longest transaction
+}
+
 # Application settings
 APP_CONFIG = {
     'debug': True,
-    'secret_key': 'your-secret-key-here',
-    'session_timeout': 3600  # 1 hour in seconds
+    'secret_key': None,       # None: a random key generated per install in secret_key_file
+    'secret_key_file': os.path.join(os.path.expanduser("~"), ".cartx", "session.key"),
+    'session_timeout': 3600,  # 1 hour in seconds
+    'session_file': os.path.join(os.path.expanduser("~"), ".cartx", "session")
 } 
\ No newline at end of file
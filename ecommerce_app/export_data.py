@@ -0,0 +1,43 @@
+# export_data.py
+
+import argparse
+import sys
+from mysql.connector import Error
+from config import EXPORT_CONFIG
+from services.database import close_pool
+from services.exporter import TABLES, export_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export products, orders and order items to compressed JSONL or CSV chunks.")
+    parser.add_argument("--directory", default=EXPORT_CONFIG['directory'],
+                        help="where the chunk files and watermarks go")
+    parser.add_argument("--tables", nargs="+", choices=tuple(TABLES), default=tuple(TABLES),
+                        help="tables to export")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CONFIG['chunk_rows'],
+                        help="rows per output file")
+    parser.add_argument("--full", action="store_true",
+                        help="export every row instead of only rows past the saved watermarks")
+    parser.add_argument("--orders-by", choices=TABLES["orders"]["watermarks"], default="id",
+                        help="column incremental order exports resume from")
+    args = parser.parse_args()
+
+    try:
+        results = export_tables(args.directory, args.tables, args.format, args.chunk_rows,
+                                EXPORT_CONFIG['fetch_size'], incremental=not args.full,
+                                watermark_columns={"orders": args.orders_by},
+                                safety_lag=EXPORT_CONFIG['safety_lag'])
+    except (Error, OSError, ValueError) as e:
+        print(f"Error exporting data: {e}")
+        return 1
+    finally:
+        close_pool()
+    for table, (rows, paths) in results.items():
+        print(f"{table}: {rows} rows in {len(paths)} file(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
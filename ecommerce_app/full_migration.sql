@@ -1,122 +0,0 @@
--- Step 1: Backup existing data
-CREATE TABLE IF NOT EXISTS old_product_backup AS SELECT * FROM product;
-CREATE TABLE IF NOT EXISTS old_category_backup AS SELECT * FROM category;
-CREATE TABLE IF NOT EXISTS old_user_backup AS SELECT * FROM user;
-
--- Step 2: Drop existing tables
-DROP TABLE IF EXISTS `order_items`;
-DROP TABLE IF EXISTS `orders`;
-DROP TABLE IF EXISTS `products`;
-DROP TABLE IF EXISTS `categories`;
-DROP TABLE IF EXISTS `users`;
-DROP TABLE IF EXISTS `shippers`;
-
--- Step 3: Create new tables
-CREATE TABLE `categories` (
-  `id` int NOT NULL AUTO_INCREMENT,
-  `name` varchar(50) NOT NULL,
-  `description` varchar(255) DEFAULT NULL,
-  PRIMARY KEY (`id`),
-  UNIQUE KEY `name` (`name`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
-CREATE TABLE `products` (
-  `id` int NOT NULL AUTO_INCREMENT,
-  `name` varchar(100) NOT NULL,
-  `description` text,
-  `price` decimal(10,2) NOT NULL,
-  `stock` int NOT NULL DEFAULT '0',
-  `category_id` int DEFAULT NULL,
-  `image_path` varchar(255) DEFAULT NULL,
-  PRIMARY KEY (`id`),
-  KEY `category_id` (`category_id`),
-  CONSTRAINT `products_ibfk_1` FOREIGN KEY (`category_id`) REFERENCES `categories` (`id`) ON DELETE SET NULL
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
-CREATE TABLE `users` (
-  `id` int NOT NULL AUTO_INCREMENT,
-  `username` varchar(50) NOT NULL,
-  `password` varchar(255) NOT NULL,
-  `email` varchar(100) NOT NULL,
-  `full_name` varchar(100) DEFAULT NULL,
-  `is_admin` tinyint(1) DEFAULT '0',
-  `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
-  PRIMARY KEY (`id`),
-  UNIQUE KEY `username` (`username`),
-  UNIQUE KEY `email` (`email`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
-CREATE TABLE `shippers` (
-  `id` int NOT NULL AUTO_INCREMENT,
-  `name` varchar(100) NOT NULL,
-  `phone` varchar(20) DEFAULT NULL,
-  `email` varchar(100) DEFAULT NULL,
-  PRIMARY KEY (`id`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
-CREATE TABLE `orders` (
-  `id` int NOT NULL AUTO_INCREMENT,
-  `user_id` int NOT NULL,
-  `shipper_id` int DEFAULT NULL,
-  `order_date` timestamp DEFAULT CURRENT_TIMESTAMP,
-  `status` varchar(20) DEFAULT 'pending',
-  `total_amount` decimal(10,2) NOT NULL,
-  `shipping_address` text NOT NULL,
-  PRIMARY KEY (`id`),
-  KEY `user_id` (`user_id`),
-  KEY `shipper_id` (`shipper_id`),
-  CONSTRAINT `orders_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`),
-  CONSTRAINT `orders_ibfk_2` FOREIGN KEY (`shipper_id`) REFERENCES `shippers` (`id`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
-CREATE TABLE `order_items` (
-  `id` int NOT NULL AUTO_INCREMENT,
-  `order_id` int NOT NULL,
-  `product_id` int NOT NULL,
-  `quantity` int NOT NULL,
-  `price` decimal(10,2) NOT NULL,
-  PRIMARY KEY (`id`),
-  KEY `order_id` (`order_id`),
-  KEY `product_id` (`product_id`),
-  CONSTRAINT `order_items_ibfk_1` FOREIGN KEY (`order_id`) REFERENCES `orders` (`id`),
-  CONSTRAINT `order_items_ibfk_2` FOREIGN KEY (`product_id`) REFERENCES `products` (`id`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
--- Step 4: Migrate data from old tables
--- Migrate categories
-INSERT INTO categories (name, description)
-SELECT category_name, NULL FROM old_category_backup
-WHERE category_name NOT IN (SELECT name FROM categories);
-
--- Migrate products
-INSERT INTO products (name, description, price, stock, category_id, image_path)
-SELECT 
-    p.product_name,
-    NULL, -- description was not in old table
-    p.product_price,
-    p.stock_quantity,
-    c.id, -- new category id
-    p.image_url
-FROM old_product_backup p
-JOIN categories c ON p.category_name = c.name;
-
--- Migrate users
-INSERT INTO users (username, password, email, full_name, is_admin)
-SELECT 
-    username,
-    password,
-    email,
-    full_name,
-    is_admin
-FROM old_user_backup;
-
--- Step 5: Add sample data for new features
--- Insert sample shippers
-INSERT INTO `shippers` (`name`, `phone`, `email`) VALUES
-('Express Shipping', '1234567890', 'express@example.com'),
-('Standard Delivery', '0987654321', 'standard@example.com');
-
--- Step 6: Clean up (uncomment when ready to remove backups)
--- DROP TABLE IF EXISTS old_product_backup;
--- DROP TABLE IF EXISTS old_category_backup;
--- DROP TABLE IF EXISTS old_user_backup; 
\ No newline at end of file
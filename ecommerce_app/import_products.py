@@ -0,0 +1,38 @@
+# import_products.py
+
+import argparse
+import sys
+import time
+from mysql.connector import Error
+from config import IMPORT_CONFIG
+from services.database import close_pool
+from services.importer import FeedError, import_products
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a CSV or JSON Lines product feed into the catalog.")
+    parser.add_argument("path", help="the feed file; CSV needs a header row with sku,name,price,stock "
+                                     "and optionally description,category,image_path")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="feed format, if the file extension does not tell")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_CONFIG['batch_size'],
+                        help="products per INSERT statement")
+    parser.add_argument("--commit-size", type=int, default=IMPORT_CONFIG['commit_size'],
+                        help="products per transaction")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    try:
+        stats = import_products(args.path, args.format, args.batch_size, args.commit_size)
+    except (FeedError, OSError, Error) as e:
+        print(f"Error importing products: {e}")
+        return 1
+    finally:
+        close_pool()
+    print(f"Imported {stats.written} of {stats.read} products ({stats.skipped} skipped) "
+          f"in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
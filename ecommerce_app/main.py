@@ -1,10 +1,16 @@
 # main.py
 
+import time
 import tkinter as tk
 from ui.login_screen import LoginScreen
 from ui.signup_screen import SignupScreen
 from ui.product_list import ProductListScreen
 from services.auth import Auth
+from services.cart_store import close_cart_store
+from services.database import close_pool
+from services.executor import get_executor
+from services.reservations import ReservationSweeper
+from config import RESERVATION_CONFIG
 
 class App(tk.Tk):
     def __init__(self):
@@ -16,6 +22,14 @@ class App(tk.Tk):
         # Create a single Auth instance
         self.auth = Auth()
 
+        # Deliver background query results on the Tk thread
+        get_executor().bind(self)
+
+        # Release stock held by carts that were abandoned
+        self.reservation_sweeper = ReservationSweeper(RESERVATION_CONFIG['sweep_interval'],
+                                                      RESERVATION_CONFIG['sweep_batch_size'])
+        self.reservation_sweeper.start()
+
         # Configure full window grid
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -24,13 +38,19 @@ class App(tk.Tk):
         self.login_screen = LoginScreen(self, self.show_product_list, self.show_signup, self.auth)
         self.signup_screen = SignupScreen(self, self.show_login)
         self.product_list_screen = None
+        self.session_check = None
 
-        # Show login screen initially
-        self.show_login()
+        # Resume a saved session if there is one, otherwise ask to log in
+        if self.auth.restore_session():
+            self.show_product_list()
+        else:
+            self.show_login()
 
     def show_login(self):
         if self.product_list_screen:
             self.product_list_screen.grid_forget()
+            self.product_list_screen.cart_screen.grid_remove()
+            self.product_list_screen.end_session()
         if self.signup_screen:
             self.signup_screen.grid_forget()
         self.login_screen.grid(row=0, column=0, sticky="nsew")
@@ -47,9 +67,30 @@ class App(tk.Tk):
         if self.signup_screen:
             self.signup_screen.grid_forget()
         if not self.product_list_screen:
-            self.product_list_screen = ProductListScreen(self, self.auth)
-        self.product_list_screen.grid(row=0, column=0, sticky="nsew")
+            self.product_list_screen = ProductListScreen(self, self.auth)  # restores the saved cart
+            self.product_list_screen.grid(row=0, column=0, sticky="nsew")
+        else:
+            # A later login, possibly by another user: load their cart and name
+            self.product_list_screen.grid(row=0, column=0, sticky="nsew")
+            self.product_list_screen.start_session()
+        self.watch_session()
+
+    def watch_session(self):
+        """Return to the login screen once the session expires"""
+        if self.session_check is not None:
+            self.after_cancel(self.session_check)
+            self.session_check = None
+        profile = self.auth.profile
+        if profile is None:
+            self.show_login()
+            return
+        delay = max(0, profile.expires_at - time.time())
+        self.session_check = self.after(int(delay * 1000) + 1000, self.watch_session)
 
 if __name__ == "__main__":
     app = App()
     app.mainloop()
+    app.reservation_sweeper.stop()
+    close_cart_store()
+    get_executor().shutdown()
+    close_pool()
@@ -0,0 +1,45 @@
+# migrate.py
+
+import argparse
+import sys
+from config import MIGRATION_CONFIG
+from services.database import close_pool, get_pool
+from services.migrations import MigrationError, MigrationRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the CartX database migrations.")
+    parser.add_argument("--status", action="store_true",
+                        help="list the migrations and whether each has been applied")
+    parser.add_argument("--target", type=int,
+                        help="only apply migrations up to this version")
+    parser.add_argument("--baseline", type=int, metavar="VERSION",
+                        help="mark migrations up to VERSION as applied without running them, "
+                             "for databases that were set up by hand")
+    args = parser.parse_args()
+
+    pool = get_pool()
+    if pool.dialect != "mysql":
+        print("Migrations apply to the MySQL backend; SQLite databases are created from sqlite_schema.sql")
+        return 1
+    runner = MigrationRunner(pool, **MIGRATION_CONFIG)
+    try:
+        if args.status:
+            for migration, applied in runner.status():
+                print(f"[{'x' if applied else ' '}] {migration.version:04d}_{migration.name}")
+        elif args.baseline is not None:
+            marked = runner.baseline(args.baseline)
+            print(f"Marked {len(marked)} migration(s) as applied")
+        else:
+            applied = runner.migrate(args.target)
+            print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+    except MigrationError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
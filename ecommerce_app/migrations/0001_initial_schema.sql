@@ -1,13 +1,7 @@
--- Drop existing tables if they exist
-DROP TABLE IF EXISTS `order_items`;
-DROP TABLE IF EXISTS `orders`;
-DROP TABLE IF EXISTS `products`;
-DROP TABLE IF EXISTS `categories`;
-DROP TABLE IF EXISTS `users`;
-DROP TABLE IF EXISTS `shippers`;
-
--- Create categories table
-CREATE TABLE `categories` (
+-- Core tables of the shop. Every statement is CREATE TABLE IF NOT EXISTS, so on
+-- a database created by the old ad-hoc scripts this step changes nothing and the
+-- following steps bring the existing tables up to date.
+CREATE TABLE IF NOT EXISTS `categories` (
   `id` int NOT NULL AUTO_INCREMENT,
   `name` varchar(50) NOT NULL,
   `description` varchar(255) DEFAULT NULL,
@@ -15,8 +9,7 @@ CREATE TABLE `categories` (
   UNIQUE KEY `name` (`name`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
--- Create products table
-CREATE TABLE `products` (
+CREATE TABLE IF NOT EXISTS `products` (
   `id` int NOT NULL AUTO_INCREMENT,
   `name` varchar(100) NOT NULL,
   `description` text,
@@ -29,8 +22,7 @@ CREATE TABLE `products` (
   CONSTRAINT `products_ibfk_1` FOREIGN KEY (`category_id`) REFERENCES `categories` (`id`) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
--- Create users table
-CREATE TABLE `users` (
+CREATE TABLE IF NOT EXISTS `users` (
   `id` int NOT NULL AUTO_INCREMENT,
   `username` varchar(50) NOT NULL,
   `password` varchar(255) NOT NULL,
@@ -43,8 +35,7 @@ CREATE TABLE `users` (
   UNIQUE KEY `email` (`email`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
--- Create shippers table
-CREATE TABLE `shippers` (
+CREATE TABLE IF NOT EXISTS `shippers` (
   `id` int NOT NULL AUTO_INCREMENT,
   `name` varchar(100) NOT NULL,
   `phone` varchar(20) DEFAULT NULL,
@@ -52,8 +43,7 @@ CREATE TABLE `shippers` (
   PRIMARY KEY (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
--- Create orders table
-CREATE TABLE `orders` (
+CREATE TABLE IF NOT EXISTS `orders` (
   `id` int NOT NULL AUTO_INCREMENT,
   `user_id` int NOT NULL,
   `shipper_id` int DEFAULT NULL,
@@ -68,8 +58,7 @@ CREATE TABLE `orders` (
   CONSTRAINT `orders_ibfk_2` FOREIGN KEY (`shipper_id`) REFERENCES `shippers` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
--- Create order_items table
-CREATE TABLE `order_items` (
+CREATE TABLE IF NOT EXISTS `order_items` (
   `id` int NOT NULL AUTO_INCREMENT,
   `order_id` int NOT NULL,
   `product_id` int NOT NULL,
@@ -81,25 +70,3 @@ CREATE TABLE `order_items` (
   CONSTRAINT `order_items_ibfk_1` FOREIGN KEY (`order_id`) REFERENCES `orders` (`id`),
   CONSTRAINT `order_items_ibfk_2` FOREIGN KEY (`product_id`) REFERENCES `products` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-
--- Insert sample categories
-INSERT INTO `categories` (`name`, `description`) VALUES
-('Clothing', 'All types of clothing items'),
-('Electronics', 'Electronic devices and accessories'),
-('Footwear', 'Shoes and other footwear'),
-('Accessories', 'Fashion accessories');
-
--- Insert sample products
-INSERT INTO `products` (`name`, `description`, `price`, `stock`, `category_id`, `image_path`) VALUES
-('T-Shirt', 'Comfortable cotton t-shirt', 19.99, 100, 1, 'beige T-shirt.jpg'),
-('Laptop', 'High-performance laptop', 899.99, 50, 2, 'black laptop bag.jpg'),
-('Sneakers', 'Comfortable running shoes', 49.99, 75, 3, 'men brown sneakers.webp'),
-('Backpack', 'Durable laptop backpack', 39.99, 60, 4, 'blue bag.jpg');
-
--- Insert sample admin user
-INSERT INTO `users` (`username`, `password`, `email`, `full_name`, `is_admin`) VALUES
-('admin', '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW', 'admin@example.com', 'Admin User', 1);
-
--- Insert user 'menna'
-INSERT INTO `users` (`username`, `password`, `email`, `full_name`, `is_admin`) VALUES
-('menna', '2', 'menna@example.com', 'Menna', 0); 
\ No newline at end of file
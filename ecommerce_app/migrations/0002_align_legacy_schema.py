@@ -0,0 +1,53 @@
+"""
+Bring databases created from the old dumps in updated/ in line with the schema
+the application uses. Those have orders.total_price instead of total_amount, no
+order status or shipping address, a composite (order_id, product_id) primary key
+on order_items, users.name instead of full_name, and shippers without contact
+columns. Every change is checked first, so databases that already match are left
+alone.
+"""
+from services.migrations import column_exists
+
+
+def upgrade(connection, backfill):
+    cursor = connection.cursor()
+
+    if column_exists(cursor, "orders", "total_price") and not column_exists(cursor, "orders", "total_amount"):
+        cursor.execute("ALTER TABLE orders RENAME COLUMN total_price TO total_amount")
+    missing = []
+    if not column_exists(cursor, "orders", "order_date"):
+        missing.append("ADD COLUMN order_date timestamp DEFAULT CURRENT_TIMESTAMP")
+    if not column_exists(cursor, "orders", "status"):
+        missing.append("ADD COLUMN status varchar(20) DEFAULT 'pending'")
+    if not column_exists(cursor, "orders", "shipping_address"):
+        missing.append("ADD COLUMN shipping_address text NOT NULL")
+    if missing:
+        cursor.execute(f"ALTER TABLE orders {', '.join(missing)}")
+
+    if not column_exists(cursor, "order_items", "id"):
+        # The index on order_id keeps the foreign key covered once the composite key is gone
+        cursor.execute("""
+            ALTER TABLE order_items
+              DROP PRIMARY KEY,
+              ADD COLUMN id int NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST,
+              ADD KEY order_id (order_id)
+        """)
+
+    missing = []
+    if not column_exists(cursor, "shippers", "phone"):
+        missing.append("ADD COLUMN phone varchar(20) DEFAULT NULL")
+    if not column_exists(cursor, "shippers", "email"):
+        missing.append("ADD COLUMN email varchar(100) DEFAULT NULL")
+    if missing:
+        cursor.execute(f"ALTER TABLE shippers {', '.join(missing)}")
+
+    if not column_exists(cursor, "users", "is_admin"):
+        cursor.execute("ALTER TABLE users ADD COLUMN is_admin tinyint(1) DEFAULT '0'")
+    if not column_exists(cursor, "users", "full_name"):
+        cursor.execute("ALTER TABLE users ADD COLUMN full_name varchar(100) DEFAULT NULL AFTER email")
+        if column_exists(cursor, "users", "name"):
+            # Copied in batches; the old column is kept until nothing reads it
+            backfill.run("users", "id", """
+                UPDATE users SET full_name = name
+                WHERE full_name IS NULL AND id > %s AND id <= %s
+            """)
@@ -0,0 +1,52 @@
+"""
+Copy rows from the first version's singular tables (category, product, user)
+into the current ones. This replaces migrate_data.sql, which did it with one
+INSERT ... SELECT per table and locked the old tables for the whole copy. Here
+each table is copied in primary key batches. Databases without the old tables
+are left alone, and rows that are already in the new tables are skipped, so
+the copy can be rerun after a failed batch.
+
+Categories and users are matched on their unique name and username. Products
+have no natural key (two legacy products may share a name and category), so
+each copied product keeps its old id in products.legacy_id. The column and its
+unique index are added before the copy, so checking for an already copied row
+is an index lookup.
+"""
+from services.migrations import column_exists, primary_key, table_exists
+
+
+def upgrade(connection, backfill):
+    cursor = connection.cursor()
+
+    if table_exists(cursor, "category"):
+        key = primary_key(cursor, "category")
+        backfill.run("category", key, f"""
+            INSERT IGNORE INTO categories (name)
+            SELECT category_name FROM category
+            WHERE {key} > %s AND {key} <= %s
+        """)
+
+    if table_exists(cursor, "product"):
+        key = primary_key(cursor, "product")
+        if not column_exists(cursor, "products", "legacy_id"):
+            cursor.execute("""
+                ALTER TABLE products
+                  ADD COLUMN legacy_id int DEFAULT NULL,
+                  ADD UNIQUE KEY legacy_id (legacy_id)
+            """)
+        backfill.run("product", key, f"""
+            INSERT INTO products (name, description, price, stock, category_id, image_path, legacy_id)
+            SELECT p.product_name, NULL, p.product_price, p.stock_quantity, c.id, p.image_url, p.{key}
+            FROM product p
+            JOIN categories c ON p.category_name = c.name
+            WHERE p.{key} > %s AND p.{key} <= %s
+              AND NOT EXISTS (SELECT 1 FROM products existing WHERE existing.legacy_id = p.{key})
+        """)
+
+    if table_exists(cursor, "user"):
+        key = primary_key(cursor, "user")
+        backfill.run("user", key, f"""
+            INSERT IGNORE INTO users (username, password, email, full_name, is_admin)
+            SELECT username, password, email, full_name, is_admin FROM `user`
+            WHERE {key} > %s AND {key} <= %s
+        """)
@@ -0,0 +1,17 @@
+"""
+Contact details collected at signup. The signup form has always sent these, but
+the users table created by the old scripts had no columns for them (the dumps in
+updated/ already do, so each column is only added if missing).
+"""
+from services.migrations import column_exists
+
+
+def upgrade(connection, backfill):
+    cursor = connection.cursor()
+    missing = []
+    if not column_exists(cursor, "users", "phone_number"):
+        missing.append("ADD COLUMN phone_number varchar(20) DEFAULT NULL")
+    if not column_exists(cursor, "users", "address"):
+        missing.append("ADD COLUMN address varchar(255) DEFAULT NULL")
+    if missing:
+        cursor.execute(f"ALTER TABLE users {', '.join(missing)}")
@@ -0,0 +1,8 @@
+-- Index backing keyset pagination of the catalog, ordered by (name, id).
+-- InnoDB secondary indexes already carry the primary key, but naming `id`
+-- explicitly documents the seek predicate used by get_products_page().
+CREATE INDEX `idx_products_name_id` ON `products` (`name`, `id`);
+
+-- Category browsing filters on category_id and pages by (name, id); this index
+-- serves both, so a category click reads only that category's rows, in order.
+CREATE INDEX `idx_products_category_name_id` ON `products` (`category_id`, `name`, `id`);
@@ -0,0 +1,6 @@
+-- Full-text index for ranked product search over name and description.
+-- The ngram parser indexes every 2-character token (ngram_token_size), so
+-- partial words match the same way the old LIKE '%term%' search did. The index
+-- is built from the existing rows, so no OPTIMIZE TABLE is needed afterwards.
+ALTER TABLE `products`
+  ADD FULLTEXT INDEX `ft_products_name_description` (`name`, `description`) WITH PARSER ngram;
@@ -0,0 +1,16 @@
+-- Time-limited stock holds for items sitting in shopping carts.
+-- A hold counts against a product's available stock for other customers until
+-- it expires; expired rows are deleted in bulk by the reservation sweeper.
+CREATE TABLE IF NOT EXISTS `stock_reservations` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `product_id` int NOT NULL,
+  `user_id` int NOT NULL,
+  `quantity` int NOT NULL,
+  `expires_at` datetime NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `user_product` (`user_id`, `product_id`),
+  KEY `product_expires` (`product_id`, `expires_at`),
+  KEY `expires_at` (`expires_at`),
+  CONSTRAINT `stock_reservations_ibfk_1` FOREIGN KEY (`product_id`) REFERENCES `products` (`id`) ON DELETE CASCADE,
+  CONSTRAINT `stock_reservations_ibfk_2` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
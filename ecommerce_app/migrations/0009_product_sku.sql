@@ -0,0 +1,6 @@
+-- Stock keeping unit from the supplier's product feed. The unique key lets the
+-- bulk importer upsert a feed row onto the product it describes; products added
+-- by hand can leave it NULL.
+ALTER TABLE `products`
+  ADD COLUMN `sku` varchar(64) DEFAULT NULL AFTER `id`,
+  ADD UNIQUE KEY `sku` (`sku`);
@@ -0,0 +1,7 @@
+-- Last change time of each product row, maintained by MySQL on every UPDATE.
+-- The catalog cache folds MAX(updated_at) into its version fingerprint, so price
+-- and stock rewritten in place (by the importer or other clients' checkouts)
+-- are picked up. Microsecond precision keeps two changes within one second apart.
+ALTER TABLE `products`
+  ADD COLUMN `updated_at` timestamp(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+  ADD KEY `updated_at` (`updated_at`);
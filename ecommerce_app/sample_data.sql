@@ -0,0 +1,29 @@
+-- Sample data for a development database.
+-- Load it once into an empty database after running `python migrate.py`.
+
+-- Insert sample categories
+INSERT INTO `categories` (`name`, `description`) VALUES
+('Clothing', 'All types of clothing items'),
+('Electronics', 'Electronic devices and accessories'),
+('Footwear', 'Shoes and other footwear'),
+('Accessories', 'Fashion accessories');
+
+-- Insert sample products
+INSERT INTO `products` (`name`, `description`, `price`, `stock`, `category_id`, `image_path`) VALUES
+('T-Shirt', 'Comfortable cotton t-shirt', 19.99, 100, 1, 'beige T-shirt.jpg'),
+('Laptop', 'High-performance laptop', 899.99, 50, 2, 'black laptop bag.jpg'),
+('Sneakers', 'Comfortable running shoes', 49.99, 75, 3, 'men brown sneakers.webp'),
+('Backpack', 'Durable laptop backpack', 39.99, 60, 4, 'blue bag.jpg');
+
+-- Insert sample admin user
+INSERT INTO `users` (`username`, `password`, `email`, `full_name`, `is_admin`) VALUES
+('admin', '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW', 'admin@example.com', 'Admin User', 1);
+
+-- Insert user 'menna'
+INSERT INTO `users` (`username`, `password`, `email`, `full_name`, `is_admin`) VALUES
+('menna', '2', 'menna@example.com', 'Menna', 0);
+
+-- Insert sample shippers
+INSERT INTO `shippers` (`name`, `phone`, `email`) VALUES
+('Express Shipping', '1234567890', 'express@example.com'),
+('Standard Delivery', '0987654321', 'standard@example.com');
@@ -1,29 +1,81 @@
-from .database import get_db_connection, close_db_connection
+from .database import db_connection
+from .passwords import get_verifier, hash_password, needs_rehash
+from .session import SessionStore, load_secret_key
+from config import APP_CONFIG
 from mysql.connector import Error
 
 class Auth:
-    def __init__(self):
-        self.current_user_id = None
-        self.current_username = None
+    """
+    The logged-in user's session.
+
+    Screens read the user's details from ``profile`` (or the ``current_*``
+    shortcuts) rather than querying the users table. The session expires after
+    APP_CONFIG['session_timeout'] seconds; after that every user field reads as
+    None, as if nobody were logged in.
+    """
+
+    def __init__(self, sessions=None):
+        if sessions is None:
+            secret_key = APP_CONFIG['secret_key'] or load_secret_key(APP_CONFIG['secret_key_file'])
+            sessions = SessionStore(APP_CONFIG['session_file'], secret_key,
+                                    APP_CONFIG['session_timeout'])
+        self.sessions = sessions
+        self._profile = None
+
+    @property
+    def profile(self):
+        """The logged-in user's UserProfile, or None when logged out or expired."""
+        if self._profile is not None and self._profile.expired():
+            self.logout()
+        return self._profile
+
+    @property
+    def current_user_id(self):
+        return self.profile.user_id if self.profile else None
+
+    @property
+    def current_username(self):
+        return self.profile.username if self.profile else None
+
+    @property
+    def is_admin(self):
+        return bool(self.profile and self.profile.is_admin)
+
+    def restore_session(self):
+        """
+        Resume the session saved by an earlier run, without contacting the database.
+        Returns:
+            bool: True if a valid, unexpired session was found.
+        """
+        self._profile = self.sessions.load()
+        return self._profile is not None
+
+    def logout(self):
+        self._profile = None
+        self.sessions.clear()
 
     def login(self, username, password):
         try:
-            connection = get_db_connection()
-            cursor = connection.cursor(dictionary=True)
-            
-            # Query to check user credentials using the new users table
-            cursor.execute("""
-                SELECT id, username, password
-                FROM users 
-                WHERE username = %s AND password = %s
-            """, (username, password))
-            
-            user = cursor.fetchone()
+            with db_connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                
+                # Look the account up through the unique username index;
+                # the password is checked against its hash below
+                cursor.execute("""
+                    SELECT id, username, password, full_name, is_admin
+                    FROM users 
+                    WHERE username = %s
+                """, (username,))
+                
+                user = cursor.fetchone()
             
-            if user:
-                # Store the logged-in user's information
-                self.current_user_id = user['id']
-                self.current_username = user['username']
+            if user and get_verifier().verify(password, user['password']):
+                if needs_rehash(user['password']):
+                    self.upgrade_password(user['id'], user['password'], password)
+
+                # Start a session holding the user's profile
+                self._profile = self.sessions.issue(user['id'], user['username'],
+                                                    user['full_name'], user['is_admin'])
                 return True, f"Welcome back, {user['username']}!"
             else:
                 return False, "Invalid username or password"
@@ -31,6 +83,22 @@ class Auth:
         except Error as e:
             print(f"Error during login: {e}")
             return False, "An error occurred during login"
-        finally:
-            if connection and connection.is_connected():
-                close_db_connection(connection) 
\ No newline at end of file
+
+    def upgrade_password(self, user_id, stored, password):
+        """
+        Replace a plaintext or weaker stored password with a hash at the configured cost.
+        The row is only updated if it still holds ``stored``, so a concurrent
+        password change is never overwritten.
+        """
+        password_hash = hash_password(password)  # before borrowing a connection; bcrypt is slow
+        try:
+            with db_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    UPDATE users SET password = %s
+                    WHERE id = %s AND password = %s
+                """, (password_hash, user_id, stored))
+                connection.commit()
+        except Error as e:
+            # The login itself succeeded; the upgrade is retried next time
+            print(f"Error upgrading password hash: {e}")
@@ -0,0 +1,89 @@
+from .models import CartItem
+
+
+class Cart:
+    """
+    Shopping cart contents keyed by product id.
+
+    Every operation is O(1): items live in a dict (which also keeps the order they
+    were added in), and the item count and total price are adjusted by each change
+    instead of being recomputed. Listeners registered with ``subscribe`` are called
+    as ``listener(event, item)`` with event "added", "updated" or "removed", so a
+    view can redraw just the affected row.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._listeners = []
+        self.total = 0
+        self.count = 0
+
+    def subscribe(self, listener):
+        """Call ``listener(event, item)`` after every change to the cart."""
+        self._listeners.append(listener)
+
+    def get(self, product_id):
+        """Return the cart item for a product, or None if it is not in the cart."""
+        return self._items.get(product_id)
+
+    def add(self, product, quantity=1):
+        """
+        Add ``quantity`` units of a product, creating its cart item if needed.
+        Args:
+            product (Product): The product to add.
+            quantity (int): Number of units to add.
+        Returns:
+            CartItem: The product's cart item.
+        """
+        item = self._items.get(product.id)
+        if item is None:
+            item = self._items[product.id] = CartItem(product, 0)
+            event = "added"
+        else:
+            event = "updated"
+        self._change(item, quantity)
+        self._notify(event, item)
+        return item
+
+    def set_quantity(self, product_id, quantity):
+        """Set a product's quantity; zero or less removes it from the cart."""
+        item = self._items.get(product_id)
+        if item is None or item.quantity == quantity:
+            return
+        if quantity <= 0:
+            self.remove(product_id)
+            return
+        self._change(item, quantity - item.quantity)
+        self._notify("updated", item)
+
+    def remove(self, product_id):
+        """Remove a product from the cart."""
+        item = self._items.pop(product_id, None)
+        if item is None:
+            return
+        self._change(item, -item.quantity)
+        self._notify("removed", item)
+
+    def clear(self):
+        """Remove every product from the cart."""
+        for product_id in list(self._items):
+            self.remove(product_id)
+
+    def items(self):
+        """Return the cart items in the order they were added."""
+        return list(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def _change(self, item, delta):
+        item.quantity += delta
+        self.count += delta
+        self.total += item.product.price * delta
+
+    def _notify(self, event, item):
+        for listener in self._listeners:
+            listener(event, item)
@@ -0,0 +1,169 @@
+import threading
+from mysql.connector import Error
+from config import CART_CONFIG
+from .database import db_connection, get_pool
+from .models import Product
+
+
+def load_cart(user_id):
+    """
+    Load a user's saved cart.
+    Args:
+        user_id (int): The customer.
+    Returns:
+        list of tuple: (Product, quantity) pairs in the order they were added.
+    """
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f'''
+            SELECT {Product.COLUMNS}, ci.quantity
+            FROM cart_items ci
+            JOIN products p ON ci.product_id = p.id
+            LEFT JOIN categories c ON p.category_id = c.id
+            WHERE ci.user_id = %s
+            ORDER BY ci.added_at, ci.product_id
+        ''', (user_id,))
+        return [(Product.from_row(row), row[7]) for row in cursor.fetchall()]
+
+
+def save_cart_items(changes, batch_size=500):
+    """
+    Write cart changes with one statement per batch rather than one per change.
+    Args:
+        changes (dict): Maps (user_id, product_id) to the new quantity; zero
+            removes the product from the user's cart.
+        batch_size (int): Maximum rows per statement.
+    """
+    upserts = [(user_id, product_id, quantity)
+               for (user_id, product_id), quantity in changes.items() if quantity > 0]
+    deletes = [key for key, quantity in changes.items() if quantity <= 0]
+    users = sorted({user_id for user_id, _, _ in upserts})
+    if get_pool().dialect == "mysql":
+        touch_cart = "ON DUPLICATE KEY UPDATE updated_at = CURRENT_TIMESTAMP"
+        set_quantity = "ON DUPLICATE KEY UPDATE quantity = VALUES(quantity)"
+    else:
+        touch_cart = "ON CONFLICT (user_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP"
+        set_quantity = "ON CONFLICT (user_id, product_id) DO UPDATE SET quantity = excluded.quantity"
+
+    with db_connection() as connection:
+        connection.start_transaction()
+        try:
+            cursor = connection.cursor()
+            for start in range(0, len(users), batch_size):
+                batch = users[start:start + batch_size]
+                cursor.execute(f"""
+                    INSERT INTO carts (user_id) VALUES {", ".join(["(%s)"] * len(batch))}
+                    {touch_cart}
+                """, tuple(batch))
+            for start in range(0, len(upserts), batch_size):
+                batch = upserts[start:start + batch_size]
+                cursor.execute(f"""
+                    INSERT INTO cart_items (user_id, product_id, quantity)
+                    VALUES {", ".join(["(%s, %s, %s)"] * len(batch))}
+                    {set_quantity}
+                """, tuple(value for row in batch for value in row))
+            for start in range(0, len(deletes), batch_size):
+                batch = deletes[start:start + batch_size]
+                cursor.execute(f"""
+                    DELETE FROM cart_items
+                    WHERE (user_id, product_id) IN ({", ".join(["(%s, %s)"] * len(batch))})
+                """, tuple(value for key in batch for value in key))
+            connection.commit()
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+
+
+class CartStore:
+    """
+    Write-behind persistence for shopping carts.
+
+    ``record`` only notes the latest quantity of a product in memory, so it is
+    cheap enough to call from the Tk thread on every cart change. A background
+    thread waits ``flush_delay`` seconds after the first unsaved change, letting a
+    burst of +/- clicks collapse into one value per product, and then writes
+    everything pending with ``save_cart_items``. Changes that fail to save are
+    kept and retried with the next flush. ``stop`` writes whatever is left.
+    """
+
+    def __init__(self, flush_delay=2.0, batch_size=500):
+        self.flush_delay = flush_delay
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cart-writer", daemon=True)
+            self._thread.start()
+
+    def record(self, user_id, product_id, quantity):
+        """
+        Remember a product's new quantity in a user's cart until the next flush.
+        Args:
+            user_id (int): The customer.
+            product_id (int): The product that changed.
+            quantity (int): Its quantity now; zero means it was removed.
+        """
+        with self._lock:
+            self._pending[(user_id, product_id)] = quantity
+        self._wake.set()
+
+    def flush(self):
+        """Write every pending change now."""
+        with self._lock:
+            changes, self._pending = self._pending, {}
+        if not changes:
+            return
+        try:
+            save_cart_items(changes, self.batch_size)
+        except Error as e:
+            print(f"Error saving cart: {e}")
+            with self._lock:
+                # Anything recorded since is newer than what failed
+                for key, quantity in changes.items():
+                    self._pending.setdefault(key, quantity)
+
+    def stop(self, timeout=5):
+        """Stop the writer thread after a final flush."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        else:
+            self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._stop.wait(self.flush_delay)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_cart_store():
+    """Return the shared cart store, starting its writer thread on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CartStore(**CART_CONFIG)
+            _store.start()
+        return _store
+
+
+def close_cart_store():
+    """Write any unsaved cart changes and stop the writer thread."""
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.stop()
@@ -0,0 +1,423 @@
+import datetime
+import threading
+import time
+from mysql.connector import Error
+from config import CATALOG_CONFIG
+from .database import db_connection, get_pool
+from .models import Category, Product
+
+def get_product_by_id(product_id):
+    """
+    Get a single product by its ID.
+    Args:
+        product_id (int): The ID of the product to retrieve.
+    Returns:
+        Product: The product, or None if not found.
+    """
+    product = None
+    try:
+        with db_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f'''
+                SELECT {Product.COLUMNS}
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                WHERE p.id = %s
+            ''', (product_id,))
+            row = cursor.fetchone()
+            if row:
+                product = Product.from_row(row)
+    except Error as e:
+        print(f"Error getting product by ID: {str(e)}")
+    return product
+
+def get_all_products():
+    """
+    Get all products with their category names.
+    Returns:
+        list of Product: All products with category names.
+    """
+    products = []
+    try:
+        with db_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f'''
+                SELECT {Product.COLUMNS}
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                ORDER BY p.name
+            ''')
+            products = [Product.from_row(row) for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Error getting all products: {str(e)}")
+    return products
+
+def get_products_page(after=None, limit=60, category_id=None):
+    """
+    Get one page of products ordered by name, using keyset pagination on (name, id).
+    Each page seeks straight to its first row through the (name, id) index, or the
+    (category_id, name, id) index when filtering by category, so late pages cost the
+    same as the first one, unlike OFFSET paging.
+    Args:
+        after (tuple): (name, id) of the last product on the previous page, or None for the first page.
+        limit (int): Maximum number of products to return.
+        category_id (int): Only return products in this category, or None for every category.
+    Returns:
+        list of Product: Up to ``limit`` products with category names.
+    """
+    conditions, params = [], ()
+    if category_id is not None:
+        conditions.append("p.category_id = %s")
+        params += (category_id,)
+    if after is not None:
+        name, product_id = after
+        conditions.append("(p.name > %s OR (p.name = %s AND p.id > %s))")
+        params += (name, name, product_id)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    products = []
+    try:
+        with db_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f'''
+                SELECT {Product.COLUMNS}
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                {where}
+                ORDER BY p.name, p.id
+                LIMIT %s
+            ''', params + (limit,))
+            products = [Product.from_row(row) for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Error getting products page: {str(e)}")
+    return products
+
+def get_categories():
+    """
+    Get every category with the number of products in it.
+    Returns:
+        list of Category: Categories ordered by name.
+    """
+    categories = []
+    try:
+        with db_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute('''
+                SELECT c.id, c.name, COUNT(p.id)
+                FROM categories c
+                LEFT JOIN products p ON p.category_id = c.id
+                GROUP BY c.id, c.name
+                ORDER BY c.name
+            ''')
+            categories = [Category(*row) for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Error getting categories: {str(e)}")
+    return categories
+
+def iter_products(batch_size=500):
+    """
+    Stream every product ordered by name without materializing the result set.
+    Rows are read from an unbuffered cursor ``batch_size`` at a time; the pooled
+    connection is held until the generator is exhausted or closed.
+    Args:
+        batch_size (int): Number of rows fetched from the server per round trip.
+    Yields:
+        Product: Each product with its category name.
+    """
+    with db_connection(read_only=True) as connection:
+        cursor = connection.cursor(buffered=False)
+        try:
+            cursor.execute(f'''
+                SELECT {Product.COLUMNS}
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                ORDER BY p.name, p.id
+            ''')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Product.from_row(row)
+        finally:
+            cursor.close()
+
+def search_products_by_name(name):
+    """
+    Search for products by (partial) name match.
+    Args:
+        name (str): The search string (case-insensitive, partial match).
+    Returns:
+        list of Product: Matching products with category names.
+    """
+    products = []
+    try:
+        with db_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f'''
+                SELECT {Product.COLUMNS}
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                WHERE p.name LIKE %s
+            ''', (f"%{name}%",))
+            products = [Product.from_row(row) for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Error searching products by name: {str(e)}")
+    return products
+
+
+# MySQL error raised when no FULLTEXT index covers the MATCH() columns
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+# Shortest term the ngram parser indexes (server variable ngram_token_size)
+NGRAM_TOKEN_SIZE = 2
+
+_fulltext_available = True
+
+def search_products_ranked(term, category=None, limit=50, offset=0):
+    """
+    Search product names and descriptions on the server, best matches first.
+    Uses the FULLTEXT index from migration 0006_search_index.sql. If the server has no such
+    index, falls back to a LIKE scan ranked by name-prefix matches, and stops
+    trying the index for the rest of the session.
+    Args:
+        term (str): The search string.
+        category (str): Category name to restrict to, or None for every category.
+        limit (int): Maximum number of products to return.
+        offset (int): Number of ranked results to skip, for paging.
+    Returns:
+        list of Product: Matching products, most relevant first.
+    """
+    global _fulltext_available
+    term = term.strip()
+    if not term:
+        return []
+    category_clause = "AND c.name = %s" if category else ""
+    category_params = (category,) if category else ()
+    try:
+        with db_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            if _fulltext_available and get_pool().dialect == "mysql" and len(term) >= NGRAM_TOKEN_SIZE:
+                # Quoted phrase in boolean mode: every ngram of the term, adjacent
+                phrase = '"' + term.replace('"', ' ') + '"'
+                try:
+                    cursor.execute(f'''
+                        SELECT {Product.COLUMNS},
+                               MATCH(p.name, p.description) AGAINST (%s IN BOOLEAN MODE) AS relevance
+                        FROM products p
+                        LEFT JOIN categories c ON p.category_id = c.id
+                        WHERE MATCH(p.name, p.description) AGAINST (%s IN BOOLEAN MODE)
+                        {category_clause}
+                        ORDER BY relevance DESC, p.id
+                        LIMIT %s OFFSET %s
+                    ''', (phrase, phrase) + category_params + (limit, offset))
+                    return [Product.from_row(row) for row in cursor.fetchall()]
+                except Error as e:
+                    if e.errno != ER_FT_MATCHING_KEY_NOT_FOUND:
+                        raise
+                    print("FULLTEXT index on products not found; using LIKE search")
+                    _fulltext_available = False
+            # "!" escapes LIKE wildcards the same way in MySQL and SQLite
+            pattern = term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+            cursor.execute(f'''
+                SELECT {Product.COLUMNS},
+                       (p.name LIKE %s ESCAPE '!') * 2 + (p.name LIKE %s ESCAPE '!') AS relevance
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                WHERE (p.name LIKE %s ESCAPE '!' OR p.description LIKE %s ESCAPE '!')
+                {category_clause}
+                ORDER BY relevance DESC, p.name, p.id
+                LIMIT %s OFFSET %s
+            ''', (f"{pattern}%", f"%{pattern}%", f"%{pattern}%", f"%{pattern}%")
+                + category_params + (limit, offset))
+            return [Product.from_row(row) for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Error searching products: {str(e)}")
+        return []
+
+# An update stamps its row when it runs, not when it commits, so a transaction
+# still open when the fingerprint was taken can commit an older updated_at.
+# Refreshes re-read rows changed this many seconds before the cached maximum.
+UPDATE_OVERLAP = 30
+
+
+def _before(timestamp, seconds):
+    # MySQL returns datetimes, SQLite the text its triggers wrote
+    if isinstance(timestamp, str):
+        moved = datetime.datetime.fromisoformat(timestamp) - datetime.timedelta(seconds=seconds)
+        return moved.isoformat(sep=" ", timespec="milliseconds")
+    return timestamp - datetime.timedelta(seconds=seconds)
+
+
+class CatalogCache:
+    """
+    In-memory copy of the product catalog, shared by every screen.
+
+    The full ``products LEFT JOIN categories`` query runs once; afterwards reads are
+    served from memory. Once ``ttl`` seconds have passed, the next read compares a
+    cheap version fingerprint (row count, max id and latest ``updated_at``) with
+    the cached one. Appended rows and rows rewritten in place, such as price and
+    stock changes by the importer or other clients' checkouts, are fetched
+    incrementally; deletions trigger a full reload. ``invalidate`` makes this
+    client's own changes visible before the TTL runs out.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._products = {}
+        self._sorted = []
+        self._version = None
+        self._checked_at = 0.0
+        self._stale_ids = set()
+        self._stale = True
+        self._categories = None
+        self._categories_at = 0.0
+
+    def get_products(self):
+        """
+        Return every product sorted by name, refreshing the cache first if needed.
+        The returned list is shared; callers must not modify it.
+        Returns:
+            list of Product: All products with category names.
+        """
+        with self._lock:
+            try:
+                if self._stale:
+                    self._load_all()
+                else:
+                    if self._stale_ids:
+                        self._reload_ids(self._stale_ids)
+                    if time.monotonic() - self._checked_at > self.ttl:
+                        self._refresh()
+            except Error as e:
+                print(f"Error refreshing product catalog: {str(e)}")
+            return self._sorted
+
+    def get_product(self, product_id):
+        """
+        Return a cached product by ID without touching the database.
+        Args:
+            product_id (int): The ID of the product to look up.
+        Returns:
+            Product: The cached product, or None if not cached.
+        """
+        self.get_products()
+        return self._products.get(product_id)
+
+    def get_categories(self):
+        """
+        Return the categories with their product counts, cached for ``ttl`` seconds.
+        Returns:
+            list of Category: Categories ordered by name.
+        """
+        with self._lock:
+            if self._categories is None or time.monotonic() - self._categories_at > self.ttl:
+                self._categories = get_categories()
+                self._categories_at = time.monotonic()
+            return self._categories
+
+    def is_loaded(self):
+        """Whether the catalog is in memory, so reads will not wait on a full load"""
+        return not self._stale
+
+    def invalidate(self, product_ids=None):
+        """
+        Mark cached products as stale, e.g. after a stock change.
+        Args:
+            product_ids (iterable of int): Products to re-read on the next access,
+                or None to reload the whole catalog.
+        """
+        with self._lock:
+            if product_ids is None:
+                self._stale = True
+                self._categories = None
+            else:
+                self._stale_ids.update(product_ids)
+
+    def _load_all(self):
+        with db_connection(read_only=True) as connection:
+            version = self._fetch_version(connection)
+        products = list(iter_products())
+        self._products = {p.id: p for p in products}
+        self._sorted = products
+        self._version = version
+        self._checked_at = time.monotonic()
+        self._stale_ids.clear()
+        self._stale = False
+
+    def _refresh(self):
+        with db_connection(read_only=True) as connection:
+            version = self._fetch_version(connection)
+            if version == self._version:
+                self._checked_at = time.monotonic()
+                return
+            count, max_id, _ = version
+            cached_count, cached_max_id, cached_updated_at = self._version
+            changed = None
+            if max_id >= cached_max_id and count >= cached_count:
+                # New rows, and rows updated since the cached fingerprint was taken
+                if cached_updated_at is None:
+                    changed = self._fetch(connection, "WHERE p.id > %s", (cached_max_id,))
+                else:
+                    changed = self._fetch(connection, "WHERE p.id > %s OR p.updated_at >= %s",
+                                          (cached_max_id, _before(cached_updated_at, UPDATE_OVERLAP)))
+        added = sum(1 for product in changed or () if product.id > cached_max_id)
+        if changed is not None and cached_count + added == count:
+            for product in changed:
+                self._products[product.id] = product
+            self._resort()
+            self._version = version
+            self._checked_at = time.monotonic()
+        else:
+            # Rows were deleted; start over
+            self._load_all()
+
+    def _reload_ids(self, product_ids):
+        product_ids = list(product_ids)
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        with db_connection(read_only=True) as connection:
+            rows = self._fetch(connection, f"WHERE p.id IN ({placeholders})", product_ids)
+        for product_id in product_ids:
+            self._products.pop(product_id, None)
+        for product in rows:
+            self._products[product.id] = product
+        self._resort()
+        self._stale_ids.clear()
+
+    def _resort(self):
+        self._sorted = sorted(self._products.values(), key=lambda p: p.name.lower())
+
+    @staticmethod
+    def _fetch_version(connection):
+        cursor = connection.cursor()
+        cursor.execute("SELECT COUNT(*), COALESCE(MAX(id), 0), MAX(updated_at) FROM products")
+        return tuple(cursor.fetchone())
+
+    @staticmethod
+    def _fetch(connection, where="", params=()):
+        cursor = connection.cursor()
+        cursor.execute(f'''
+            SELECT {Product.COLUMNS}
+            FROM products p
+            LEFT JOIN categories c ON p.category_id = c.id
+            {where}
+            ORDER BY p.name
+        ''', params)
+        return [Product.from_row(row) for row in cursor.fetchall()]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """
+    Return the process-wide catalog cache, creating it on first use.
+    Returns:
+        CatalogCache: The shared cache configured from CATALOG_CONFIG.
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = CatalogCache(ttl=CATALOG_CONFIG['ttl'])
+    return _catalog
@@ -0,0 +1,128 @@
+from mysql.connector import Error
+from .catalog import get_catalog
+from .database import db_connection, get_pool
+from .reservations import NOW_SQL
+
+# MySQL error raised when InnoDB picks this transaction as a deadlock victim
+ER_LOCK_DEADLOCK = 1213
+
+
+class CheckoutError(Exception):
+    """Raised when an order cannot be placed, e.g. because stock ran out."""
+
+
+def _order_lines(items):
+    """Merge (product_id, quantity) pairs into a derived table of order lines."""
+    quantities = {}
+    for product_id, quantity in items:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    lines = sorted((product_id, quantity) for product_id, quantity in quantities.items() if quantity > 0)
+    sql = " UNION ALL ".join(["SELECT %s AS product_id, %s AS quantity"] * len(lines))
+    params = tuple(value for line in lines for value in line)
+    return lines, sql, params
+
+
+def place_order(user_id, items, shipping_address, shipper_id=None, retries=3):
+    """
+    Create an order and its order items, and take the ordered units out of stock.
+
+    Everything happens in one transaction with a fixed number of statements,
+    however many items are ordered: one UPDATE decrements stock for every line,
+    but only where the stock left after other customers' unexpired holds covers
+    the quantity, so concurrent checkouts can never oversell. One INSERT ... SELECT
+    creates the order with its total computed from current prices, another inserts
+    every order item, and a DELETE releases the customer's holds on the ordered
+    products. If any line is short of stock the whole order is rolled back.
+    Deadlocks between concurrent checkouts are retried.
+    Args:
+        user_id (int): The customer placing the order.
+        items (iterable of tuple): (product_id, quantity) pairs.
+        shipping_address (str): Where to ship the order.
+        shipper_id (int): Optional shipper for the order.
+        retries (int): Attempts before giving up on repeated deadlocks.
+    Returns:
+        int: The new order's ID.
+    Raises:
+        CheckoutError: If the order is empty or some items are out of stock.
+        Error: On any other database error.
+    """
+    lines, lines_sql, lines_params = _order_lines(items)
+    if not lines:
+        raise CheckoutError("Your cart is empty.")
+
+    for attempt in range(retries):
+        try:
+            order_id = _place_order_once(user_id, lines, lines_sql, lines_params,
+                                         shipping_address, shipper_id)
+            break
+        except Error as e:
+            if e.errno != ER_LOCK_DEADLOCK or attempt == retries - 1:
+                raise
+            print("Deadlock during checkout, retrying")
+
+    # The cached catalog still shows the old stock for these products
+    get_catalog().invalidate(product_id for product_id, _ in lines)
+    return order_id
+
+
+def _place_order_once(user_id, lines, lines_sql, lines_params, shipping_address, shipper_id):
+    dialect = get_pool().dialect
+    held_by_others = f"""
+        COALESCE((
+            SELECT SUM(r.quantity) FROM stock_reservations r
+            WHERE r.product_id = p.id AND r.user_id <> %s AND r.expires_at > {NOW_SQL[dialect]}
+        ), 0)
+    """
+    with db_connection() as connection:
+        connection.start_transaction()
+        try:
+            cursor = connection.cursor()
+
+            # Take every line out of stock at once; rows short of stock, after
+            # other customers' unexpired holds, are left untouched
+            if dialect == "mysql":
+                cursor.execute(f"""
+                    UPDATE products p
+                    JOIN ({lines_sql}) AS line ON p.id = line.product_id
+                    SET p.stock = p.stock - line.quantity
+                    WHERE p.stock - {held_by_others} >= line.quantity
+                """, lines_params + (user_id,))
+            else:
+                cursor.execute(f"""
+                    UPDATE products AS p
+                    SET stock = p.stock - line.quantity
+                    FROM ({lines_sql}) AS line
+                    WHERE p.id = line.product_id AND p.stock - {held_by_others} >= line.quantity
+                """, lines_params + (user_id,))
+            if cursor.rowcount != len(lines):
+                connection.rollback()
+                raise CheckoutError("Some items in your cart are no longer in stock.")
+
+            cursor.execute(f"""
+                INSERT INTO orders (user_id, shipper_id, status, total_amount, shipping_address)
+                SELECT %s, %s, 'pending', SUM(p.price * line.quantity), %s
+                FROM products p
+                JOIN ({lines_sql}) AS line ON p.id = line.product_id
+            """, (user_id, shipper_id, shipping_address) + lines_params)
+            order_id = cursor.lastrowid
+
+            cursor.execute(f"""
+                INSERT INTO order_items (order_id, product_id, quantity, price)
+                SELECT %s, line.product_id, line.quantity, p.price
+                FROM products p
+                JOIN ({lines_sql}) AS line ON p.id = line.product_id
+            """, (order_id,) + lines_params)
+
+            # The ordered units are sold now, so the customer's holds on them are done
+            placeholders = ", ".join(["%s"] * len(lines))
+            cursor.execute(f"""
+                DELETE FROM stock_reservations
+                WHERE user_id = %s AND product_id IN ({placeholders})
+            """, (user_id,) + tuple(product_id for product_id, _ in lines))
+
+            connection.commit()
+            return order_id
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
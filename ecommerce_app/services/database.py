@@ -1,28 +1,301 @@
+import itertools
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
 from mysql.connector import Error
-from config import DB_CONFIG
+from mysql.connector.errors import InterfaceError, OperationalError, PoolError
+from config import DB_CONFIG, DB_POOL_CONFIG, DB_REPLICA_CONFIG, STORAGE_CONFIG
+
+
+class ConnectionPool:
+    """
+    A bounded pool of reusable MySQL connections.
+
+    Connections are handed out most-recently-used first so that a small working
+    set stays warm while surplus connections age out. A connection that has been
+    idle longer than ``ping_interval`` is health-checked before it is handed out,
+    and one idle longer than ``max_idle_time`` is closed and replaced.
+    """
+
+    dialect = "mysql"
+
+    def __init__(self, db_config, pool_size=5, checkout_timeout=5,
+                 max_idle_time=300, ping_interval=30):
+        self.db_config = db_config
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.max_idle_time = max_idle_time
+        self.ping_interval = ping_interval
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._closed = False
+
+    def acquire(self):
+        """
+        Borrow a connection from the pool, opening a new one if none are idle.
+        Returns:
+            connection (mysql.connector.connection.MySQLConnection): A live connection.
+        Raises:
+            PoolError: If every connection is in use for longer than ``checkout_timeout``.
+            Error: If a new connection cannot be opened.
+        """
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolError("Connection pool exhausted")
+        try:
+            while True:
+                try:
+                    connection, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.max_idle_time:
+                    self._discard(connection)
+                elif idle_for > self.ping_interval and not self._is_healthy(connection):
+                    self._discard(connection)
+                else:
+                    return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection):
+        """
+        Return a borrowed connection to the pool.
+        Any open transaction or unread result is rolled back so the next borrower
+        starts from a clean session. Broken connections, and any returned after
+        ``close_all``, are closed instead.
+        Args:
+            connection (mysql.connector.connection.MySQLConnection): The connection to return.
+        """
+        try:
+            if self._closed:
+                self._discard(connection)
+                return
+            if connection.unread_result or connection.in_transaction:
+                connection.rollback()
+            self._idle.put((connection, time.monotonic()))
+        except Error:
+            self._discard(connection)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block."""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self):
+        """Close every idle connection. Borrowed connections are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+    def _connect(self):
+        connection = mysql.connector.connect(**self.db_config)
+        print("Successfully connected to MySQL database")
+        return connection
+
+    def _is_healthy(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+
+class ReplicaRouter:
+    """
+    Spreads read-only queries over a set of replica pools.
+
+    Replicas are tried round-robin. A replica that cannot be connected to is
+    skipped for ``retry_after`` seconds and the next one is tried; one whose pool
+    is merely exhausted is skipped for this request only. When no replica can
+    serve the request, ``acquire`` returns nothing and the caller falls back to
+    the primary. A replica whose connection breaks while in use is reported
+    through ``mark_down`` and skipped the same way.
+    """
+
+    def __init__(self, pools, retry_after=30):
+        self.pools = pools
+        self.retry_after = retry_after
+        self._down_until = [0.0] * len(pools)
+        self._turn = itertools.count()
+
+    def acquire(self):
+        """
+        Borrow a connection from the next available replica.
+        Returns:
+            tuple: (pool, connection), or (None, None) if every replica is unavailable.
+        """
+        start = next(self._turn)
+        for offset in range(len(self.pools)):
+            index = (start + offset) % len(self.pools)
+            if self._down_until[index] > time.monotonic():
+                continue
+            pool = self.pools[index]
+            try:
+                return pool, pool.acquire()
+            except PoolError:
+                continue
+            except Error as e:
+                print(f"Read replica {pool.db_config.get('host')} unavailable: {e}")
+                self.mark_down(pool)
+        return None, None
+
+    def mark_down(self, pool):
+        """Skip the replica served by ``pool`` for the next ``retry_after`` seconds."""
+        self._down_until[self.pools.index(pool)] = time.monotonic() + self.retry_after
+
+    def close_all(self):
+        for pool in self.pools:
+            pool.close_all()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_router = None
+_last_write = float("-inf")
+
+
+def create_pool(storage_config=STORAGE_CONFIG):
+    """
+    Build the connection source for the configured storage backend.
+    Args:
+        storage_config (dict): Settings in the shape of STORAGE_CONFIG.
+    Returns:
+        ConnectionPool or SQLiteDatabase: An object with ``acquire``, ``release``,
+        ``connection`` and ``close_all``, and a ``dialect`` of "mysql" or "sqlite".
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = storage_config['backend']
+    if backend == 'mysql':
+        return ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
+    if backend == 'sqlite':
+        from .sqlite_backend import SQLiteDatabase
+        return SQLiteDatabase(storage_config['sqlite_path'],
+                              mmap_size=storage_config['mmap_size'],
+                              cache_size_kb=storage_config['cache_size_kb'])
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_pool():
+    """
+    Return the process-wide connection pool, creating it on first use.
+    Returns:
+        ConnectionPool or SQLiteDatabase: The shared pool for the backend in STORAGE_CONFIG.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = create_pool()
+    return _pool
+
+
+def get_router():
+    """
+    Return the replica router, or None when no read replicas are configured.
+    Replicas only apply to the MySQL backend; each gets its own pool sized by DB_POOL_CONFIG.
+    """
+    global _router
+    if not DB_REPLICA_CONFIG['replicas'] or STORAGE_CONFIG['backend'] != 'mysql':
+        return None
+    if _router is None:
+        with _pool_lock:
+            if _router is None:
+                pools = [ConnectionPool({**DB_CONFIG, **replica}, **DB_POOL_CONFIG)
+                         for replica in DB_REPLICA_CONFIG['replicas']]
+                _router = ReplicaRouter(pools, DB_REPLICA_CONFIG['retry_after'])
+    return _router
+
+
+@contextmanager
+def db_connection(read_only=False):
+    """
+    Borrow a pooled connection for the duration of a ``with`` block.
+
+    Read-only blocks are served by a read replica when any are configured and
+    reachable. Everything else uses the primary and counts as a write: for
+    ``read_your_writes`` seconds afterwards, read-only blocks also go to the
+    primary, so this session never reads data older than its own changes from a
+    lagging replica.
+
+    Failover happens when the connection is borrowed. If a replica fails while
+    the block is running (a lost connection rather than an SQL error), the
+    error still reaches the caller, but the replica is marked down so the next
+    read-only block goes to another replica or the primary.
+    Args:
+        read_only (bool): True if the block only reads, e.g. catalog queries.
+    Raises:
+        Error: If no connection could be obtained.
+    """
+    global _last_write
+    router = get_router() if read_only else None
+    if router is not None and time.monotonic() - _last_write > DB_REPLICA_CONFIG['read_your_writes']:
+        pool, connection = router.acquire()
+        if connection is not None:
+            try:
+                yield connection
+            except (OperationalError, InterfaceError) as e:
+                print(f"Read replica {pool.db_config.get('host')} failed: {e}")
+                router.mark_down(pool)
+                raise
+            finally:
+                pool.release(connection)
+            return
+
+    try:
+        with get_pool().connection() as connection:
+            yield connection
+    finally:
+        if not read_only:
+            _last_write = time.monotonic()
+
 
 def get_db_connection():
     """
-    Create and return a new MySQL database connection using DB_CONFIG.
+    Borrow a MySQL database connection from the shared pool.
     Returns:
         connection (mysql.connector.connection.MySQLConnection): The database connection object, or None if connection fails.
     """
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            print("Successfully connected to MySQL database")
-            return connection
+        return get_pool().acquire()
     except Error as e:
         print(f"Error connecting to MySQL database: {e}")
         return None
 
+
 def close_db_connection(connection):
     """
-    Close the given MySQL database connection if it is open.
+    Return the given connection to the shared pool.
     Args:
-        connection (mysql.connector.connection.MySQLConnection): The connection to close.
+        connection (mysql.connector.connection.MySQLConnection): The connection to release.
     """
-    if connection and connection.is_connected():
-        connection.close()
-        print("Database connection closed") 
\ No newline at end of file
+    if connection:
+        get_pool().release(connection)
+
+
+def close_pool():
+    """Close all idle pooled connections, e.g. on application shutdown."""
+    if _pool is not None:
+        _pool.close_all()
+    if _router is not None:
+        _router.close_all()
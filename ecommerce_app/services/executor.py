@@ -0,0 +1,121 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import EXECUTOR_CONFIG
+
+
+class QueryExecutor:
+    """
+    Runs blocking database work on a thread pool and delivers the results on the Tk thread.
+
+    Worker threads never touch widgets. Finished jobs are queued and drained by an
+    ``after()`` poll loop on the widget passed to ``bind``, which then invokes the
+    caller's callbacks. Jobs submitted under the same ``key`` supersede each other:
+    a pending older job is cancelled and the result of a running one is dropped.
+    """
+
+    def __init__(self, max_workers=4, poll_interval=20):
+        self.poll_interval = poll_interval
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._widget = None
+        self._poll_id = None
+
+    def bind(self, widget):
+        """
+        Start delivering results through ``widget.after`` callbacks.
+        Args:
+            widget (tk.Misc): Any widget living on the Tk main thread, usually the root window.
+        """
+        self._widget = widget
+        if self._poll_id is None:
+            self._poll_id = widget.after(self.poll_interval, self._drain)
+
+    def submit(self, func, *args, on_success=None, on_error=None, key=None, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` on a worker thread.
+        Args:
+            func (callable): The blocking call to run.
+            on_success (callable): Called on the Tk thread with the return value.
+            on_error (callable): Called on the Tk thread with the raised exception.
+            key (str): Optional request key; a newer submit with the same key supersedes this one.
+        Returns:
+            concurrent.futures.Future: The future for the submitted job.
+        """
+        future = self._pool.submit(func, *args, **kwargs)
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = future
+            if previous is not None:
+                previous.cancel()
+        future.add_done_callback(
+            lambda f: self._results.put((f, key, on_success, on_error)))
+        return future
+
+    def cancel(self, key):
+        """Cancel the outstanding job for ``key`` and discard its result."""
+        with self._lock:
+            future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        """Stop polling and shut down the worker threads without waiting for them."""
+        if self._widget is not None and self._poll_id is not None:
+            try:
+                self._widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+        self._poll_id = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _drain(self):
+        while True:
+            try:
+                future, key, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or not self._is_current(future, key):
+                continue
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Error in background query: {error}")
+                elif on_success:
+                    on_success(future.result())
+            except Exception as e:
+                print(f"Error in query callback: {e}")
+        self._poll_id = self._widget.after(self.poll_interval, self._drain)
+
+    def _is_current(self, future, key):
+        if key is None:
+            return True
+        with self._lock:
+            if self._latest.get(key) is not future:
+                return False
+            del self._latest[key]
+            return True
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the process-wide query executor, creating it on first use.
+    Returns:
+        QueryExecutor: The shared executor configured from EXECUTOR_CONFIG.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = QueryExecutor(**EXECUTOR_CONFIG)
+    return _executor
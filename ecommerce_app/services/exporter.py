@@ -0,0 +1,242 @@
+import csv
+import datetime
+import gzip
+import json
+import os
+import time
+from decimal import Decimal
+from .database import db_connection, get_pool
+
+# Exportable tables: their columns, the columns an incremental export may resume
+# from, and when a row was last written (order items are written with their order)
+TABLES = {
+    "products": {
+        "columns": ("id", "sku", "name", "description", "price", "stock", "category_id", "image_path"),
+        "watermarks": ("id",),
+        "written_at": "updated_at",
+    },
+    "orders": {
+        "columns": ("id", "user_id", "shipper_id", "order_date", "status", "total_amount", "shipping_address"),
+        "watermarks": ("id", "order_date"),
+        "written_at": "order_date",
+    },
+    "order_items": {
+        "columns": ("id", "order_id", "product_id", "quantity", "price"),
+        "watermarks": ("id",),
+        "written_at": "(SELECT order_date FROM orders WHERE orders.id = order_items.order_id)",
+    },
+}
+
+# The time ``safety_lag`` seconds ago, in each backend's own clock
+CUTOFFS = {
+    "mysql": "NOW() - INTERVAL %s SECOND",
+    "sqlite": "datetime('now', '-' || %s || ' seconds')",
+}
+
+WATERMARK_FILE = "watermarks.json"
+
+
+def _plain(value):
+    # JSON and CSV friendly form of the values mysql.connector returns
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class ChunkWriter:
+    """
+    Writes rows to a series of gzip-compressed files of at most ``chunk_rows`` rows each.
+
+    Files are named ``<prefix>-00001.jsonl.gz``, ``<prefix>-00002.jsonl.gz`` and
+    so on (``.csv.gz`` for CSV, each chunk with its own header row), so a
+    consumer can start loading the first chunk while later ones are written.
+    """
+
+    def __init__(self, directory, prefix, columns, fmt="jsonl", chunk_rows=100000):
+        self.directory = directory
+        self.prefix = prefix
+        self.columns = columns
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.paths = []
+        self._file = None
+        self._csv = None
+        self._rows_in_chunk = 0
+
+    def write(self, row):
+        """Write one row, given as a tuple in ``columns`` order."""
+        if self._file is None or self._rows_in_chunk >= self.chunk_rows:
+            self._open_next()
+        values = [_plain(value) for value in row]
+        if self._csv is not None:
+            self._csv.writerow(values)
+        else:
+            self._file.write(json.dumps(dict(zip(self.columns, values)), ensure_ascii=False))
+            self._file.write("\n")
+        self._rows_in_chunk += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_next(self):
+        self.close()
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths) + 1:05d}.{self.fmt}.gz")
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._file) if self.fmt == "csv" else None
+        if self._csv is not None:
+            self._csv.writerow(self.columns)
+        self._rows_in_chunk = 0
+        self.paths.append(path)
+
+
+def load_watermarks(directory):
+    """Return the watermarks recorded by the last export into ``directory``."""
+    try:
+        with open(os.path.join(directory, WATERMARK_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_watermarks(directory, watermarks):
+    path = os.path.join(directory, WATERMARK_FILE)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def export_tables(directory, tables=tuple(TABLES), fmt="jsonl", chunk_rows=100000,
+                  fetch_size=1000, incremental=True, watermark_columns=None, safety_lag=300):
+    """
+    Stream tables into compressed chunk files, optionally only rows added since the last export.
+
+    All tables are read inside one consistent-snapshot, read-only transaction:
+    InnoDB serves it from its undo history without taking row or table locks, so
+    the shop keeps running, and orders and order items come from the same point
+    in time. Each table is read through an unbuffered cursor ``fetch_size`` rows
+    at a time, so memory use does not grow with the table size. Read-only work
+    goes to a read replica when one is configured.
+
+    With ``incremental`` set, each table resumes after the watermark (the highest
+    id or timestamp) recorded in ``directory`` by the previous export, and the new
+    watermarks are saved once every table has been written.
+
+    Rows written less than ``safety_lag`` seconds ago are held back for the next
+    export. Ids and timestamps are assigned when a row is inserted, not when it
+    commits, so a transaction still open during the export can commit a row
+    below a watermark that was already saved, and a later row can share the
+    watermark's second. Stopping each table at the highest id or timestamp among
+    rows older than the lag leaves nothing behind it that can still appear, as
+    long as no transaction stays open longer than the lag.
+    Args:
+        directory (str): Where the chunk files and watermarks.json go.
+        tables (iterable of str): Names from TABLES to export.
+        fmt (str): "jsonl" or "csv".
+        chunk_rows (int): Maximum rows per output file.
+        fetch_size (int): Rows fetched from the server per round trip.
+        incremental (bool): Only export rows past the saved watermarks.
+        watermark_columns (dict): Table name to watermark column, for tables
+            that allow more than one; defaults to "id".
+        safety_lag (int): Seconds a row must have been written before it is exported.
+    Returns:
+        dict: Table name to (rows exported, list of file paths).
+    Raises:
+        ValueError: If a table, format or watermark column is unknown.
+        Error: On database errors; the saved watermarks are left unchanged.
+    """
+    # Checked before anything is written, so a bad argument leaves no partial export
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError(f"Unknown export format: {fmt}")
+    watermark_columns = watermark_columns or {}
+    for table in set(tables) | set(watermark_columns):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+    for table, column in watermark_columns.items():
+        if column not in TABLES[table]["watermarks"]:
+            raise ValueError(f"{table} cannot be exported incrementally by {column}")
+
+    cutoff = CUTOFFS[get_pool().dialect]
+    os.makedirs(directory, exist_ok=True)
+    watermarks = load_watermarks(directory)
+    run = time.strftime("%Y%m%dT%H%M%S")
+    results = {}
+
+    with db_connection(read_only=True) as connection:
+        connection.start_transaction(consistent_snapshot=True, readonly=True)
+        try:
+            for table in tables:
+                column = watermark_columns.get(table, "id")
+                previous = watermarks.get(table)
+                resume = incremental and previous and previous["column"] == column
+                since = previous["value"] if resume else None
+                rows, paths, last = _export_table(connection, directory, f"{table}-{run}", table, column,
+                                                  since, cutoff, safety_lag, fmt, chunk_rows, fetch_size)
+                results[table] = (rows, paths)
+                if last is not None:
+                    watermarks[table] = {"column": column, "value": last}
+            connection.commit()
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+
+    save_watermarks(directory, watermarks)
+    return results
+
+
+def _settled(cursor, table, column, since, cutoff, safety_lag):
+    # The highest watermark value among rows written at least safety_lag seconds
+    # ago; only rows past the previous watermark are looked at. Rows without a
+    # write time (products from before updated_at existed) count as settled
+    written_at = TABLES[table]["written_at"]
+    where = f"{column} > %s AND " if since is not None else ""
+    cursor.execute(f"""
+        SELECT MAX({column}) FROM {table}
+        WHERE {where}({written_at} IS NULL OR {written_at} <= {cutoff})
+    """, ((since,) if since is not None else ()) + (safety_lag,))
+    return cursor.fetchone()[0]
+
+
+def _export_table(connection, directory, prefix, table, column, since, cutoff, safety_lag,
+                  fmt, chunk_rows, fetch_size):
+    columns = TABLES[table]["columns"]
+    writer = ChunkWriter(directory, prefix, columns, fmt, chunk_rows)
+    cursor = connection.cursor()
+    try:
+        until = _settled(cursor, table, column, since, cutoff, safety_lag)
+    finally:
+        cursor.close()
+    if until is None:
+        return 0, writer.paths, None
+
+    where, params = f"WHERE {column} <= %s", (until,)
+    if since is not None:
+        where, params = f"{where} AND {column} > %s", params + (since,)
+    cursor = connection.cursor(buffered=False)
+    position = columns.index(column)
+    rows, last = 0, None
+    try:
+        cursor.execute(f"""
+            SELECT {", ".join(columns)} FROM {table}
+            {where}
+            ORDER BY {column}, id
+        """, params)
+        while True:
+            batch = cursor.fetchmany(fetch_size)
+            if not batch:
+                break
+            for row in batch:
+                writer.write(row)
+            rows += len(batch)
+            last = _plain(batch[-1][position])
+    finally:
+        writer.close()
+        cursor.close()
+    return rows, writer.paths, last
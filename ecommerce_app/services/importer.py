@@ -0,0 +1,223 @@
+import csv
+import json
+import os
+from decimal import Decimal
+from .database import db_connection, get_pool
+
+
+# Largest values the products and categories columns hold; MySQL in strict mode
+# fails the whole multi-row INSERT over a single row that does not fit
+MAX_LENGTHS = {"sku": 64, "name": 100, "category": 50, "image_path": 255}
+MAX_PRICE = Decimal("99999999.99")  # decimal(10,2)
+MAX_STOCK = 2 ** 31 - 1  # int
+CENTS = Decimal("0.01")
+
+
+class FeedError(Exception):
+    """Raised when a product feed cannot be read."""
+
+
+def read_feed(path, feed_format=None):
+    """
+    Stream the records of a product feed without loading the whole file.
+    Args:
+        path (str): A CSV file with a header row, or a JSON Lines file.
+        feed_format (str): "csv" or "jsonl"; guessed from the extension if None.
+    Yields:
+        tuple: (line number, dict of the record's fields, or None if the line
+        is not valid JSON).
+    Raises:
+        FeedError: If the format is unknown.
+    """
+    if feed_format is None:
+        feed_format = os.path.splitext(path)[1].lstrip(".").lower()
+    if feed_format not in ("csv", "jsonl", "ndjson"):
+        raise FeedError(f"Unsupported feed format: {feed_format!r}")
+
+    # utf-8-sig drops the byte order mark spreadsheet exports start with, which
+    # would otherwise stick to the first CSV header
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if feed_format == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, None
+
+
+def parse_product(record):
+    """
+    Turn a feed record into the values of a products row.
+    Args:
+        record (dict): Fields sku, name, price, stock and optionally description,
+            category and image_path.
+    Returns:
+        tuple: (sku, name, description, price, stock, category, image_path).
+    Raises:
+        ValueError: If a required field is missing or malformed, or a value does
+            not fit its column.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("not a valid JSON object")
+    sku = str(record.get("sku") or "").strip()
+    name = str(record.get("name") or "").strip()
+    if not sku or not name:
+        raise ValueError("sku and name are required")
+    try:
+        price = Decimal(str(record["price"]))
+        stock = int(record.get("stock") or 0)
+    except (KeyError, ArithmeticError, ValueError):
+        # ArithmeticError covers InvalidOperation, and int() of an infinite float
+        raise ValueError("price and stock must be numbers")
+    if not price.is_finite():
+        raise ValueError("price must be a finite number")
+    if price < 0 or stock < 0:
+        raise ValueError("price and stock cannot be negative")
+    # Rounded to cents as the column would, which can carry it past the maximum
+    if price > MAX_PRICE or price.quantize(CENTS) > MAX_PRICE or stock > MAX_STOCK:
+        raise ValueError("price or stock is too large")
+    price = price.quantize(CENTS)
+    category = str(record.get("category") or "").strip() or None
+    image_path = record.get("image_path") or None
+    for field, value in (("sku", sku), ("name", name), ("category", category), ("image_path", image_path)):
+        if value is not None and len(str(value)) > MAX_LENGTHS[field]:
+            raise ValueError(f"{field} is longer than {MAX_LENGTHS[field]} characters")
+    return (sku, name, record.get("description") or None, price, stock, category, image_path)
+
+
+class CategoryLookup:
+    """
+    Resolves category names to ids, creating missing categories on first sight.
+
+    Every category is read once up front, so a feed with hundreds of thousands
+    of rows but a few dozen categories costs no per-row lookups.
+    """
+
+    def __init__(self, cursor, dialect="mysql"):
+        self.cursor = cursor
+        self._insert = ("INSERT IGNORE INTO categories (name) VALUES (%s)" if dialect == "mysql"
+                        else "INSERT OR IGNORE INTO categories (name) VALUES (%s)")
+        cursor.execute("SELECT id, name FROM categories")
+        self._ids = {name.lower(): category_id for category_id, name in cursor.fetchall()}
+
+    def resolve(self, name):
+        """Return the id of category ``name``, or None for no category."""
+        if name is None:
+            return None
+        category_id = self._ids.get(name.lower())
+        if category_id is None:
+            self.cursor.execute(self._insert, (name,))
+            self.cursor.execute("SELECT id FROM categories WHERE name = %s", (name,))
+            category_id = self._ids[name.lower()] = self.cursor.fetchone()[0]
+        return category_id
+
+
+class ImportStats:
+    """Counts kept while importing a feed."""
+
+    __slots__ = ("read", "written", "skipped")
+
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.skipped = 0
+
+
+def import_products(path, feed_format=None, batch_size=1000, commit_size=20000):
+    """
+    Load a product feed into the products table, matching existing products by SKU.
+
+    Records are streamed from the file and written ``batch_size`` at a time with
+    a multi-row upsert (``ON DUPLICATE KEY UPDATE`` on MySQL, ``ON CONFLICT`` on
+    SQLite), so new SKUs are added and known ones pick up the feed's current name, price and stock in the same
+    statement; optional fields the feed leaves empty keep their current value.
+    A transaction is committed every ``commit_size`` products, which keeps undo
+    logs and lock lists small on large feeds. Malformed records, and records
+    with a value too large for its column, are reported and skipped.
+    Args:
+        path (str): The feed file (CSV with a header row, or JSON Lines).
+        feed_format (str): "csv" or "jsonl"; guessed from the extension if None.
+        batch_size (int): Products per INSERT statement.
+        commit_size (int): Products per transaction.
+    Returns:
+        ImportStats: How many records were read, written and skipped.
+    Raises:
+        FeedError: If the format is unknown.
+        Error: On database errors; batches committed before stay imported.
+    """
+    stats = ImportStats()
+    dialect = get_pool().dialect
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        # Begin before the category lookup: with autocommit off its SELECT would
+        # open a transaction implicitly, and start_transaction refuses to nest
+        connection.start_transaction()
+        batch, uncommitted = [], 0
+        try:
+            categories = CategoryLookup(cursor, dialect)
+            for line_number, record in read_feed(path, feed_format):
+                stats.read += 1
+                try:
+                    sku, name, description, price, stock, category, image_path = parse_product(record)
+                except ValueError as e:
+                    print(f"Skipping line {line_number}: {e}")
+                    stats.skipped += 1
+                    continue
+                batch.append((sku, name, description, price, stock,
+                              categories.resolve(category), image_path))
+                if len(batch) >= batch_size:
+                    _write_batch(cursor, batch, dialect)
+                    stats.written += len(batch)
+                    uncommitted += len(batch)
+                    batch = []
+                    if uncommitted >= commit_size:
+                        connection.commit()
+                        connection.start_transaction()
+                        uncommitted = 0
+            if batch:
+                _write_batch(cursor, batch, dialect)
+                stats.written += len(batch)
+            connection.commit()
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+    return stats
+
+
+# How an imported row updates the product that already has its SKU
+UPSERT_CLAUSES = {
+    "mysql": """
+        ON DUPLICATE KEY UPDATE
+            name = VALUES(name),
+            description = COALESCE(VALUES(description), description),
+            price = VALUES(price),
+            stock = VALUES(stock),
+            category_id = COALESCE(VALUES(category_id), category_id),
+            image_path = COALESCE(VALUES(image_path), image_path)
+    """,
+    "sqlite": """
+        ON CONFLICT (sku) DO UPDATE SET
+            name = excluded.name,
+            description = COALESCE(excluded.description, description),
+            price = excluded.price,
+            stock = excluded.stock,
+            category_id = COALESCE(excluded.category_id, category_id),
+            image_path = COALESCE(excluded.image_path, image_path)
+    """,
+}
+
+
+def _write_batch(cursor, batch, dialect="mysql"):
+    rows = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(batch))
+    cursor.execute(f"""
+        INSERT INTO products (sku, name, description, price, stock, category_id, image_path)
+        VALUES {rows}
+        {UPSERT_CLAUSES[dialect]}
+    """, tuple(value for row in batch for value in row))
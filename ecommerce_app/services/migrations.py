@@ -0,0 +1,299 @@
+import importlib.util
+import os
+import re
+import time
+from contextlib import contextmanager
+from mysql.connector import Error
+
+# Migration files are named <version>_<name>.sql or <version>_<name>.py
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.(sql|py)$")
+
+
+class MigrationError(Exception):
+    """Raised when a migration fails or the migrations table cannot be used."""
+
+
+def split_statements(sql):
+    """
+    Split a migration script into statements.
+    Statements end with a semicolon at the end of a line; ``--`` comment lines are dropped.
+    """
+    statements, current = [], []
+    for line in sql.splitlines():
+        if line.strip().startswith("--"):
+            continue
+        current.append(line)
+        if line.rstrip().endswith(";"):
+            statement = "\n".join(current).strip().rstrip(";").strip()
+            if statement:
+                statements.append(statement)
+            current = []
+    rest = "\n".join(current).strip()
+    if rest:
+        statements.append(rest)
+    return statements
+
+
+def column_exists(cursor, table, column):
+    """Tell whether ``table`` in the current database has a column named ``column``."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def table_exists(cursor, table):
+    """Tell whether the current database has a table named ``table``."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def primary_key(cursor, table):
+    """
+    Return the name of ``table``'s single-column primary key.
+    Raises:
+        MigrationError: If the table has no primary key or a composite one.
+    """
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'
+    """, (table,))
+    columns = [row[0] for row in cursor.fetchall()]
+    if len(columns) != 1:
+        raise MigrationError(f"Table {table} has no single-column primary key to copy it by")
+    return columns[0]
+
+
+class Backfill:
+    """
+    Copies or rewrites a large table in small, separately committed batches.
+
+    A single ``INSERT ... SELECT`` or ``UPDATE`` over a whole table holds its
+    locks until the last row is done, stalling the application for the whole
+    copy. A backfill walks the source table's primary key instead. It finds the
+    key that ends each batch of ``batch_size`` rows, runs the statement for that
+    key range only, commits, and optionally sleeps ``pause`` seconds so
+    replication and other sessions can keep up.
+    """
+
+    def __init__(self, connection, batch_size=1000, pause=0.0):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def run(self, table, key, statement, params=()):
+        """
+        Run ``statement`` over ``table`` one key range at a time.
+        Args:
+            table (str): The table whose primary key drives the batches.
+            key (str): That table's integer primary key column.
+            statement (str): SQL restricted to a key range by a condition like
+                ``key > %s AND key <= %s``; its last two placeholders receive the
+                exclusive lower and inclusive upper bound of each batch.
+            params (tuple): Values for any placeholders before the two bounds.
+        Returns:
+            int: Total rows affected.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+        first, last = cursor.fetchone()
+        if first is None:
+            return 0
+
+        affected = 0
+        lower = first - 1
+        while lower < last:
+            # The key that ends this batch, found by walking the primary key index
+            cursor.execute(f"""
+                SELECT {key} FROM {table} WHERE {key} > %s
+                ORDER BY {key} LIMIT 1 OFFSET %s
+            """, (lower, self.batch_size - 1))
+            row = cursor.fetchone()
+            upper = row[0] if row else last
+            cursor.execute(statement, params + (lower, upper))
+            affected += max(cursor.rowcount, 0)
+            self.connection.commit()
+            lower = upper
+            if self.pause:
+                time.sleep(self.pause)
+        return affected
+
+
+class Migration:
+    """One versioned schema change: a SQL script, or a Python module with ``upgrade``."""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def apply(self, connection, backfill):
+        """
+        Run the migration on ``connection``.
+        SQL scripts run statement by statement. Python migrations define
+        ``upgrade(connection, backfill)`` and can inspect the schema first or copy
+        data in batches with ``backfill``.
+        """
+        if self.path.endswith(".py"):
+            spec = importlib.util.spec_from_file_location(f"migration_{self.version:04d}", self.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade(connection, backfill)
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            statements = split_statements(f.read())
+        cursor = connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+            if cursor.with_rows:
+                cursor.fetchall()  # e.g. ANALYZE TABLE reports its result
+
+    def __repr__(self):
+        return f"Migration({self.version:04d}_{self.name})"
+
+
+def discover(directory):
+    """
+    Find the migrations in ``directory``.
+    Returns:
+        list of Migration: Ordered by version.
+    Raises:
+        MigrationError: If two files share a version number.
+    """
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}: {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+class MigrationRunner:
+    """
+    Applies pending migrations in version order and records each one in ``schema_migrations``.
+
+    Only one runner works on a database at a time; a MySQL named lock keeps
+    concurrent runs (say, two installs upgrading at once) from interleaving. Each
+    migration's statements run in a transaction that also records its version,
+    so data changes of a failed step are rolled back and the step is retried on
+    the next run. MySQL commits DDL statements implicitly, so a migration that
+    changes the schema should hold a single change, or check the schema before
+    altering it as the Python migrations do, so that a rerun is safe.
+    """
+
+    LOCK_NAME = "cartx_schema_migrations"
+
+    def __init__(self, pool, directory, batch_size=1000, batch_pause=0.0, lock_timeout=10):
+        self.pool = pool
+        self.directory = directory
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.lock_timeout = lock_timeout
+
+    def status(self):
+        """
+        Return every migration with whether it has been applied.
+        Returns:
+            list of tuple: (Migration, applied) pairs in version order.
+        """
+        with self.pool.connection() as connection:
+            applied = self._applied(connection)
+        return [(migration, migration.version in applied) for migration in discover(self.directory)]
+
+    def migrate(self, target=None):
+        """
+        Apply every pending migration up to and including ``target``.
+        Args:
+            target (int): Highest version to apply, or None for all of them.
+        Returns:
+            list of Migration: The migrations that were applied.
+        Raises:
+            MigrationError: If a migration fails; earlier ones stay applied.
+        """
+        applied_now = []
+        with self.pool.connection() as connection:
+            with self._locked(connection):
+                applied = self._applied(connection)
+                for migration in discover(self.directory):
+                    if migration.version in applied or (target is not None and migration.version > target):
+                        continue
+                    print(f"Applying migration {migration.version:04d}_{migration.name}")
+                    self._apply(connection, migration)
+                    applied_now.append(migration)
+        return applied_now
+
+    def baseline(self, version):
+        """
+        Mark every migration up to ``version`` as applied without running it.
+        For databases that were set up by hand before migrations were tracked.
+        Returns:
+            list of Migration: The migrations that were marked.
+        """
+        marked = []
+        with self.pool.connection() as connection:
+            with self._locked(connection):
+                applied = self._applied(connection)
+                cursor = connection.cursor()
+                for migration in discover(self.directory):
+                    if migration.version <= version and migration.version not in applied:
+                        cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                                       (migration.version, migration.name))
+                        marked.append(migration)
+                connection.commit()
+        return marked
+
+    def _apply(self, connection, migration):
+        backfill = Backfill(connection, self.batch_size, self.batch_pause)
+        try:
+            if connection.in_transaction:
+                connection.commit()  # a leftover implicit read transaction; start_transaction would refuse
+            connection.start_transaction()
+            migration.apply(connection, backfill)
+            if not connection.in_transaction:
+                connection.start_transaction()  # DDL or a backfill committed; record the version on its own
+            connection.cursor().execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                                        (migration.version, migration.name))
+            connection.commit()
+        except (Error, MigrationError) as e:
+            if connection.in_transaction:
+                connection.rollback()
+            raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+
+    def _applied(self, connection):
+        cursor = connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+              version int NOT NULL,
+              name varchar(255) NOT NULL,
+              applied_at timestamp DEFAULT CURRENT_TIMESTAMP,
+              PRIMARY KEY (version)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+        """)
+        cursor.execute("SELECT version FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+        # With autocommit off the SELECT opened a transaction; end it so each
+        # migration can start its own
+        connection.commit()
+        return applied
+
+    @contextmanager
+    def _locked(self, connection):
+        # A MySQL named lock, held for the duration of the with block
+        cursor = connection.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (self.LOCK_NAME, self.lock_timeout))
+        if cursor.fetchone()[0] != 1:
+            raise MigrationError("Another migration run is in progress")
+        try:
+            yield
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (self.LOCK_NAME,))
+            cursor.fetchall()
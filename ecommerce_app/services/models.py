@@ -0,0 +1,60 @@
+import sys
+
+
+class Product:
+    """
+    A catalog product.
+
+    Products are the most numerous objects in the app, so they use ``__slots__``
+    instead of a per-instance dict, and category names are interned so every
+    product in a category shares one string.
+    """
+
+    __slots__ = ("id", "name", "description", "price", "stock", "image_path", "category")
+
+    # Column order expected by from_row, matching the catalog SELECT lists
+    COLUMNS = "p.id, p.name, p.description, p.price, p.stock, p.image_path, c.name AS category"
+
+    def __init__(self, id, name, description, price, stock, image_path, category):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.price = price
+        self.stock = stock
+        self.image_path = image_path
+        self.category = sys.intern(category) if category else category
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a product from a tuple row selected with ``Product.COLUMNS``.
+        Extra trailing columns, such as a relevance score, are ignored.
+        """
+        return cls(*row[:7])
+
+    def __repr__(self):
+        return f"Product(id={self.id!r}, name={self.name!r})"
+
+
+class Category:
+    """A product category and how many products it holds."""
+
+    __slots__ = ("id", "name", "product_count")
+
+    def __init__(self, id, name, product_count=0):
+        self.id = id
+        self.name = sys.intern(name)
+        self.product_count = product_count
+
+    def __repr__(self):
+        return f"Category(id={self.id!r}, name={self.name!r})"
+
+
+class CartItem:
+    """A product in the cart and the quantity chosen."""
+
+    __slots__ = ("product", "quantity")
+
+    def __init__(self, product, quantity=1):
+        self.product = product
+        self.quantity = quantity
@@ -0,0 +1,103 @@
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+import bcrypt
+from config import PASSWORD_CONFIG
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def hash_password(password, rounds=None):
+    """
+    Hash a password with bcrypt. Slow on purpose; never call it on the Tk thread.
+    Args:
+        password (str): The plaintext password.
+        rounds (int): bcrypt cost factor; defaults to PASSWORD_CONFIG.
+    Returns:
+        str: The hash, in the usual ``$2b$<cost>$...`` form.
+    """
+    if rounds is None:
+        rounds = PASSWORD_CONFIG['bcrypt_rounds']
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("ascii")
+
+
+def needs_rehash(stored):
+    """Tell whether a stored password is plaintext or hashed below the configured cost."""
+    if not stored.startswith(BCRYPT_PREFIXES):
+        return True
+    try:
+        cost = int(stored.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost < PASSWORD_CONFIG['bcrypt_rounds']
+
+
+class PasswordVerifier:
+    """
+    Checks passwords against stored hashes, remembering recent successes.
+
+    A bcrypt check costs tens to hundreds of milliseconds by design. After one
+    succeeds, the stored hash is remembered with an HMAC of the password under a
+    key that only lives in this process, so logging in again with the same
+    credentials is a cheap constant-time comparison. The plaintext password is
+    never kept, and changing the stored hash invalidates the entry.
+
+    Rows that still hold a plaintext password (from before hashing was
+    introduced) are compared directly; ``needs_rehash`` reports them so the
+    caller can replace them with a hash.
+    """
+
+    def __init__(self, cache_size=256):
+        self.cache_size = cache_size
+        self._key = os.urandom(32)
+        self._verified = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verify(self, password, stored):
+        """
+        Check a password against what the users table holds for the account.
+        Args:
+            password (str): The password that was entered.
+            stored (str): The stored bcrypt hash, or a legacy plaintext password.
+        Returns:
+            bool: True if the password matches.
+        """
+        if not stored:
+            return False
+        digest = hmac.new(self._key, password.encode("utf-8"), hashlib.sha256).digest()
+        with self._lock:
+            known = self._verified.get(stored)
+            if known is not None:
+                self._verified.move_to_end(stored)
+        if known is not None:
+            return hmac.compare_digest(known, digest)
+
+        if stored.startswith(BCRYPT_PREFIXES):
+            try:
+                valid = bcrypt.checkpw(password.encode("utf-8"), stored.encode("ascii"))
+            except ValueError:
+                return False
+        else:
+            valid = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+        if valid:
+            with self._lock:
+                self._verified[stored] = digest
+                if len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+        return valid
+
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_verifier():
+    """Return the shared password verifier."""
+    global _verifier
+    with _verifier_lock:
+        if _verifier is None:
+            _verifier = PasswordVerifier(PASSWORD_CONFIG['verify_cache_size'])
+        return _verifier
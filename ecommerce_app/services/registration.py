@@ -0,0 +1,54 @@
+from mysql.connector import Error
+from .database import db_connection
+from .passwords import hash_password
+
+# MySQL error for a row that collides with a PRIMARY or UNIQUE key
+ER_DUP_ENTRY = 1062
+
+# Friendly messages for the unique keys of the users table
+DUPLICATE_MESSAGES = {
+    "username": "That username is already taken.",
+    "email": "An account with that email already exists.",
+}
+
+
+def _duplicate_message(error):
+    # The message names the key, e.g. "... for key 'users.email'"
+    key = error.msg.rsplit("for key", 1)[-1].strip(" '`")
+    return DUPLICATE_MESSAGES.get(key.rsplit(".", 1)[-1], "Username or email already exists.")
+
+
+def register_user(username, password, email, phone=None, address=None, full_name=None):
+    """
+    Create a new user account with a single INSERT.
+
+    There is no separate existence check: the unique keys on ``username`` and
+    ``email`` reject duplicates atomically, and the duplicate-key error is turned
+    into a message naming the field that clashed. Blocking; run it through the
+    query executor from UI code.
+    Args:
+        username (str): The login name.
+        password (str): The plaintext password; only its hash is stored.
+        email (str): The email address.
+        phone (str): Optional phone number.
+        address (str): Optional shipping address.
+        full_name (str): Optional display name; defaults to the username.
+    Returns:
+        tuple: (success, message)
+    """
+    # Hash before borrowing a connection, so bcrypt's deliberate slowness does
+    # not keep a pooled primary connection busy
+    password_hash = hash_password(password)
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                INSERT INTO users (username, password, email, full_name, phone_number, address)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (username, password_hash, email, full_name or username, phone, address))
+            connection.commit()
+    except Error as e:
+        if e.errno == ER_DUP_ENTRY:
+            return False, _duplicate_message(e)
+        raise
+    return True, "Account created successfully!"
@@ -0,0 +1,140 @@
+import threading
+from mysql.connector import Error
+from config import RESERVATION_CONFIG
+from .database import db_connection, get_pool
+
+# The current time in each backend's SQL; hold expiry times are compared against it
+NOW_SQL = {"mysql": "NOW()", "sqlite": "datetime('now')"}
+
+
+def reserve(user_id, product_id, quantity, hold_seconds=None):
+    """
+    Hold units of a product for a user's cart.
+
+    The hold replaces any earlier hold by the same user on the same product and
+    expires after ``hold_seconds``. The product row is locked only for the few
+    statements of this call, never across the time the item sits in the cart.
+    Args:
+        user_id (int): The customer.
+        product_id (int): The product to hold.
+        quantity (int): Total units the user wants held.
+        hold_seconds (int): How long the hold lasts; defaults to RESERVATION_CONFIG.
+    Returns:
+        tuple: (success, available) where available is the number of units
+        this user could hold right now.
+    """
+    if hold_seconds is None:
+        hold_seconds = RESERVATION_CONFIG['hold_seconds']
+    dialect = get_pool().dialect
+    with db_connection() as connection:
+        connection.start_transaction()
+        try:
+            cursor = connection.cursor()
+            # SQLite's transaction already holds the write lock FOR UPDATE would take
+            lock = " FOR UPDATE" if dialect == "mysql" else ""
+            cursor.execute(f"SELECT stock FROM products WHERE id = %s{lock}", (product_id,))
+            row = cursor.fetchone()
+            if row is None:
+                connection.rollback()
+                return False, 0
+            cursor.execute(f"""
+                SELECT COALESCE(SUM(quantity), 0)
+                FROM stock_reservations
+                WHERE product_id = %s AND user_id <> %s AND expires_at > {NOW_SQL[dialect]}
+            """, (product_id, user_id))
+            available = max(0, row[0] - int(cursor.fetchone()[0]))
+            if quantity > available:
+                connection.rollback()
+                return False, available
+
+            if dialect == "mysql":
+                cursor.execute("""
+                    INSERT INTO stock_reservations (product_id, user_id, quantity, expires_at)
+                    VALUES (%s, %s, %s, NOW() + INTERVAL %s SECOND)
+                    ON DUPLICATE KEY UPDATE quantity = VALUES(quantity), expires_at = VALUES(expires_at)
+                """, (product_id, user_id, quantity, hold_seconds))
+            else:
+                cursor.execute("""
+                    INSERT INTO stock_reservations (product_id, user_id, quantity, expires_at)
+                    VALUES (%s, %s, %s, datetime('now', %s || ' seconds'))
+                    ON CONFLICT (user_id, product_id) DO UPDATE
+                    SET quantity = excluded.quantity, expires_at = excluded.expires_at
+                """, (product_id, user_id, quantity, int(hold_seconds)))
+            connection.commit()
+            return True, available
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+
+
+def release(user_id, product_id=None):
+    """
+    Drop a user's hold on a product, or all of the user's holds.
+    Args:
+        user_id (int): The customer.
+        product_id (int): The product to release, or None for every product.
+    """
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        if product_id is None:
+            cursor.execute("DELETE FROM stock_reservations WHERE user_id = %s", (user_id,))
+        else:
+            cursor.execute("DELETE FROM stock_reservations WHERE user_id = %s AND product_id = %s",
+                           (user_id, product_id))
+        connection.commit()
+
+
+def sweep_expired(batch_size=1000):
+    """
+    Delete expired holds in bounded batches, so no single statement locks many rows.
+    Args:
+        batch_size (int): Maximum rows deleted per statement.
+    Returns:
+        int: The number of holds released.
+    """
+    if get_pool().dialect == "mysql":
+        statement = "DELETE FROM stock_reservations WHERE expires_at <= NOW() LIMIT %s"
+    else:
+        # SQLite's DELETE takes no LIMIT unless built with it; bound the batch by id instead
+        statement = """
+            DELETE FROM stock_reservations WHERE id IN (
+                SELECT id FROM stock_reservations WHERE expires_at <= datetime('now') LIMIT %s
+            )
+        """
+    released = 0
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        while True:
+            cursor.execute(statement, (batch_size,))
+            connection.commit()
+            released += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return released
+
+
+class ReservationSweeper:
+    """Background thread that periodically releases expired stock holds."""
+
+    def __init__(self, interval=60, batch_size=1000):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="reservation-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                released = sweep_expired(self.batch_size)
+                if released:
+                    print(f"Released {released} expired stock reservations")
+            except Error as e:
+                print(f"Error sweeping stock reservations: {e}")
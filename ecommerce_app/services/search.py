@@ -0,0 +1,84 @@
+import threading
+from collections import defaultdict
+
+NGRAM_SIZE = 3
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """
+    Trigram index over the names of a product list, for substring search in memory.
+
+    A query of three or more characters only looks at products that contain every
+    trigram of the query; shorter queries scan the list. When a query extends the
+    previous one (the user typed another character), the previous matches are
+    narrowed instead of consulting the index again. The category filter is applied
+    in the same pass that verifies the matches.
+    """
+
+    def __init__(self, products):
+        self.products = products
+        self._names = [p.name.lower() for p in products]
+        self._grams = defaultdict(set)
+        for position, name in enumerate(self._names):
+            for gram in _ngrams(name):
+                self._grams[gram].add(position)
+        self._lock = threading.Lock()
+        self._last_text = None
+        self._last_matches = None
+
+    def search(self, text, category=None):
+        """
+        Find products whose name contains ``text``, optionally within one category.
+        Args:
+            text (str): The search string (case-insensitive, partial match).
+            category (str): Category name to keep, or None for every category.
+        Returns:
+            list of Product: Matching products, in catalog order.
+        """
+        text = text.lower().strip()
+        with self._lock:
+            last_text, last_matches = self._last_text, self._last_matches
+        if last_text is not None and text.startswith(last_text):
+            candidates = last_matches
+        elif len(text) >= NGRAM_SIZE:
+            postings = sorted((self._grams.get(gram, set()) for gram in _ngrams(text)), key=len)
+            candidates = sorted(set.intersection(*postings))
+        else:
+            candidates = range(len(self.products))
+
+        names, products = self._names, self.products
+        matches = []
+        results = []
+        for position in candidates:
+            if text in names[position]:
+                matches.append(position)
+                product = products[position]
+                if category is None or product.category == category:
+                    results.append(product)
+
+        with self._lock:
+            self._last_text, self._last_matches = text, matches
+        return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(products):
+    """
+    Return a search index over ``products``, rebuilding it when the list changes.
+    Args:
+        products (list of Product): The current catalog, as returned by the catalog cache.
+    Returns:
+        SearchIndex: An index over exactly this product list.
+    """
+    global _index
+    with _index_lock:
+        if _index is None or _index.products is not products:
+            _index = SearchIndex(products)
+        return _index
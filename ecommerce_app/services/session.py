@@ -0,0 +1,146 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+
+
+class UserProfile:
+    """The logged-in user's details, as issued into the session token."""
+
+    __slots__ = ("user_id", "username", "full_name", "is_admin", "expires_at")
+
+    def __init__(self, user_id, username, full_name=None, is_admin=False, expires_at=0):
+        self.user_id = user_id
+        self.username = username
+        self.full_name = full_name
+        self.is_admin = bool(is_admin)
+        self.expires_at = expires_at
+
+    @property
+    def display_name(self):
+        return self.full_name or self.username
+
+    def expired(self, now=None):
+        return (time.time() if now is None else now) >= self.expires_at
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def load_secret_key(path):
+    """
+    Return this install's session signing key, generating it on first use.
+    The key is random, stored in ``path`` readable by this user only, and never
+    leaves the machine, so a session file cannot be forged without it.
+    Args:
+        path (str): The key file.
+    Returns:
+        str: The key; a throwaway one for this run if the file cannot be used.
+    """
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            key = f.read().strip()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading session key: {e}")
+        return secrets.token_hex(32)
+
+    key = secrets.token_hex(32)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="ascii") as f:
+            f.write(key)
+        os.replace(temp_path, path)
+    except OSError as e:
+        # Sessions still work for this run; they just do not survive a restart
+        print(f"Error saving session key: {e}")
+    return key
+
+
+class SessionStore:
+    """
+    Signed session tokens kept in a local file.
+
+    A token is the user's profile as JSON plus an expiry time, base64-encoded and
+    signed with HMAC-SHA256 under ``secret_key``. Loading checks the signature
+    (so an edited file is rejected) and the expiry before trusting the profile,
+    which lets the app start without asking for the password again or querying
+    the users table.
+    """
+
+    def __init__(self, path, secret_key, timeout=3600):
+        self.path = path
+        self.secret_key = secret_key.encode("utf-8")
+        self.timeout = timeout
+
+    def issue(self, user_id, username, full_name=None, is_admin=False):
+        """
+        Start a session for a user who just logged in, and save its token.
+        Returns:
+            UserProfile: The session's profile, expiring ``timeout`` seconds from now.
+        """
+        profile = UserProfile(user_id, username, full_name, is_admin,
+                              int(time.time()) + self.timeout)
+        try:
+            self._write(self.encode(profile))
+        except OSError as e:
+            # The session still works for this run; only the restart shortcut is lost
+            print(f"Error saving session: {e}")
+        return profile
+
+    def load(self):
+        """
+        Return the saved session's profile, or None if there is no valid, unexpired session.
+        """
+        try:
+            with open(self.path, "r", encoding="ascii") as f:
+                token = f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+        profile = self.decode(token)
+        if profile is None or profile.expired():
+            self.clear()
+            return None
+        return profile
+
+    def clear(self):
+        """Forget the saved session."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing session: {e}")
+
+    def encode(self, profile):
+        payload = base64.urlsafe_b64encode(json.dumps(profile.to_dict()).encode("utf-8"))
+        return f"{payload.decode('ascii')}.{self._sign(payload)}"
+
+    def decode(self, token):
+        payload, _, signature = token.encode("ascii", "replace").partition(b".")
+        if not hmac.compare_digest(self._sign(payload).encode("ascii"), signature):
+            return None
+        try:
+            return UserProfile(**json.loads(base64.urlsafe_b64decode(payload)))
+        except (ValueError, TypeError):
+            return None
+
+    def _sign(self, payload):
+        return hmac.new(self.secret_key, payload, hashlib.sha256).hexdigest()
+
+    def _write(self, token):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        # Readable by this user only
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="ascii") as f:
+            f.write(token)
+        os.replace(temp_path, self.path)
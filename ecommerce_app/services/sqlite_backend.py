@@ -0,0 +1,213 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import lru_cache
+
+from mysql.connector import errors
+
+# Schema applied to a new database file
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sqlite_schema.sql")
+
+# mysql.connector error number for a duplicate key, which callers look for
+ER_DUP_ENTRY = 1062
+
+# Prices arrive as Decimal, as mysql.connector returns them; DECIMAL columns
+# have NUMERIC affinity and store the text as a number
+sqlite3.register_adapter(Decimal, str)
+
+
+@lru_cache(maxsize=256)
+def _translate(sql):
+    """Rewrite MySQL's ``%s`` placeholders into SQLite's ``?``."""
+    return sql.replace("%s", "?").replace("%%", "%")
+
+
+def _error(e):
+    # Surface SQLite failures as the mysql.connector errors every caller already handles
+    if isinstance(e, sqlite3.IntegrityError):
+        errno = ER_DUP_ENTRY if "UNIQUE" in str(e) else None
+        return errors.IntegrityError(msg=str(e), errno=errno)
+    if isinstance(e, sqlite3.OperationalError):
+        return errors.OperationalError(msg=str(e))
+    return errors.DatabaseError(msg=str(e))
+
+
+class SQLiteCursor:
+    """A sqlite3 cursor behind the subset of the mysql.connector cursor API the services use."""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, sql, params=()):
+        try:
+            self._cursor.execute(_translate(sql), params)
+        except sqlite3.Error as e:
+            raise _error(e) from e
+
+    def executemany(self, sql, seq_params):
+        try:
+            self._cursor.executemany(_translate(sql), seq_params)
+        except sqlite3.Error as e:
+            raise _error(e) from e
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._row(row) if row is not None else None
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+    def __iter__(self):
+        return (self._row(row) for row in self._cursor)
+
+    def _row(self, row):
+        if self._dictionary:
+            return {column[0]: value for column, value in zip(self._cursor.description, row)}
+        return row
+
+
+class SQLiteConnection:
+    """A sqlite3 connection behind the subset of the MySQLConnection API the services use."""
+
+    unread_result = False
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def cursor(self, dictionary=False, buffered=None):
+        return SQLiteCursor(self._raw.cursor(), dictionary)
+
+    def start_transaction(self, consistent_snapshot=False, readonly=False):
+        # A read-only transaction reads one WAL snapshot without locking. Others
+        # take the write lock up front, like InnoDB's locking reads would,
+        # instead of failing on their first write
+        self._raw.execute("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+
+class SQLiteDatabase:
+    """
+    An embedded SQLite database file with the same interface as ``ConnectionPool``.
+
+    Meant for kiosk and offline installs that serve the catalog from a local file,
+    and for running the services without a MySQL server. The database runs in WAL
+    mode, so readers never block each other or the writer, with memory-mapped
+    reads and a larger page cache. Connections are cheap, but they are still
+    reused so every connection is set up only once.
+
+    Statements keep MySQL's ``%s`` placeholders and are rewritten for SQLite, and
+    dictionary cursors work as they do with mysql.connector, so most service
+    functions run unchanged. The few that need MySQL-specific SQL, such as
+    checkout's ``UPDATE ... JOIN`` or the upserts of stock holds and saved carts,
+    check ``dialect`` and issue SQLite's equivalent instead.
+    """
+
+    dialect = "sqlite"
+
+    def __init__(self, path, mmap_size=268435456, cache_size_kb=65536, busy_timeout=5):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.busy_timeout = busy_timeout
+        self._idle = queue.LifoQueue()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def acquire(self):
+        """Borrow a connection, opening a new one if none are idle."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, connection):
+        """Return a borrowed connection, rolling back anything left uncommitted."""
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.put(connection)
+        except sqlite3.Error:
+            connection.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block."""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            # Autocommit mode: transactions are opened explicitly by start_transaction
+            raw = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                  isolation_level=None, check_same_thread=False)
+            raw.execute("PRAGMA journal_mode = WAL")
+            raw.execute("PRAGMA synchronous = NORMAL")
+            raw.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+            raw.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+            raw.execute("PRAGMA foreign_keys = ON")
+            self._ensure_schema(raw)
+        except sqlite3.Error as e:
+            raise _error(e) from e
+        return SQLiteConnection(raw)
+
+    def _ensure_schema(self, raw):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            # Files created before products.updated_at existed gain the column first,
+            # since the schema script indexes it
+            columns = [row[1] for row in raw.execute("PRAGMA table_info(products)")]
+            if columns and "updated_at" not in columns:
+                raw.execute("ALTER TABLE products ADD COLUMN updated_at TIMESTAMP DEFAULT NULL")
+            with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+                raw.executescript(f.read())
+            self._schema_ready = True
@@ -0,0 +1,107 @@
+-- Schema for the embedded SQLite backend (STORAGE_CONFIG['backend'] = 'sqlite').
+-- Mirrors the tables the MySQL migrations in migrations/ create, including the
+-- catalog indexes, product SKUs, the users contact columns, orders, stock holds
+-- and saved carts.
+CREATE TABLE IF NOT EXISTS categories (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(50) NOT NULL UNIQUE,
+  description VARCHAR(255) DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS products (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  sku VARCHAR(64) DEFAULT NULL UNIQUE,
+  name VARCHAR(100) NOT NULL,
+  description TEXT,
+  price DECIMAL(10,2) NOT NULL,
+  stock INTEGER NOT NULL DEFAULT 0,
+  category_id INTEGER REFERENCES categories (id) ON DELETE SET NULL,
+  image_path VARCHAR(255) DEFAULT NULL,
+  updated_at TIMESTAMP DEFAULT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_products_name_id ON products (name, id);
+CREATE INDEX IF NOT EXISTS idx_products_updated_at ON products (updated_at);
+
+-- Stand-ins for MySQL's ON UPDATE CURRENT_TIMESTAMP(6), at millisecond precision
+CREATE TRIGGER IF NOT EXISTS products_inserted_at AFTER INSERT ON products
+BEGIN
+  UPDATE products SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_updated_at AFTER UPDATE ON products
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+  UPDATE products SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id;
+END;
+CREATE INDEX IF NOT EXISTS idx_products_category_name_id ON products (category_id, name, id);
+
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  username VARCHAR(50) NOT NULL UNIQUE,
+  password VARCHAR(255) NOT NULL,
+  email VARCHAR(100) NOT NULL UNIQUE,
+  full_name VARCHAR(100) DEFAULT NULL,
+  phone_number VARCHAR(20) DEFAULT NULL,
+  address VARCHAR(255) DEFAULT NULL,
+  is_admin BOOLEAN DEFAULT 0,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS shippers (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(100) NOT NULL,
+  phone VARCHAR(20) DEFAULT NULL,
+  email VARCHAR(100) DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL REFERENCES users (id),
+  shipper_id INTEGER REFERENCES shippers (id),
+  order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  status VARCHAR(20) DEFAULT 'pending',
+  total_amount DECIMAL(10,2) NOT NULL,
+  shipping_address TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_orders_user_id ON orders (user_id);
+
+CREATE TABLE IF NOT EXISTS order_items (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  order_id INTEGER NOT NULL REFERENCES orders (id),
+  product_id INTEGER NOT NULL REFERENCES products (id),
+  quantity INTEGER NOT NULL,
+  price DECIMAL(10,2) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items (order_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items (product_id);
+
+-- Expiry times are stored as datetime('now') text, so they compare as strings
+CREATE TABLE IF NOT EXISTS stock_reservations (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  quantity INTEGER NOT NULL,
+  expires_at DATETIME NOT NULL,
+  UNIQUE (user_id, product_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_product_expires ON stock_reservations (product_id, expires_at);
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_expires_at ON stock_reservations (expires_at);
+
+CREATE TABLE IF NOT EXISTS carts (
+  user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS cart_items (
+  user_id INTEGER NOT NULL REFERENCES carts (user_id) ON DELETE CASCADE,
+  product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+  quantity INTEGER NOT NULL,
+  added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (user_id, product_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cart_items_product_id ON cart_items (product_id);
@@ -30,8 +30,7 @@ def test_database():
         print(f"Database Error: {str(e)}")
         return False
     finally:
-        if connection and connection.is_connected():
-            close_db_connection(connection)
+        close_db_connection(connection)
 
 if __name__ == "__main__":
     test_database() 
\ No newline at end of file
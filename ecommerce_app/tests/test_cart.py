@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cart import Cart
+from services.models import Product
+
+
+def product(id, price):
+    return Product(id, f"Product {id}", None, Decimal(price), 10, None, None)
+
+
+class CartTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cart = Cart()
+        self.events = []
+        self.cart.subscribe(lambda event, item: self.events.append((event, item.product.id, item.quantity)))
+        self.bag = product(1, "25.50")
+        self.shoes = product(2, "80.00")
+
+    def test_add_accumulates_quantity(self):
+        self.cart.add(self.bag)
+        self.cart.add(self.bag, 2)
+        self.cart.add(self.shoes)
+        self.assertEqual(self.cart.get(1).quantity, 3)
+        self.assertEqual((self.cart.count, self.cart.total, len(self.cart)), (4, Decimal("156.50"), 2))
+        self.assertEqual(self.events, [("added", 1, 1), ("updated", 1, 3), ("added", 2, 1)])
+
+    def test_set_quantity(self):
+        self.cart.add(self.bag, 2)
+        self.cart.set_quantity(1, 5)
+        self.cart.set_quantity(1, 5)  # unchanged, no event
+        self.cart.set_quantity(3, 1)  # not in the cart
+        self.assertEqual((self.cart.count, self.cart.total), (5, Decimal("127.50")))
+        self.assertEqual(self.events, [("added", 1, 2), ("updated", 1, 5)])
+
+    def test_zero_quantity_removes(self):
+        self.cart.add(self.bag, 2)
+        self.cart.set_quantity(1, 0)
+        self.assertIsNone(self.cart.get(1))
+        self.assertEqual((self.cart.count, self.cart.total, len(self.cart)), (0, 0, 0))
+        self.assertEqual(self.events[-1], ("removed", 1, 0))
+
+    def test_remove_and_clear(self):
+        self.cart.add(self.bag)
+        self.cart.add(self.shoes, 2)
+        self.cart.remove(1)
+        self.cart.remove(1)  # already gone, no event
+        self.assertEqual((self.cart.count, self.cart.total), (2, Decimal("160.00")))
+        self.cart.add(self.bag)
+        self.cart.clear()
+        self.assertEqual((self.cart.count, self.cart.total, self.cart.items()), (0, 0, []))
+        self.assertEqual([event for event, _, _ in self.events].count("removed"), 3)
+
+    def test_items_keep_insertion_order(self):
+        self.cart.add(self.shoes)
+        self.cart.add(self.bag)
+        self.cart.add(self.shoes)
+        self.assertEqual([item.product.id for item in self.cart], [2, 1])
+        self.assertEqual([item.product.id for item in self.cart.items()], [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
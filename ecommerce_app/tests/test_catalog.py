@@ -0,0 +1,57 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import database
+from services.catalog import CatalogCache
+from services.sqlite_backend import SQLiteDatabase
+
+
+class CatalogCacheTest(unittest.TestCase):
+    """The cache's TTL refresh against an SQLite file, where triggers keep updated_at."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteDatabase(os.path.join(self.directory, "cartx.db"))
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.addCleanup(self.pool.close_all)
+        self.addCleanup(setattr, database, "_pool", database._pool)
+        database._pool = self.pool
+        self.execute("INSERT INTO products (name, price, stock) VALUES ('Blue bag', 25, 5), ('Brown bag', 40, 1)")
+        self.cache = CatalogCache(ttl=0)
+        self.cache.get_products()
+
+    def execute(self, sql, params=()):
+        time.sleep(0.01)  # the triggers stamp rows at millisecond precision
+        with self.pool.connection() as connection:
+            connection.cursor().execute(sql, params)
+
+    def prices(self):
+        return {product.name: Decimal(str(product.price)) for product in self.cache.get_products()}
+
+    def test_update_in_place_is_picked_up(self):
+        self.execute("UPDATE products SET price = 30 WHERE name = 'Blue bag'")
+        self.assertEqual(self.prices(), {"Blue bag": 30, "Brown bag": 40})
+        self.execute("UPDATE products SET stock = 0 WHERE name = 'Brown bag'")
+        self.assertEqual([product.stock for product in self.cache.get_products()], [5, 0])
+
+    def test_appended_and_deleted_rows(self):
+        self.execute("INSERT INTO products (name, price, stock) VALUES ('Anorak', 90, 2)")
+        self.assertEqual([product.name for product in self.cache.get_products()],
+                         ["Anorak", "Blue bag", "Brown bag"])
+        self.execute("DELETE FROM products WHERE name = 'Blue bag'")
+        self.assertEqual([product.name for product in self.cache.get_products()], ["Anorak", "Brown bag"])
+
+    def test_unchanged_catalog_is_not_reloaded(self):
+        products = self.cache.get_products()
+        self.assertIs(self.cache.get_products(), products)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector import errors
+
+from services import database
+from services.database import ConnectionPool, ReplicaRouter, db_connection
+
+
+class FakeConnection:
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+        self.unread_result = False
+        self.in_transaction = False
+
+    def rollback(self):
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakePool(ConnectionPool):
+    """A ConnectionPool whose connections are fakes, optionally refusing to connect."""
+
+    def __init__(self, host, **kwargs):
+        super().__init__({'host': host}, **kwargs)
+        self.down = False
+        self.opened = []
+
+    def _connect(self):
+        if self.down:
+            raise errors.InterfaceError(f"Can't connect to {self.db_config['host']}")
+        connection = FakeConnection(self.db_config['host'])
+        self.opened.append(connection)
+        return connection
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def test_connections_are_reused(self):
+        pool = FakePool("primary")
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            self.assertIs(second, first)
+        self.assertEqual(len(pool.opened), 1)
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        pool = FakePool("primary")
+        with pool.connection() as connection:
+            connection.in_transaction = True
+        self.assertFalse(connection.in_transaction)
+
+    def test_exhausted_pool(self):
+        pool = FakePool("primary", pool_size=1, checkout_timeout=0.01)
+        with pool.connection():
+            with self.assertRaises(errors.PoolError):
+                pool.acquire()
+
+    def test_close_all_closes_borrowed_connections_on_release(self):
+        pool = FakePool("primary")
+        idle = pool.acquire()
+        borrowed = pool.acquire()
+        pool.release(idle)
+        pool.close_all()
+        self.assertTrue(idle.closed)
+        self.assertFalse(borrowed.closed)
+        pool.release(borrowed)
+        self.assertTrue(borrowed.closed)
+
+
+class ReplicaRoutingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.primary = FakePool("primary")
+        self.replicas = [FakePool("replica1"), FakePool("replica2")]
+        self.router = ReplicaRouter(self.replicas, retry_after=30)
+        patches = [
+            mock.patch.object(database, "_pool", self.primary),
+            mock.patch.object(database, "_router", self.router),
+            mock.patch.object(database, "_last_write", float("-inf")),
+            mock.patch.dict(database.DB_REPLICA_CONFIG, replicas=[{'host': 'replica1'}, {'host': 'replica2'}]),
+            mock.patch.dict(database.STORAGE_CONFIG, backend='mysql'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def read(self):
+        with db_connection(read_only=True) as connection:
+            return connection.name
+
+    def test_reads_go_round_robin(self):
+        self.assertEqual({self.read(), self.read()}, {"replica1", "replica2"})
+
+    def test_unreachable_replica_is_skipped(self):
+        self.replicas[0].down = True
+        self.assertEqual([self.read() for _ in range(4)], ["replica2"] * 4)
+
+    def test_falls_back_to_the_primary(self):
+        for replica in self.replicas:
+            replica.down = True
+        self.assertEqual(self.read(), "primary")
+
+    def test_replica_failing_mid_query_is_marked_down(self):
+        with self.assertRaises(errors.OperationalError):
+            with db_connection(read_only=True) as connection:
+                failed = connection.name
+                raise errors.OperationalError("Lost connection to MySQL server during query")
+        other = ({"replica1", "replica2"} - {failed}).pop()
+        self.assertEqual([self.read() for _ in range(3)], [other] * 3)
+
+    def test_sql_errors_do_not_mark_replicas_down(self):
+        with self.assertRaises(errors.ProgrammingError):
+            with db_connection(read_only=True):
+                raise errors.ProgrammingError("You have an error in your SQL syntax")
+        self.assertEqual({self.read(), self.read()}, {"replica1", "replica2"})
+
+    def test_reads_follow_writes_to_the_primary(self):
+        with db_connection() as connection:
+            self.assertEqual(connection.name, "primary")
+        self.assertEqual(self.read(), "primary")
+
+
+if __name__ == "__main__":
+    unittest.main()
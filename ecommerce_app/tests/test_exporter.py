@@ -0,0 +1,128 @@
+import csv
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import database
+from services.exporter import export_tables, load_watermarks
+from services.sqlite_backend import SQLiteDatabase
+
+OLD = "2024-01-01 10:00:00"
+
+
+class ExportTablesTest(unittest.TestCase):
+    """Runs exports against an SQLite file."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.output = os.path.join(self.directory, "exports")
+        self.pool = SQLiteDatabase(os.path.join(self.directory, "cartx.db"))
+        self.addCleanup(self.pool.close_all)
+        self.addCleanup(setattr, database, "_pool", database._pool)
+        database._pool = self.pool
+
+        self.execute("INSERT INTO users (username, password, email) VALUES ('alice', 'x', 'alice@example.com')")
+        self.execute("INSERT INTO products (sku, name, price, stock) VALUES ('B1', 'Blue bag', 25.50, 5)")
+        # Written long ago; the trigger only stamps updated_at when it is left unchanged
+        self.execute("UPDATE products SET updated_at = %s", (OLD,))
+        self.add_order(OLD)
+        self.add_order(OLD)
+
+    def execute(self, sql, params=()):
+        with self.pool.connection() as connection:
+            connection.cursor().execute(sql, params)
+
+    def add_order(self, order_date=None):
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            if order_date is None:
+                cursor.execute("INSERT INTO orders (user_id, total_amount, shipping_address) "
+                               "VALUES (1, 25.50, 'Main St')")
+            else:
+                cursor.execute("INSERT INTO orders (user_id, order_date, total_amount, shipping_address) "
+                               "VALUES (1, %s, 25.50, 'Main St')", (order_date,))
+            order_id = cursor.lastrowid
+            cursor.execute("INSERT INTO order_items (order_id, product_id, quantity, price) "
+                           "VALUES (%s, 1, 1, 25.50)", (order_id,))
+        return order_id
+
+    def export(self, **kwargs):
+        return export_tables(self.output, **kwargs)
+
+    def ids(self, results, table):
+        ids = []
+        for path in results[table][1]:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                ids += [json.loads(line)["id"] for line in f]
+        return ids
+
+    def test_incremental_exports_resume_after_the_watermark(self):
+        results = self.export()
+        self.assertEqual(self.ids(results, "orders"), [1, 2])
+        self.assertEqual(self.ids(results, "order_items"), [1, 2])
+        self.assertEqual(self.ids(results, "products"), [1])
+
+        self.add_order(OLD)
+        results = self.export()
+        self.assertEqual(self.ids(results, "orders"), [3])
+        self.assertEqual(self.ids(results, "order_items"), [3])
+        self.assertEqual(results["products"], (0, []))
+        self.assertEqual(load_watermarks(self.output)["orders"], {"column": "id", "value": 3})
+
+    def test_rows_younger_than_the_safety_lag_wait_for_a_later_export(self):
+        recent = self.add_order()
+        self.execute("UPDATE products SET price = 30")  # stamps updated_at now
+        results = self.export()
+        self.assertEqual(self.ids(results, "orders"), [1, 2])
+        self.assertEqual(self.ids(results, "order_items"), [1, 2])
+        self.assertEqual(results["products"], (0, []))
+        self.assertEqual(load_watermarks(self.output)["orders"]["value"], 2)
+
+        # Once settled they are exported, nothing is skipped and nothing repeats
+        self.execute("UPDATE orders SET order_date = %s", (OLD,))
+        self.execute("UPDATE products SET updated_at = %s", (OLD,))
+        results = self.export()
+        self.assertEqual(self.ids(results, "orders"), [recent])
+        self.assertEqual(self.ids(results, "order_items"), [recent])
+        self.assertEqual(self.ids(results, "products"), [1])
+
+    def test_order_date_watermark(self):
+        self.add_order("2024-01-02 08:00:00")
+        results = self.export(tables=("orders",), watermark_columns={"orders": "order_date"})
+        self.assertEqual(self.ids(results, "orders"), [1, 2, 3])
+        self.assertEqual(load_watermarks(self.output)["orders"],
+                         {"column": "order_date", "value": "2024-01-02 08:00:00"})
+
+        self.add_order("2024-01-03 08:00:00")
+        self.add_order()
+        results = self.export(tables=("orders",), watermark_columns={"orders": "order_date"})
+        self.assertEqual(self.ids(results, "orders"), [4])
+
+    def test_full_export_ignores_watermarks(self):
+        self.export()
+        results = self.export(incremental=False, fmt="csv", chunk_rows=1)
+        self.assertEqual(len(results["orders"][1]), 2)
+        with gzip.open(results["orders"][1][0], "rt", encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][:4], ["id", "user_id", "shipper_id", "order_date"])
+        self.assertEqual(rows[1][:4], ["1", "1", "", OLD])
+
+    def test_arguments_are_checked_before_anything_is_written(self):
+        for kwargs in ({"tables": ("orders", "payments")},
+                       {"watermark_columns": {"order_items": "order_id"}},
+                       {"watermark_columns": {"payments": "id"}},
+                       {"fmt": "xml"}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                self.export(**kwargs)
+            self.assertFalse(os.path.exists(self.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
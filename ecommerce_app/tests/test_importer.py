@@ -0,0 +1,168 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import contextmanager
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector import errors
+
+from services import database
+from services.importer import import_products, parse_product
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        # Like MySQL with autocommit off, any statement opens a transaction
+        self.connection.in_transaction = True
+        self.connection.statements.append((" ".join(sql.split()), params))
+        if sql.startswith("SELECT id, name FROM categories"):
+            self._rows = list(self.connection.categories.items())
+        elif sql.startswith("INSERT IGNORE INTO categories"):
+            self.connection.categories.setdefault(len(self.connection.categories) + 1, params[0])
+        elif sql.startswith("SELECT id FROM categories"):
+            self._rows = [(category_id,) for category_id, name in self.connection.categories.items()
+                          if name == params[0]]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    """Enforces mysql.connector's rule that start_transaction cannot nest."""
+
+    def __init__(self):
+        self.in_transaction = False
+        self.categories = {1: "Bags"}
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def start_transaction(self):
+        if self.in_transaction:
+            raise errors.ProgrammingError("Transaction already in progress")
+        self.in_transaction = True
+
+    def commit(self):
+        self.in_transaction = False
+        self.commits += 1
+
+    def rollback(self):
+        self.in_transaction = False
+
+
+class FakePool:
+    dialect = "mysql"
+
+    def __init__(self):
+        self.fake = FakeConnection()
+
+    @contextmanager
+    def connection(self):
+        yield self.fake
+
+
+class ParseProductTest(unittest.TestCase):
+
+    def parse(self, **fields):
+        record = {"sku": "B1", "name": "Blue bag", "price": "25.50", "stock": "5"}
+        record.update(fields)
+        return parse_product(record)
+
+    def test_valid_record(self):
+        self.assertEqual(self.parse(category=" Bags ", price=25.505),
+                         ("B1", "Blue bag", None, Decimal("25.50"), 5, "Bags", None))
+        self.assertEqual(self.parse(price="99999999.99", stock=2 ** 31 - 1)[3:5],
+                         (Decimal("99999999.99"), 2 ** 31 - 1))
+
+    def test_non_numbers_are_rejected(self):
+        for price in ("NaN", "sNaN", float("nan"), "Infinity", "-inf", float("inf"), "abc"):
+            with self.subTest(price=price), self.assertRaises(ValueError):
+                self.parse(price=price)
+        for stock in (float("inf"), float("nan"), "1e400", "many"):
+            with self.subTest(stock=stock), self.assertRaises(ValueError):
+                self.parse(stock=stock)
+
+    def test_values_that_do_not_fit_their_column_are_rejected(self):
+        for fields in ({"price": "1e400"}, {"price": 1e300}, {"price": "100000000"},
+                       {"price": "99999999.999"}, {"stock": 2 ** 31}, {"price": "-1"},
+                       {"name": "x" * 101}, {"sku": "x" * 65}, {"category": "x" * 51},
+                       {"image_path": "x" * 256}):
+            with self.subTest(fields=fields), self.assertRaises(ValueError):
+                self.parse(**fields)
+        self.assertEqual(self.parse(name="x" * 100, sku="y" * 64)[:2], ("y" * 64, "x" * 100))
+
+
+class ImportProductsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.pool = FakePool()
+        self.addCleanup(setattr, database, "_pool", database._pool)
+        database._pool = self.pool
+
+    def write_feed(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def product_inserts(self):
+        return [params for sql, params in self.pool.fake.statements
+                if sql.startswith("INSERT INTO products")]
+
+    def test_csv_feed(self):
+        path = self.write_feed("feed.csv", "sku,name,price,stock,category\n"
+                                           "B1,Blue bag,25.50,5,Bags\n"
+                                           "S1,Sneakers,80,2,Shoes\n"
+                                           "X1,,1,1,\n")
+        stats = import_products(path, batch_size=1, commit_size=1)
+        self.assertEqual((stats.read, stats.written, stats.skipped), (3, 2, 1))
+        inserts = self.product_inserts()
+        self.assertEqual([params[0] for params in inserts], ["B1", "S1"])
+        self.assertEqual((inserts[0][5], inserts[1][5]), (1, 2))  # Shoes was created
+        self.assertFalse(self.pool.fake.in_transaction)
+
+    def test_jsonl_feed(self):
+        path = self.write_feed("feed.jsonl", '{"sku": "B1", "name": "Blue bag", "price": 25.5}\n'
+                                             'not json\n'
+                                             '{"sku": "B2", "name": "Brown bag", "price": -1}\n')
+        stats = import_products(path)
+        self.assertEqual((stats.read, stats.written, stats.skipped), (3, 1, 2))
+        self.assertEqual(len(self.product_inserts()), 1)
+        self.assertEqual(self.pool.fake.commits, 1)
+
+    def test_bad_values_are_skipped_without_failing_the_batch(self):
+        path = self.write_feed("feed.jsonl", '{"sku": "B1", "name": "Blue bag", "price": NaN}\n'
+                                             '{"sku": "B2", "name": "Brown bag", "price": Infinity}\n'
+                                             '{"sku": "B3", "name": "Big bag", "price": 1e400}\n'
+                                             '{"sku": "B4", "name": "Bag", "price": 5, "stock": 1e400}\n'
+                                             '{"sku": "B5", "name": "Tote", "price": 9.99}\n')
+        stats = import_products(path)
+        self.assertEqual((stats.read, stats.written, stats.skipped), (5, 1, 4))
+        self.assertEqual([params[0] for params in self.product_inserts()], ["B5"])
+
+    def test_csv_with_byte_order_mark(self):
+        path = os.path.join(self.directory, "feed.csv")
+        with open(path, "w", encoding="utf-8-sig") as f:
+            f.write("sku,name,price\nB1,Blue bag,25.50\n")
+        stats = import_products(path)
+        self.assertEqual((stats.written, stats.skipped), (1, 0))
+        self.assertEqual(self.product_inserts()[0][:4], ("B1", "Blue bag", None, Decimal("25.50")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector import errors
+
+from services.migrations import Backfill, MigrationError, MigrationRunner, discover, split_statements
+from services.sqlite_backend import SQLiteDatabase
+
+
+class SplitStatementsTest(unittest.TestCase):
+
+    def test_statements_end_at_a_semicolon_ending_a_line(self):
+        sql = ("-- Stock holds\n"
+               "CREATE TABLE a (\n"
+               "  note varchar(10) DEFAULT ';'\n"
+               ");\n"
+               "\n"
+               "  -- indented comment\n"
+               "ALTER TABLE a ADD KEY note (note);\n"
+               "ANALYZE TABLE a")
+        self.assertEqual(split_statements(sql), [
+            "CREATE TABLE a (\n  note varchar(10) DEFAULT ';'\n)",
+            "ALTER TABLE a ADD KEY note (note)",
+            "ANALYZE TABLE a",
+        ])
+
+    def test_empty_statements_are_dropped(self):
+        self.assertEqual(split_statements(";\n-- only a comment\n\n"), [])
+
+
+class BackfillTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        pool = SQLiteDatabase(os.path.join(directory, "cartx.db"))
+        self.addCleanup(pool.close_all)
+        self.connection = pool.acquire()
+        self.addCleanup(pool.release, self.connection)
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE source (id INTEGER PRIMARY KEY, value int)")
+        cursor.execute("CREATE TABLE target (id int, value int)")
+        # Gaps in the key must not make batches skip rows or run empty
+        for key in (3, 4, 10, 11, 12, 40, 41, 100):
+            cursor.execute("INSERT INTO source (id, value) VALUES (%s, %s)", (key, key * 2))
+
+    def copy(self, batch_size, params=(), condition=""):
+        return Backfill(self.connection, batch_size).run("source", "id", f"""
+            INSERT INTO target (id, value) SELECT id, value FROM source
+            WHERE {condition} id > %s AND id <= %s
+        """, params)
+
+    def copied(self):
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT id FROM target ORDER BY id")
+        return [row[0] for row in cursor.fetchall()]
+
+    def test_copies_every_row_once(self):
+        for batch_size in (1, 3, 8, 1000):
+            with self.subTest(batch_size=batch_size):
+                self.connection.cursor().execute("DELETE FROM target")
+                self.assertEqual(self.copy(batch_size), 8)
+                self.assertEqual(self.copied(), [3, 4, 10, 11, 12, 40, 41, 100])
+
+    def test_leading_params(self):
+        self.assertEqual(self.copy(3, (20,), "value > %s AND"), 5)
+        self.assertEqual(self.copied(), [11, 12, 40, 41, 100])
+
+    def test_empty_table(self):
+        self.connection.cursor().execute("DELETE FROM source")
+        self.assertEqual(self.copy(3), 0)
+        self.assertEqual(self.copied(), [])
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+        self.with_rows = False
+
+    def execute(self, sql, params=()):
+        connection = self.connection
+        sql = " ".join(sql.split())
+        if sql == "FAIL":
+            raise errors.ProgrammingError("You have an error in your SQL syntax")
+        if sql.startswith("SELECT GET_LOCK"):
+            self._rows = [(0 if connection.locked_elsewhere else 1,)]
+            connection.locked = not connection.locked_elsewhere
+            return
+        if sql.startswith("SELECT RELEASE_LOCK"):
+            self._rows = [(1,)]
+            connection.locked = False
+            return
+        # Like MySQL with autocommit off, any other statement opens a transaction
+        connection.in_transaction = True
+        connection.pending.append(sql)
+        if sql.startswith("SELECT version FROM schema_migrations"):
+            self._rows = [(version,) for version in connection.versions]
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            connection.pending_versions.append(params[0])
+        elif "KEY_COLUMN_USAGE" in sql:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    """Keeps committed statements apart from pending ones; start_transaction cannot nest."""
+
+    def __init__(self):
+        self.in_transaction = False
+        self.locked = False
+        self.locked_elsewhere = False
+        self.versions = []
+        self.pending_versions = []
+        self.committed = []
+        self.pending = []
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def start_transaction(self):
+        if self.in_transaction:
+            raise errors.ProgrammingError("Transaction already in progress")
+        self.in_transaction = True
+
+    def commit(self):
+        self.versions += self.pending_versions
+        self.committed += self.pending
+        self.rollback()
+
+    def rollback(self):
+        self.in_transaction = False
+        self.pending_versions = []
+        self.pending = []
+
+
+class FakePool:
+    def __init__(self):
+        self.fake = FakeConnection()
+
+    @contextmanager
+    def connection(self):
+        yield self.fake
+
+
+class MigrationRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.pool = FakePool()
+        self.runner = MigrationRunner(self.pool, self.directory)
+        self.write("0001_create_a.sql", "CREATE TABLE a (id int);\nINSERT INTO a VALUES (1);\n")
+        self.write("0002_copy_a.py", "def upgrade(connection, backfill):\n"
+                                     "    connection.cursor().execute('UPDATE a SET id = 2')\n")
+        self.write("README.md", "not a migration")
+
+    def write(self, name, text):
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_applies_pending_migrations_in_order(self):
+        applied = self.runner.migrate()
+        self.assertEqual([migration.version for migration in applied], [1, 2])
+        self.assertEqual(self.pool.fake.versions, [1, 2])
+        self.assertIn("UPDATE a SET id = 2", self.pool.fake.committed)
+        self.assertFalse(self.pool.fake.in_transaction)
+        self.assertFalse(self.pool.fake.locked)
+
+        self.write("0003_more.sql", "INSERT INTO a VALUES (3);")
+        self.assertEqual([migration.version for migration in self.runner.migrate()], [3])
+        self.assertEqual(self.runner.migrate(), [])
+        self.assertEqual([applied for migration, applied in self.runner.status()], [True, True, True])
+
+    def test_target(self):
+        self.assertEqual([migration.version for migration in self.runner.migrate(target=1)], [1])
+        self.assertEqual([applied for migration, applied in self.runner.status()], [True, False])
+
+    def test_failed_migration_is_rolled_back_and_not_recorded(self):
+        self.write("0003_broken.sql", "INSERT INTO a VALUES (3);\nFAIL;\n")
+        self.write("0004_later.sql", "INSERT INTO a VALUES (4);")
+        with self.assertRaises(MigrationError):
+            self.runner.migrate()
+        self.assertEqual(self.pool.fake.versions, [1, 2])
+        self.assertNotIn("INSERT INTO a VALUES (3)", self.pool.fake.committed)
+        self.assertFalse(self.pool.fake.in_transaction)
+        self.assertFalse(self.pool.fake.locked)
+
+    def test_table_without_single_column_key_fails_the_migration(self):
+        self.write("0003_copy.py", "from services.migrations import primary_key\n"
+                                   "def upgrade(connection, backfill):\n"
+                                   "    cursor = connection.cursor()\n"
+                                   "    cursor.execute('DELETE FROM a')\n"
+                                   "    backfill.run('b', primary_key(cursor, 'b'), 'SELECT 1')\n")
+        with self.assertRaisesRegex(MigrationError, "0003_copy failed: Table b has no single-column"):
+            self.runner.migrate()
+        self.assertEqual(self.pool.fake.versions, [1, 2])
+        self.assertNotIn("DELETE FROM a", self.pool.fake.committed)
+
+    def test_refuses_to_run_while_another_run_holds_the_lock(self):
+        self.pool.fake.locked_elsewhere = True
+        with self.assertRaises(MigrationError):
+            self.runner.migrate()
+        self.assertEqual(self.pool.fake.versions, [])
+
+    def test_baseline_marks_without_running(self):
+        marked = self.runner.baseline(1)
+        self.assertEqual([migration.version for migration in marked], [1])
+        self.assertNotIn("CREATE TABLE a (id int)", self.pool.fake.committed)
+        self.assertEqual([migration.version for migration in self.runner.migrate()], [2])
+
+    def test_duplicate_versions(self):
+        self.write("0002_other.sql", "SELECT 1;")
+        with self.assertRaises(MigrationError):
+            discover(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
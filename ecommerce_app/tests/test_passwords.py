@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+
+from config import PASSWORD_CONFIG
+from services.passwords import PasswordVerifier, hash_password, needs_rehash
+
+
+class NeedsRehashTest(unittest.TestCase):
+
+    def test_plaintext_and_malformed(self):
+        self.assertTrue(needs_rehash("secret"))
+        self.assertTrue(needs_rehash("$2b$xx$abc"))
+
+    def test_cost(self):
+        rounds = PASSWORD_CONFIG['bcrypt_rounds']
+        self.assertTrue(needs_rehash(hash_password("secret", rounds=4)))
+        self.assertFalse(needs_rehash(f"$2b${rounds:02d}$" + "a" * 53))
+        self.assertFalse(needs_rehash(f"$2y${rounds + 1:02d}$" + "a" * 53))
+
+
+class PasswordVerifierTest(unittest.TestCase):
+
+    def setUp(self):
+        self.verifier = PasswordVerifier(cache_size=2)
+        self.stored = hash_password("secret", rounds=4)
+
+    def test_bcrypt_hash(self):
+        self.assertTrue(self.verifier.verify("secret", self.stored))
+        self.assertFalse(self.verifier.verify("Secret", self.stored))
+        self.assertFalse(self.verifier.verify("secret", ""))
+        self.assertFalse(self.verifier.verify("secret", "$2b$04$not-a-real-hash"))
+
+    def test_legacy_plaintext(self):
+        self.assertTrue(self.verifier.verify("secret", "secret"))
+        self.assertFalse(self.verifier.verify("other", "secret"))
+
+    def test_repeat_login_skips_bcrypt(self):
+        with mock.patch("services.passwords.bcrypt.checkpw", wraps=bcrypt.checkpw) as checkpw:
+            self.assertTrue(self.verifier.verify("secret", self.stored))
+            self.assertTrue(self.verifier.verify("secret", self.stored))
+            self.assertFalse(self.verifier.verify("wrong", self.stored))
+        self.assertEqual(checkpw.call_count, 1)
+
+    def test_failures_are_not_cached(self):
+        with mock.patch("services.passwords.bcrypt.checkpw", wraps=bcrypt.checkpw) as checkpw:
+            self.assertFalse(self.verifier.verify("wrong", self.stored))
+            self.assertTrue(self.verifier.verify("secret", self.stored))
+        self.assertEqual(checkpw.call_count, 2)
+
+    def test_cache_is_bounded(self):
+        hashes = [hash_password(f"secret{i}", rounds=4) for i in range(3)]
+        for i, stored in enumerate(hashes):
+            self.verifier.verify(f"secret{i}", stored)
+        with mock.patch("services.passwords.bcrypt.checkpw", wraps=bcrypt.checkpw) as checkpw:
+            self.verifier.verify("secret2", hashes[2])
+            self.verifier.verify("secret0", hashes[0])  # evicted
+        self.assertEqual(checkpw.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.models import Product
+from services.search import SearchIndex, get_search_index
+
+
+def product(id, name, category=None):
+    return Product(id, name, None, 10, 1, None, category)
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.products = [
+            product(1, "Beige T-shirt", "Clothing"),
+            product(2, "Black laptop bag", "Bags"),
+            product(3, "Blue bag", "Bags"),
+            product(4, "Brown bag", "Bags"),
+            product(5, "Men brown sneakers", "Shoes"),
+        ]
+        self.index = SearchIndex(self.products)
+
+    def ids(self, text, category=None):
+        return [p.id for p in self.index.search(text, category)]
+
+    def test_substring_match_is_case_insensitive(self):
+        self.assertEqual(self.ids("BROWN"), [4, 5])
+        self.assertEqual(self.ids("  bag "), [2, 3, 4])
+        self.assertEqual(self.ids("rown sn"), [5])
+
+    def test_short_and_empty_queries_scan_the_list(self):
+        self.assertEqual(self.ids("bl"), [2, 3])
+        self.assertEqual(self.ids(""), [1, 2, 3, 4, 5])
+
+    def test_no_match(self):
+        self.assertEqual(self.ids("jacket"), [])
+        self.assertEqual(self.ids("xyz"), [])
+
+    def test_category_filter(self):
+        self.assertEqual(self.ids("bro", "Bags"), [4])
+        self.assertEqual(self.ids("", "Shoes"), [5])
+
+    def test_typing_narrows_and_backspacing_widens(self):
+        self.assertEqual(self.ids("b"), [1, 2, 3, 4, 5])
+        self.assertEqual(self.ids("bl"), [2, 3])
+        self.assertEqual(self.ids("blu"), [3])
+        self.assertEqual(self.ids("bl"), [2, 3])
+
+    def test_category_does_not_narrow_later_searches(self):
+        self.assertEqual(self.ids("bro", "Shoes"), [5])
+        self.assertEqual(self.ids("brow"), [4, 5])
+
+    def test_shared_index_follows_the_product_list(self):
+        index = get_search_index(self.products)
+        self.assertIs(get_search_index(self.products), index)
+        self.assertIsNot(get_search_index(list(self.products)), index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import base64
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.session import SessionStore, UserProfile, load_secret_key
+
+
+class SessionStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, "cartx", "session")
+        self.store = SessionStore(self.path, "key-one", timeout=60)
+
+    def token(self):
+        with open(self.path, "r", encoding="ascii") as f:
+            return f.read()
+
+    def test_issue_and_load(self):
+        issued = self.store.issue(7, "alice", "Alice Smith", is_admin=1)
+        loaded = self.store.load()
+        self.assertEqual(loaded.to_dict(), issued.to_dict())
+        self.assertEqual((loaded.display_name, loaded.is_admin), ("Alice Smith", True))
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_missing_file(self):
+        self.assertIsNone(self.store.load())
+
+    def test_tampered_payload_is_rejected(self):
+        self.store.issue(7, "alice")
+        payload, signature = self.token().split(".")
+        fields = json.loads(base64.urlsafe_b64decode(payload))
+        fields.update(user_id=1, is_admin=True)
+        forged = base64.urlsafe_b64encode(json.dumps(fields).encode("utf-8")).decode("ascii")
+        with open(self.path, "w", encoding="ascii") as f:
+            f.write(f"{forged}.{signature}")
+        self.assertIsNone(self.store.load())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_other_key_is_rejected(self):
+        self.store.issue(7, "alice")
+        self.assertIsNone(SessionStore(self.path, "key-two").load())
+
+    def test_garbage_is_rejected(self):
+        for token in ("", "no-signature", "a.b.c", "é"):
+            self.assertIsNone(self.store.decode(token), token)
+
+    def test_expired_session(self):
+        profile = self.store.issue(7, "alice")
+        with mock.patch("services.session.time.time", return_value=profile.expires_at):
+            self.assertTrue(profile.expired())
+            self.assertIsNone(self.store.load())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_clear(self):
+        self.store.issue(7, "alice")
+        self.store.clear()
+        self.store.clear()
+        self.assertIsNone(self.store.load())
+
+    def test_profile_round_trip(self):
+        profile = UserProfile(3, "bob", expires_at=100)
+        self.assertEqual(self.store.decode(self.store.encode(profile)).to_dict(), profile.to_dict())
+        self.assertEqual(profile.display_name, "bob")
+
+
+class SecretKeyTest(unittest.TestCase):
+
+    def test_generated_once_and_private(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, "cartx", "session.key")
+        key = load_secret_key(path)
+        self.assertEqual(len(key), 64)
+        self.assertEqual(load_secret_key(path), key)
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import database
+from services.cart_store import load_cart, save_cart_items
+from services.catalog import get_categories, get_product_by_id, get_products_page
+from services.checkout import CheckoutError, place_order
+from services.importer import import_products
+from services.reservations import reserve, sweep_expired
+from services.sqlite_backend import SQLiteDatabase
+
+
+class SQLiteBackendTest(unittest.TestCase):
+    """Runs the catalog, cart, reservation and checkout services against an SQLite file."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteDatabase(os.path.join(self.directory, "cartx.db"))
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.addCleanup(self.pool.close_all)
+        self.addCleanup(setattr, database, "_pool", database._pool)
+        database._pool = self.pool
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("INSERT INTO categories (name) VALUES ('Bags')")
+            category_id = cursor.lastrowid
+            cursor.execute("""
+                INSERT INTO products (name, description, price, stock, category_id)
+                VALUES ('Blue bag', 'Canvas', 25.50, 5, %s), ('Brown bag', NULL, 40, 1, %s)
+            """, (category_id, category_id))
+            cursor.execute("""
+                INSERT INTO users (username, password, email)
+                VALUES ('alice', 'x', 'alice@example.com'), ('bob', 'x', 'bob@example.com')
+            """)
+            cursor.execute("SELECT id FROM products ORDER BY name")
+            self.blue, self.brown = (row[0] for row in cursor.fetchall())
+            cursor.execute("SELECT id FROM users ORDER BY username")
+            self.alice, self.bob = (row[0] for row in cursor.fetchall())
+
+    def stock(self, product_id):
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT stock FROM products WHERE id = %s", (product_id,))
+            return cursor.fetchone()[0]
+
+    def test_catalog(self):
+        first = get_products_page(limit=1)
+        self.assertEqual([product.name for product in first], ["Blue bag"])
+        rest = get_products_page(after=(first[0].name, first[0].id))
+        self.assertEqual([product.name for product in rest], ["Brown bag"])
+        self.assertEqual(get_product_by_id(self.blue).category, "Bags")
+        self.assertEqual([(category.name, category.product_count) for category in get_categories()],
+                         [("Bags", 2)])
+
+    def test_saved_cart(self):
+        save_cart_items({(self.alice, self.blue): 2, (self.alice, self.brown): 1})
+        save_cart_items({(self.alice, self.blue): 3, (self.alice, self.brown): 0})
+        self.assertEqual([(product.id, quantity) for product, quantity in load_cart(self.alice)],
+                         [(self.blue, 3)])
+        self.assertEqual(load_cart(self.bob), [])
+
+    def test_reservations(self):
+        self.assertEqual(reserve(self.alice, self.blue, 3), (True, 5))
+        self.assertEqual(reserve(self.alice, self.blue, 4), (True, 5))  # replaces the first hold
+        self.assertEqual(reserve(self.bob, self.blue, 2), (False, 1))
+        self.assertEqual(sweep_expired(), 0)
+        reserve(self.bob, self.blue, 1, hold_seconds=-1)
+        self.assertEqual(sweep_expired(), 1)
+
+    def test_checkout(self):
+        reserve(self.alice, self.blue, 2)
+        order_id = place_order(self.alice, [(self.blue, 2), (self.brown, 1)], "1 Main St")
+        self.assertEqual((self.stock(self.blue), self.stock(self.brown)), (3, 0))
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT total_amount FROM orders WHERE id = %s", (order_id,))
+            self.assertAlmostEqual(float(cursor.fetchone()[0]), 91.0)
+            cursor.execute("SELECT COUNT(*) FROM order_items WHERE order_id = %s", (order_id,))
+            self.assertEqual(cursor.fetchone()[0], 2)
+            cursor.execute("SELECT COUNT(*) FROM stock_reservations WHERE user_id = %s", (self.alice,))
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_checkout_respects_other_holds(self):
+        reserve(self.bob, self.blue, 4)
+        with self.assertRaises(CheckoutError):
+            place_order(self.alice, [(self.blue, 2)], "1 Main St")
+        self.assertEqual(self.stock(self.blue), 5)
+        place_order(self.alice, [(self.blue, 1)], "1 Main St")
+        self.assertEqual(self.stock(self.blue), 4)
+
+    def test_import_feed(self):
+        path = os.path.join(self.directory, "feed.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("sku,name,price,stock,category,description\n"
+                    "BAG-1,Tote bag,19.99,4,Bags,Canvas tote\n"
+                    "SHOE-1,Runner,59.50,2,Shoes,\n")
+        self.assertEqual(import_products(path).written, 2)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("sku,name,price,stock,category,description\n"
+                    "BAG-1,Tote bag,17.49,9,,\n")
+        self.assertEqual(import_products(path).written, 1)
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT p.sku, p.price, p.stock, c.name, p.description
+                FROM products p LEFT JOIN categories c ON p.category_id = c.id
+                WHERE p.sku IS NOT NULL ORDER BY p.sku
+            """)
+            self.assertEqual(cursor.fetchall(), [("BAG-1", 17.49, 9, "Bags", "Canvas tote"),
+                                                 ("SHOE-1", 59.5, 2, "Shoes", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 from services.database import get_db_connection, close_db_connection
 from mysql.connector import Error
+from services.cart import Cart
+from services.cart_store import get_cart_store, load_cart
+from services.checkout import CheckoutError, place_order
+from services.executor import get_executor
+from services.reservations import release, reserve
+from config import RESERVATION_CONFIG
 
 # Colors
 PRIMARY_COLOR = "#007BFF"  # Electric Blue
@@ -12,9 +18,11 @@ CARD_BORDER = "#E0E0E0"  # Light Gray
 ACCENT_COLOR = "#28A745"  # Green for stock status
 
 class CartScreen(tk.Frame):
-    def __init__(self, master, switch_to_products):
+    def __init__(self, master, switch_to_products, auth=None, on_order_placed=None):
         super().__init__(master)
         self.switch_to_products = switch_to_products
+        self.auth = auth
+        self.on_order_placed = on_order_placed
         self.configure(bg=BACKGROUND_COLOR)
         
         # Configure the main frame to expand
@@ -89,116 +97,283 @@ class CartScreen(tk.Frame):
         self.total_label.grid(row=0, column=0, sticky="w")
 
         # Checkout button
-        checkout_button = tk.Button(footer_frame, text="Proceed to Checkout",
+        self.checkout_button = tk.Button(footer_frame, text="Proceed to Checkout",
                                   font=("Helvetica", 14, "bold"),
                                   bg=ACCENT_COLOR, fg="white",
                                   activebackground="#1e7e34", activeforeground="white",
                                   command=self.proceed_to_checkout)
-        checkout_button.grid(row=0, column=1, sticky="e", padx=(20, 0))
+        self.checkout_button.grid(row=0, column=1, sticky="e", padx=(20, 0))
 
-        # Initialize cart items
-        self.cart_items = []
+        # Empty cart message, shown while there are no rows
+        self.empty_label = tk.Label(self.scrollable_frame, 
+                                  text="Your cart is empty",
+                                  font=("Helvetica", 16),
+                                  bg=BACKGROUND_COLOR, fg=TEXT_COLOR)
+
+        # Initialize cart; only the row of the item that changed is redrawn
+        self.cart = Cart()
+        self.cart_rows = {}
+        self.releasing = True  # Off while the cart is emptied after checkout, which drops its holds itself
+        self.restoring = False  # On while a saved cart is loaded, which needs no saving
+        self.quantity_after_ids = {}  # Product id -> pending debounced quantity entry
+        self.holds_in_flight = set()  # Products whose hold is being resized
+        self.holds_outdated = set()  # Products whose entry changed while their hold was resized
+        self.cart.subscribe(self.on_cart_change)
         self.update_cart_display()
 
-    def add_to_cart(self, product):
+    def restore_cart(self):
+        """Load the logged-in user's saved cart in the background"""
+        user_id = self.current_user_id()
+        if user_id is None:
+            return
+        get_executor().submit(load_cart, user_id,
+                              on_success=self.on_cart_loaded,
+                              on_error=lambda e: print(f"Error loading saved cart: {e}"),
+                              key="restore-cart")
+
+    def reset_cart(self):
+        """
+        Empty the cart when its user logs out or their session expires.
+        Nothing is saved or released: the saved cart and its stock holds stay in
+        the database for the user's next login.
+        """
+        get_executor().cancel("restore-cart")
+        for after_id in self.quantity_after_ids.values():
+            self.after_cancel(after_id)
+        self.quantity_after_ids.clear()
+        self.holds_in_flight.clear()
+        self.holds_outdated.clear()
+        self.restoring, self.releasing = True, False
+        try:
+            self.cart.clear()
+        finally:
+            self.restoring, self.releasing = False, True
+
+    def on_cart_loaded(self, saved_items):
+        self.restoring = True
+        try:
+            for product, quantity in saved_items:
+                # Items added since login win over the saved copy
+                if self.cart.get(product.id) is None:
+                    self.cart.add(product, quantity)
+        finally:
+            self.restoring = False
+
+    def add_to_cart(self, product, quantity=1):
         """Add a product to the cart"""
-        # Check if product is already in cart
-        for item in self.cart_items:
-            if item["product_id"] == product["product_id"]:
-                item["quantity"] += 1
-                self.update_cart_display()
-                return
-
-        # Add new item to cart
-        self.cart_items.append({
-            "product_id": product["product_id"],
-            "name": product["product_name"],
-            "price": product["product_price"],
-            "quantity": 1
-        })
-        self.update_cart_display()
+        self.cart.add(product, quantity)
 
     def remove_from_cart(self, product_id):
         """Remove a product from the cart"""
-        self.cart_items = [item for item in self.cart_items if item["product_id"] != product_id]
-        self.update_cart_display()
+        self.cart.remove(product_id)
 
     def update_quantity(self, product_id, new_quantity):
         """Update the quantity of a product in the cart"""
-        for item in self.cart_items:
-            if item["product_id"] == product_id:
-                if new_quantity <= 0:
-                    self.remove_from_cart(product_id)
-                else:
-                    item["quantity"] = new_quantity
-                break
+        self.cart.set_quantity(product_id, new_quantity)
+
+    def on_cart_change(self, event, item):
+        """Redraw the row of the cart item that changed and queue it for saving"""
+        user_id = self.current_user_id()
+        if user_id is not None and not self.restoring:
+            get_cart_store().record(user_id, item.product.id,
+                                    0 if event == "removed" else item.quantity)
+
+        if event == "added":
+            self.create_cart_row(item)
+        elif event == "updated":
+            quantity_var = self.cart_rows[item.product.id][1]
+            # Skip when the change came from typing in this very entry
+            if quantity_var.get() != str(item.quantity):
+                quantity_var.set(str(item.quantity))
+        elif event == "removed":
+            row = self.cart_rows.pop(item.product.id)
+            row[0].destroy()
+            after_id = self.quantity_after_ids.pop(item.product.id, None)
+            if after_id is not None:
+                self.after_cancel(after_id)
+            if self.releasing and user_id is not None:
+                self.release_hold(user_id, item.product.id)
         self.update_cart_display()
 
-    def update_cart_display(self):
-        """Update the cart display with current items"""
-        # Clear existing items
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def current_user_id(self):
+        return self.auth.current_user_id if self.auth else None
+
+    def on_quantity_entry(self, product_id, quantity_var):
+        """Debounce a quantity typed into a cart row, so only the final value resizes the hold"""
+        after_id = self.quantity_after_ids.pop(product_id, None)
+        if after_id is not None:
+            self.after_cancel(after_id)
+        self.quantity_after_ids[product_id] = self.after(RESERVATION_CONFIG['entry_debounce_ms'],
+                                                         lambda: self.apply_quantity_entry(product_id))
+
+    def apply_quantity_entry(self, product_id):
+        """Apply the quantity typed into a cart row"""
+        self.quantity_after_ids.pop(product_id, None)
+        item = self.cart.get(product_id)
+        if item is None or product_id not in self.cart_rows:
+            return
+        try:
+            quantity = int(self.cart_rows[product_id][1].get())
+        except ValueError:
+            return  # Empty or still being typed
+        user_id = self.current_user_id()
+        if quantity == item.quantity:
+            return
+        if quantity <= 0 or user_id is None:
+            self.update_quantity(product_id, quantity)
+            return
+        if product_id in self.holds_in_flight:
+            # One hold request per product at a time; this value is applied once it returns
+            self.holds_outdated.add(product_id)
+            return
 
-        if not self.cart_items:
-            # Show empty cart message
-            empty_label = tk.Label(self.scrollable_frame, 
-                                 text="Your cart is empty",
-                                 font=("Helvetica", 16),
-                                 bg=BACKGROUND_COLOR, fg=TEXT_COLOR)
-            empty_label.pack(pady=50)
-            self.total_label.config(text="Total: $0.00")
+        # Resize the hold first; the cart only changes once the stock is secured
+        self.holds_in_flight.add(product_id)
+        get_executor().submit(reserve, user_id, product_id, quantity,
+                              on_success=lambda result: self.on_quantity_reserved(user_id, product_id, quantity, result),
+                              on_error=lambda e: self.on_quantity_reserve_error(user_id, product_id, e))
+
+    def on_quantity_reserved(self, user_id, product_id, quantity, result):
+        if user_id != self.current_user_id():
+            return  # The user logged out meanwhile; the hold stays theirs
+        self.holds_in_flight.discard(product_id)
+        success, available = result
+        if success:
+            if self.cart.get(product_id) is None:
+                # Removed while the hold was being resized; drop the hold again
+                self.release_hold(user_id, product_id)
+            self.update_quantity(product_id, quantity)
+        else:
+            messagebox.showwarning("Insufficient Stock", f"Only {available} items available in stock.")
+            self.revert_quantity(product_id)
+        self.apply_outdated_entry(product_id)
+
+    def on_quantity_reserve_error(self, user_id, product_id, error):
+        if user_id != self.current_user_id():
             return
+        self.holds_in_flight.discard(product_id)
+        print(f"Error reserving stock: {error}")
+        messagebox.showerror("Error", "Failed to update the quantity. Please try again.")
+        self.revert_quantity(product_id)
+        # The failed request may or may not have changed the hold; put it back to what the cart holds
+        item = self.cart.get(product_id)
+        if item is not None:
+            get_executor().submit(reserve, user_id, product_id, item.quantity,
+                                  on_error=lambda e: print(f"Error restoring stock hold: {e}"))
+        self.apply_outdated_entry(product_id)
+
+    def apply_outdated_entry(self, product_id):
+        """Apply a quantity typed while the previous one was still being held"""
+        if product_id in self.holds_outdated:
+            self.holds_outdated.discard(product_id)
+            self.apply_quantity_entry(product_id)
+
+    def release_hold(self, user_id, product_id):
+        get_executor().submit(release, user_id, product_id,
+                              on_error=lambda e: print(f"Error releasing stock hold: {e}"))
+
+    def revert_quantity(self, product_id):
+        """Put a row's quantity entry back to what the cart holds"""
+        item = self.cart.get(product_id)
+        if item is not None and product_id in self.cart_rows:
+            self.cart_rows[product_id][1].set(str(item.quantity))
 
-        # Calculate total
-        total = sum(item["price"] * item["quantity"] for item in self.cart_items)
-        self.total_label.config(text=f"Total: ${total:.2f}")
-
-        # Display cart items
-        for item in self.cart_items:
-            item_frame = tk.Frame(self.scrollable_frame, bg=CARD_BACKGROUND, bd=1, relief="solid")
-            item_frame.pack(fill="x", padx=10, pady=5)
-
-            # Product name and price
-            info_frame = tk.Frame(item_frame, bg=CARD_BACKGROUND)
-            info_frame.pack(side="left", fill="x", expand=True, padx=10, pady=10)
-
-            name_label = tk.Label(info_frame, text=item["name"],
-                              font=("Helvetica", 12, "bold"),
-                              bg=CARD_BACKGROUND, fg=TEXT_COLOR)
-            name_label.pack(anchor="w")
-
-            price_label = tk.Label(info_frame, text=f"${item['price']:.2f}",
-                               font=("Helvetica", 12),
-                               bg=CARD_BACKGROUND, fg=PRIMARY_COLOR)
-            price_label.pack(anchor="w")
-
-            # Quantity controls
-            quantity_frame = tk.Frame(item_frame, bg=CARD_BACKGROUND)
-            quantity_frame.pack(side="right", padx=10, pady=10)
-
-            quantity_var = tk.StringVar(value=str(item["quantity"]))
-            quantity_var.trace("w", lambda name, index, mode, p_id=item["product_id"], var=quantity_var: 
-                            self.update_quantity(p_id, int(var.get() or 0)))
-
-            quantity_entry = tk.Entry(quantity_frame, textvariable=quantity_var,
-                                    width=3, font=("Helvetica", 12),
-                                    justify="center")
-            quantity_entry.pack(side="left", padx=5)
-
-            # Remove button
-            remove_button = tk.Button(item_frame, text="×",
-                                    font=("Helvetica", 14, "bold"),
-                                    bg="red", fg="white",
-                                    activebackground="#dc3545", activeforeground="white",
-                                    command=lambda p_id=item["product_id"]: self.remove_from_cart(p_id))
-            remove_button.pack(side="right", padx=10)
+    def update_cart_display(self):
+        """Update the total and the empty cart message"""
+        self.total_label.config(text=f"Total: ${self.cart.total:.2f}")
+        if len(self.cart):
+            self.empty_label.pack_forget()
+        else:
+            # Show empty cart message
+            self.empty_label.pack(pady=50)
+
+    def create_cart_row(self, item):
+        """Create the widgets for one cart item"""
+        item_frame = tk.Frame(self.scrollable_frame, bg=CARD_BACKGROUND, bd=1, relief="solid")
+        item_frame.pack(fill="x", padx=10, pady=5)
+
+        # Product name and price
+        info_frame = tk.Frame(item_frame, bg=CARD_BACKGROUND)
+        info_frame.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+
+        name_label = tk.Label(info_frame, text=item.product.name,
+                          font=("Helvetica", 12, "bold"),
+                          bg=CARD_BACKGROUND, fg=TEXT_COLOR)
+        name_label.pack(anchor="w")
+
+        price_label = tk.Label(info_frame, text=f"${item.product.price:.2f}",
+                           font=("Helvetica", 12),
+                           bg=CARD_BACKGROUND, fg=PRIMARY_COLOR)
+        price_label.pack(anchor="w")
+
+        # Quantity controls
+        quantity_frame = tk.Frame(item_frame, bg=CARD_BACKGROUND)
+        quantity_frame.pack(side="right", padx=10, pady=10)
+
+        quantity_var = tk.StringVar(value=str(item.quantity))
+        quantity_var.trace("w", lambda name, index, mode, p_id=item.product.id, var=quantity_var: 
+                        self.on_quantity_entry(p_id, var))
+
+        quantity_entry = tk.Entry(quantity_frame, textvariable=quantity_var,
+                                width=3, font=("Helvetica", 12),
+                                justify="center")
+        quantity_entry.pack(side="left", padx=5)
+
+        # Remove button
+        remove_button = tk.Button(item_frame, text="×",
+                                font=("Helvetica", 14, "bold"),
+                                bg="red", fg="white",
+                                activebackground="#dc3545", activeforeground="white",
+                                command=lambda p_id=item.product.id: self.remove_from_cart(p_id))
+        remove_button.pack(side="right", padx=10)
+
+        self.cart_rows[item.product.id] = (item_frame, quantity_var)
 
     def proceed_to_checkout(self):
         """Handle the checkout process"""
-        if not self.cart_items:
+        if not len(self.cart):
             messagebox.showwarning("Empty Cart", "Your cart is empty. Add some products first!")
             return
 
-        # TODO: Implement payment processing
-        messagebox.showinfo("Checkout", "Payment processing will be implemented here!")
+        if not self.auth or not self.auth.current_user_id:
+            messagebox.showwarning("Not Logged In", "Please log in to place an order.")
+            return
+
+        shipping_address = simpledialog.askstring("Shipping Address",
+                                                  "Where should we ship your order?",
+                                                  parent=self)
+        if not shipping_address:
+            return
+
+        # Place the order off the Tk thread; it is a single transaction
+        self.checkout_button.config(state="disabled")
+        user_id = self.auth.current_user_id
+        items = [(item.product.id, item.quantity) for item in self.cart]
+        get_executor().submit(place_order, user_id, items, shipping_address,
+                              on_success=lambda order_id: self.on_order_result(user_id, items, order_id),
+                              on_error=self.on_order_error, key="checkout")
+
+    def on_order_result(self, user_id, items, order_id):
+        self.checkout_button.config(state="normal")
+        if user_id != self.current_user_id():
+            # The session ended while the order was placed; the cart on screen
+            # is someone else's now, so only empty the saved copy
+            for product_id, _ in items:
+                get_cart_store().record(user_id, product_id, 0)
+            return
+        self.releasing = False
+        try:
+            self.cart.clear()
+        finally:
+            self.releasing = True
+        messagebox.showinfo("Order Placed", f"Thank you! Your order #{order_id} has been placed.")
+        if self.on_order_placed:
+            self.on_order_placed()
+
+    def on_order_error(self, error):
+        self.checkout_button.config(state="normal")
+        if isinstance(error, CheckoutError):
+            messagebox.showwarning("Checkout Failed", str(error))
+        else:
+            print(f"Error during checkout: {error}")
+            messagebox.showerror("Error", "An error occurred during checkout. Please try again.")
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 from services.auth import Auth
+from services.executor import get_executor
 
 # Colors
 PRIMARY_COLOR = "#007BFF"  # Electric Blue
@@ -61,13 +62,13 @@ class LoginScreen(tk.Frame):
         self.password_entry.pack(padx=40, pady=(0, 20), ipady=6, fill="x")
 
         # Login button
-        login_button = tk.Button(
+        self.login_button = tk.Button(
             center_frame, text="Login", font=("Helvetica", 12, "bold"),
             bg=PRIMARY_COLOR, fg=BACKGROUND_COLOR,
             activebackground="#0056b3", activeforeground=BACKGROUND_COLOR,
             command=self.login_action
         )
-        login_button.pack(padx=40, pady=(10, 20), ipadx=10, ipady=6, fill="x")
+        self.login_button.pack(padx=40, pady=(10, 20), ipadx=10, ipady=6, fill="x")
 
         # Forgot Password
         forgot_label = tk.Label(
@@ -92,10 +93,23 @@ class LoginScreen(tk.Frame):
             messagebox.showwarning("Missing Info", "Please fill in all fields.")
             return
 
-        success, message = self.auth.login(username, password)
+        # Check credentials off the Tk thread so the window stays responsive
+        self.login_button.config(state="disabled")
+        get_executor().submit(self.auth.login, username, password,
+                              on_success=self.on_login_result,
+                              on_error=self.on_login_error, key="login")
+
+    def on_login_result(self, result):
+        self.login_button.config(state="normal")
+        success, message = result
         
         if success:
             messagebox.showinfo("Login Success", message)
             self.switch_to_products()
         else:
             messagebox.showerror("Login Failed", message)
+
+    def on_login_error(self, error):
+        self.login_button.config(state="normal")
+        print(f"Error during login: {error}")
+        messagebox.showerror("Login Failed", "An error occurred during login")
@@ -0,0 +1,184 @@
+# ui/product_grid.py
+
+class VirtualGrid:
+    """
+    A scrolling grid of equally sized cards that only builds widgets for the rows in view.
+
+    Items are laid out on a canvas as embedded windows. Instead of one widget tree
+    per item, the grid keeps a pool just large enough to cover the visible rows plus
+    ``buffer_rows`` above and below, and rebinds those cards to other items as the
+    view scrolls. ``create_card(parent)`` builds an empty card and
+    ``bind_card(card, item, card_width)`` points it at an item.
+
+    Cards are keyed by ``key(item)``. On every update an item that was already on
+    screen keeps its card, so only cards showing a different item (or an item
+    whose data changed) need reconfiguring; a resize just moves the existing
+    cards to their new cells.
+
+    If ``on_near_end`` is given it is called whenever the last row of items comes
+    into view, so the owner can append the next page.
+    """
+
+    def __init__(self, canvas, scrollbar, create_card, bind_card, key=lambda item: item,
+                 min_column_width=300, min_columns=3, aspect_ratio=1.4,
+                 padding=15, buffer_rows=1, on_near_end=None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self.key = key
+        self.min_column_width = min_column_width
+        self.min_columns = min_columns
+        self.aspect_ratio = aspect_ratio
+        self.padding = padding
+        self.buffer_rows = buffer_rows
+        self.on_near_end = on_near_end
+
+        self.items = []
+        self.num_columns = min_columns
+        self.card_width = 0
+        self.card_height = 0
+        self._bound = {}  # key -> _Slot showing that item
+        self._free = []   # hidden slots ready for reuse
+
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.configure(command=self.canvas.yview)
+
+    def set_items(self, items):
+        """Show a new list of items, keeping the scroll position where possible."""
+        self.items = items
+        self.relayout()
+
+    def relayout(self):
+        """Recompute columns and card size from the canvas width, then redraw the visible rows."""
+        width = self.canvas.winfo_width()
+        self.num_columns, self.card_width, self.card_height = self._geometry(width)
+        rows = -(-len(self.items) // self.num_columns)
+        self.canvas.configure(scrollregion=(0, 0, width, rows * self._row_height()))
+        self.render()
+
+    def resize(self):
+        """
+        React to a canvas size change without rebinding anything that can stay.
+        The grid is only laid out again when the column count or card size changes;
+        otherwise the visible rows are topped up for the new height.
+        """
+        if self._geometry(self.canvas.winfo_width()) != (self.num_columns, self.card_width, self.card_height):
+            self.relayout()
+        else:
+            self.render()
+
+    def _geometry(self, width):
+        num_columns = max(self.min_columns, width // self.min_column_width)
+        card_width = max(1, (width - 2 * self.padding * num_columns) // num_columns)
+        return num_columns, card_width, int(card_width * self.aspect_ratio)
+
+    def render(self):
+        """Bind pooled cards to the items in (and just around) the visible area."""
+        row_height = self._row_height()
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // row_height) - self.buffer_rows)
+        last_row = int(bottom // row_height) + self.buffer_rows
+        first = first_row * self.num_columns
+        last = min(len(self.items), (last_row + 1) * self.num_columns)
+
+        wanted = [(index, self.key(self.items[index])) for index in range(first, last)]
+        wanted_keys = {key for _, key in wanted}
+        released = [slot for key, slot in self._bound.items() if key not in wanted_keys]
+        free = self._free + released
+
+        bound = {}
+        for index, key in wanted:
+            slot = self._bound.get(key)
+            if slot is None:
+                slot = free.pop() if free else self._new_slot()
+            row, col = divmod(index, self.num_columns)
+            x = col * (self.card_width + 2 * self.padding) + self.padding
+            y = row * row_height + self.padding
+            slot.place(x, y, self.card_width, self.card_height)
+            self.bind_card(slot.card, self.items[index], self.card_width)
+            bound[key] = slot
+
+        for slot in released:
+            if slot in free:
+                slot.hide()
+        self._bound = bound
+        self._free = free
+
+        if self.on_near_end and last >= len(self.items) - self.num_columns:
+            self.on_near_end()
+
+    def visible_cards(self):
+        """Return the cards currently bound to items."""
+        return [slot.card for slot in self._bound.values()]
+
+    def card_for(self, key):
+        """Return the card showing the item with ``key``, or None if it is not in view."""
+        slot = self._bound.get(key)
+        return slot.card if slot else None
+
+    def _new_slot(self):
+        card = self.create_card(self.canvas)
+        window = self.canvas.create_window(0, 0, window=card, anchor="nw", state="hidden")
+        return _Slot(self.canvas, card, window)
+
+    def _row_height(self):
+        return max(1, self.card_height + 2 * self.padding)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render()
+
+
+class _Slot:
+    """A pooled card and its canvas window, remembering its geometry to skip no-op updates."""
+
+    __slots__ = ("canvas", "card", "window", "geometry")
+
+    def __init__(self, canvas, card, window):
+        self.canvas = canvas
+        self.card = card
+        self.window = window
+        self.geometry = None
+
+    def place(self, x, y, width, height):
+        geometry = (x, y, width, height)
+        if geometry == self.geometry:
+            return
+        if self.geometry is None or self.geometry[2:] != geometry[2:]:
+            self.canvas.itemconfigure(self.window, width=width, height=height, state="normal")
+        self.canvas.coords(self.window, x, y)
+        self.geometry = geometry
+
+    def hide(self):
+        self.canvas.itemconfigure(self.window, state="hidden")
+        self.geometry = None
+
+
+class LayoutScheduler:
+    """
+    Coalesces bursts of events into a single callback per idle cycle.
+
+    Dragging a window edge fires dozens of ``<Configure>`` events; ``schedule`` only
+    queues ``callback`` if it is not already pending, so the layout runs once after
+    Tk has processed the whole burst.
+    """
+
+    def __init__(self, widget, callback):
+        self.widget = widget
+        self.callback = callback
+        self._pending = None
+
+    def schedule(self, event=None):
+        if self._pending is None:
+            self._pending = self.widget.after_idle(self._run)
+
+    def cancel(self):
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+
+    def _run(self):
+        self._pending = None
+        self.callback()
@@ -2,10 +2,15 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from services.database import get_db_connection, close_db_connection
-from mysql.connector import Error
+from services.catalog import get_catalog, get_products_page, search_products_ranked
+from services.executor import get_executor
+from services.reservations import reserve
+from services.search import get_search_index
+from config import CATALOG_CONFIG, SEARCH_CONFIG, THUMBNAIL_CONFIG
 import os
 from ui.cart_screen import CartScreen
+from ui.product_grid import LayoutScheduler, VirtualGrid
+from ui.thumbnails import ThumbnailCache
 
 # Modern Color Scheme
 PRIMARY_COLOR = "#2563EB"      # Vibrant Blue
@@ -25,97 +30,181 @@ HEADER_FONT = ("Inter", 16, "bold")
 BODY_FONT = ("Inter", 12)
 SMALL_FONT = ("Inter", 10)
 
-def get_product_by_id(product_id):
+def load_products(search_text="", category=None):
     """
-    Get a single product by its ID.
+    Fetch the products matching a search text and category.
+    Blocking; run it through the query executor from UI code.
     Args:
-        product_id (int): The ID of the product to retrieve.
+        search_text (str): Partial product name, or empty for all products.
+        category (str): Category name to keep, or None/"All" for every category.
     Returns:
-        dict: Product details with category name, or None if not found.
+        list of Product: Matching products with category names.
     """
-    connection = get_db_connection()
-    product = None
-    if connection:
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute('''
-                SELECT p.id, p.name, p.description, p.price, p.stock, p.image_path, c.name AS category
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.id
-                WHERE p.id = %s
-            ''', (product_id,))
-            product = cursor.fetchone()
-        except Error as e:
-            print(f"Error getting product by ID: {str(e)}")
-        finally:
-            close_db_connection(connection)
-    return product
-
-def get_all_products():
-    """
-    Get all products with their category names.
-    Returns:
-        list of dict: All products with category names.
-    """
-    connection = get_db_connection()
-    products = []
-    if connection:
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute('''
-                SELECT p.id, p.name, p.description, p.price, p.stock, p.image_path, c.name AS category
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.id
-                ORDER BY p.name
-            ''')
-            products = cursor.fetchall()
-        except Error as e:
-            print(f"Error getting all products: {str(e)}")
-        finally:
-            close_db_connection(connection)
-    return products
-
-def search_products_by_name(name):
-    """
-    Search for products by (partial) name match.
-    Args:
-        name (str): The search string (case-insensitive, partial match).
-    Returns:
-        list of dict: Matching products with category names.
-    """
-    connection = get_db_connection()
-    products = []
-    if connection:
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute('''
-                SELECT p.id, p.name, p.description, p.price, p.stock, p.image_path, c.name AS category
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.id
-                WHERE p.name LIKE %s
-            ''', (f"%{name}%",))
-            products = cursor.fetchall()
-        except Error as e:
-            print(f"Error searching products by name: {str(e)}")
-        finally:
-            close_db_connection(connection)
-    return products
+    if category == "All":
+        category = None
+    if search_text and SEARCH_CONFIG['mode'] == 'server':
+        return search_products_ranked(search_text, category, limit=SEARCH_CONFIG['page_size'])
+    products = get_catalog().get_products()
+    if not search_text and category is None:
+        return products
+    return get_search_index(products).search(search_text, category)
+
+class ProductCard(tk.Frame):
+    """A reusable product card; build it once, then bind it to any product."""
+
+    def __init__(self, parent, screen):
+        super().__init__(parent, bg=CARD_BACKGROUND, bd=1, relief="solid")
+        self.screen = screen
+        self.product = None
+        self.card_width = None
+        self.pack_propagate(False)
+
+        # Product image
+        self.image_label = tk.Label(self, bg=CARD_BACKGROUND)
+        self.image_label.pack(pady=(10, 0))
+        
+        # Product details
+        details_frame = tk.Frame(self, bg=CARD_BACKGROUND)
+        details_frame.pack(fill="both", expand=True, padx=20, pady=15)
+        
+        # Product name
+        self.name_label = tk.Label(details_frame, bg=CARD_BACKGROUND, fg=TEXT_COLOR,
+                                   justify="left")
+        self.name_label.pack(anchor="w", pady=(0, 10))
+        
+        # Price
+        self.price_label = tk.Label(details_frame, bg=CARD_BACKGROUND, fg=PRIMARY_COLOR)
+        self.price_label.pack(anchor="w", pady=(0, 10))
+        
+        # Category
+        category_frame = tk.Frame(details_frame, bg=CARD_BACKGROUND)
+        category_frame.pack(anchor="w", pady=(0, 10))
+        
+        self.category_label = tk.Label(category_frame, bg=CARD_BACKGROUND, fg=TEXT_COLOR)
+        self.category_label.pack(side="left")
+        
+        # Stock status with color coding
+        stock_frame = tk.Frame(details_frame, bg=CARD_BACKGROUND)
+        stock_frame.pack(anchor="w", pady=(0, 10))
+        
+        self.stock_label = tk.Label(stock_frame, bg=CARD_BACKGROUND)
+        self.stock_label.pack(side="left")
+        
+        # Add to Cart button with quantity selector
+        add_cart_frame = tk.Frame(self, bg=CARD_BACKGROUND)
+        add_cart_frame.pack(fill="x", padx=20, pady=10, side="bottom")
+
+        # Quantity controls
+        quantity_frame = tk.Frame(add_cart_frame, bg=CARD_BACKGROUND)
+        quantity_frame.pack(side="left", padx=(0, 10))
+
+        self.quantity_var = tk.StringVar(value="1")
+
+        # Decrease quantity button
+        decrease_btn = tk.Button(quantity_frame, text="-", 
+                               font=("Inter", 12, "bold"),
+                               bg=PRIMARY_COLOR, fg="white",
+                               activebackground=SECONDARY_COLOR, activeforeground="white",
+                               command=lambda: self.screen.update_quantity(self.product.id, -1))
+        decrease_btn.pack(side="left")
+
+        # Quantity display
+        quantity_label = tk.Label(quantity_frame, 
+                                textvariable=self.quantity_var,
+                                font=("Inter", 12),
+                                bg=CARD_BACKGROUND, fg=TEXT_COLOR,
+                                width=3)
+        quantity_label.pack(side="left", padx=5)
+
+        # Increase quantity button
+        increase_btn = tk.Button(quantity_frame, text="+", 
+                               font=("Inter", 12, "bold"),
+                               bg=PRIMARY_COLOR, fg="white",
+                               activebackground=SECONDARY_COLOR, activeforeground="white",
+                               command=lambda: self.screen.update_quantity(self.product.id, 1))
+        increase_btn.pack(side="left")
+
+        # Add to Cart button
+        self.add_btn = tk.Button(add_cart_frame, text="Add to Cart",
+                                 bg=PRIMARY_COLOR, fg="white",
+                                 activebackground=SECONDARY_COLOR, activeforeground="white",
+                                 command=lambda: self.screen.add_to_cart(
+                                     self.product, self.screen.get_quantity(self.product.id)))
+        self.add_btn.pack(side="right", fill="x", expand=True)
+
+    def bind_product(self, product, card_width):
+        """Show ``product`` on this card, sized for ``card_width``; unchanged parts are left alone"""
+        previous = self.product
+        self.product = product
+
+        if card_width != self.card_width:
+            self.card_width = card_width
+            # Calculate font sizes based on card width
+            title_font_size = max(10, min(16, card_width // 20))
+            price_font_size = max(12, min(20, card_width // 18))
+            info_font_size = max(8, min(14, card_width // 25))
+            self.name_label.config(font=("Inter", title_font_size, "bold"),
+                                   wraplength=card_width-40)
+            self.price_label.config(font=("Inter", price_font_size, "bold"))
+            self.category_label.config(font=("Inter", info_font_size))
+            self.stock_label.config(font=("Inter", info_font_size))
+            self.add_btn.config(font=("Inter", info_font_size, "bold"))
+
+        if previous is not None and previous.id == product.id:
+            if self.card_data(previous) == self.card_data(product):
+                return
+        else:
+            self.quantity_var.set(str(self.screen.get_quantity(product.id)))
+
+        if previous is None or previous.image_path != product.image_path:
+            image_path = product.image_path
+            image = self.screen.load_product_image(
+                product.name, image_path,
+                callback=lambda image: self.show_image(image, image_path))
+            self.image_label.config(image=image or "")
+            self.image_label.image = image  # Keep a reference
+
+        self.name_label.config(text=product.name)
+        self.price_label.config(text=f"${product.price:.2f}")
+        self.category_label.config(text=product.category)
+        stock_color = SUCCESS_COLOR if product.stock > 10 else WARNING_COLOR
+        self.stock_label.config(text=f"Stock: {product.stock}", fg=stock_color)
+
+    def show_image(self, image, image_path):
+        """Show a thumbnail that finished loading, unless the card moved on to another image"""
+        if image is None or self.product is None or self.product.image_path != image_path:
+            return
+        self.image_label.config(image=image)
+        self.image_label.image = image
+
+    @staticmethod
+    def card_data(product):
+        """The product fields shown on a card"""
+        return (product.name, product.price, product.category,
+                product.stock, product.image_path)
 
 class ProductListScreen(tk.Frame):
     def __init__(self, master, auth):
         super().__init__(master)
-        self.connection = None
         self.auth = auth
-        self.connect()
         self.configure(bg=BACKGROUND_COLOR)
         
         # Initialize cart screen
-        self.cart_screen = CartScreen(master, self.show_products)
+        self.cart_screen = CartScreen(master, self.show_products, auth,
+                                      on_order_placed=self.filter_products)
         self.cart_screen.grid(row=0, column=0, sticky="nsew")
         self.cart_screen.grid_remove()  # Hide cart screen initially
+        self.cart_screen.restore_cart()
         
-        # Dictionary to store quantity variables for each product
-        self.quantity_vars = {}
+        # Selected quantity per product id; cards are recycled, so this outlives them
+        self.quantities = {}
+
+        # Units clicked per product id while its stock hold is still being placed
+        self.pending_holds = {}
+
+        # Scaled product images, shared by every card and decoded off the Tk thread
+        self.thumbnails = ThumbnailCache(**THUMBNAIL_CONFIG)
+        self.thumbnails.bind(self)
         
         # Get current user's name
         self.current_user = self.get_current_user()
@@ -172,7 +261,8 @@ class ProductListScreen(tk.Frame):
         search_frame.pack(side="left", padx=10)
         
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", lambda name, index, mode: self.filter_products())
+        self.search_var.trace("w", lambda name, index, mode: self.schedule_filter())
+        self.filter_after_id = None
         
         search_entry = tk.Entry(search_frame, textvariable=self.search_var,
                               font=BODY_FONT, bg=CARD_BACKGROUND,
@@ -193,20 +283,24 @@ class ProductListScreen(tk.Frame):
                               command=self.show_cart)
         cart_button.pack(side="left", padx=10)
 
+        # Number of items in the cart, kept current by cart change notifications
+        self.cart_badge = tk.Label(right_header, text="0",
+                                 font=SMALL_FONT, bg=ACCENT_COLOR,
+                                 fg="white", padx=6)
+        self.cart_badge.pack(side="left")
+        self.cart_screen.cart.subscribe(
+            lambda event, item: self.cart_badge.config(text=str(self.cart_screen.cart.count)))
+
         # Category filter section
-        category_frame = tk.Frame(main_container, bg=BACKGROUND_COLOR)
-        category_frame.grid(row=1, column=0, sticky="ew", pady=(0, 20))
+        self.category_frame = tk.Frame(main_container, bg=BACKGROUND_COLOR)
+        self.category_frame.grid(row=1, column=0, sticky="ew", pady=(0, 20))
         
-        # Category buttons
+        # Category buttons; the rest are loaded from the categories table
         self.category_buttons = {}
-        categories = ["All", "Clothing", "Electronics", "Footwear", "Accessories"]
-        for category in categories:
-            btn = tk.Button(category_frame, text=category,
-                          font=SMALL_FONT, bg=CARD_BACKGROUND,
-                          fg=TEXT_COLOR, relief="flat",
-                          command=lambda c=category: self.select_category(c))
-            btn.pack(side="left", padx=5)
-            self.category_buttons[category] = btn
+        self.category_ids = {}
+        self.add_category_button("All")
+        get_executor().submit(get_catalog().get_categories,
+                              on_success=self.show_categories, key="categories")
 
         # Products grid
         self.products_frame = tk.Frame(main_container, bg=BACKGROUND_COLOR)
@@ -220,23 +314,49 @@ class ProductListScreen(tk.Frame):
         self.canvas.grid(row=0, column=0, sticky="nsew")
         
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(self.products_frame, orient="vertical",
-                                command=self.canvas.yview)
+        scrollbar = ttk.Scrollbar(self.products_frame, orient="vertical")
         scrollbar.grid(row=0, column=1, sticky="ns")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Create frame inside canvas for products
-        self.products_container = tk.Frame(self.canvas, bg=BACKGROUND_COLOR)
-        self.canvas.create_window((0, 0), window=self.products_container,
-                                anchor="nw", width=self.canvas.winfo_width())
+        # Only the visible product cards exist as widgets; they are rebound while scrolling
+        self.product_grid = VirtualGrid(self.canvas, scrollbar,
+                                        create_card=lambda parent: ProductCard(parent, self),
+                                        bind_card=lambda card, product, width: card.bind_product(product, width),
+                                        key=lambda product: product.id,
+                                        on_near_end=self.load_more_products)
+
+        # Keyset paging state while the catalog cache is still cold
+        self.page_category_id = None
+        self.next_page_after = None
+        self.has_more_pages = False
+        self.page_pending = False
         
-        # Bind canvas resize
+        # Bind canvas resize; a burst of resize events becomes one relayout
+        self.layout_scheduler = LayoutScheduler(self, self.product_grid.resize)
         self.canvas.bind("<Configure>", self.on_canvas_resize)
         self.bind("<Configure>", self.on_resize)
 
         # Load products
         self.update_product_grid()
 
+    def add_category_button(self, category, label=None):
+        """Add a button to the category bar"""
+        btn = tk.Button(self.category_frame, text=label or category,
+                      font=SMALL_FONT, bg=CARD_BACKGROUND,
+                      fg=TEXT_COLOR, relief="flat",
+                      command=lambda c=category: self.select_category(c))
+        btn.pack(side="left", padx=5)
+        self.category_buttons[category] = btn
+
+    def show_categories(self, categories):
+        """Show a button per category, labelled with its product count"""
+        for category in categories:
+            self.category_ids[category.name] = category.id
+            label = f"{category.name} ({category.product_count})"
+            if category.name in self.category_buttons:
+                self.category_buttons[category.name].config(text=label)
+            else:
+                self.add_category_button(category.name, label)
+
     def select_category(self, category):
         """Handle category selection"""
         for btn in self.category_buttons.values():
@@ -244,8 +364,17 @@ class ProductListScreen(tk.Frame):
         self.category_buttons[category]['relief'] = 'sunken'
         self.filter_products()
 
+    def schedule_filter(self):
+        """Debounce search input so filtering runs once the user pauses typing"""
+        if self.filter_after_id is not None:
+            self.after_cancel(self.filter_after_id)
+        self.filter_after_id = self.after(SEARCH_CONFIG['debounce_ms'], self.filter_products)
+
     def filter_products(self):
         """Filter products based on search text and selected category"""
+        if self.filter_after_id is not None:
+            self.after_cancel(self.filter_after_id)
+            self.filter_after_id = None
         search_text = self.search_var.get().lower()
         selected_category = None
         
@@ -255,249 +384,185 @@ class ProductListScreen(tk.Frame):
                 selected_category = category
                 break
         
-        # Get products from database
-        if search_text:
-            products = search_products_by_name(search_text)
-        else:
-            products = self.get_products_from_db()
-        
-        # Filter by category if one is selected
-        if selected_category and selected_category != "All":
-            products = [p for p in products if p['category'] == selected_category]
-        
-        # Update the product grid
-        self.update_product_grid(products)
+        # Stop appending pages of the unfiltered catalog
+        self.has_more_pages = False
+        get_executor().cancel("catalog-page")
+
+        # Until the catalog cache is warm, browse page by page, filtering by category in SQL
+        if not search_text and not get_catalog().is_loaded():
+            get_executor().cancel("catalog")
+            self.start_paging(self.category_ids.get(selected_category))
+            return
+
+        # Query off the Tk thread; a newer filter supersedes any pending one
+        get_executor().submit(load_products, search_text, selected_category,
+                              on_success=self.update_product_grid, key="catalog")
+
+    def start_paging(self, category_id=None):
+        """Show the first page of the catalog now and fetch the rest as the user scrolls"""
+        self.page_category_id = category_id
+        self.next_page_after = None
+        self.has_more_pages = True
+        self.page_pending = False
+        self.update_product_grid([])
+        self.load_more_products()
+
+    def load_more_products(self):
+        """Fetch the next catalog page in the background, if one is due"""
+        if not self.has_more_pages or self.page_pending:
+            return
+        self.page_pending = True
+        get_executor().submit(get_products_page, self.next_page_after, CATALOG_CONFIG['page_size'],
+                              self.page_category_id,
+                              on_success=self.on_products_page,
+                              on_error=self.on_products_page_error, key="catalog-page")
+
+    def on_products_page(self, page):
+        """Append a fetched catalog page to the grid"""
+        self.page_pending = False
+        if not self.has_more_pages:
+            return
+        self.has_more_pages = len(page) == CATALOG_CONFIG['page_size']
+        if page:
+            self.next_page_after = (page[-1].name, page[-1].id)
+            self.update_product_grid(self.product_grid.items + page)
+
+    def on_products_page_error(self, error):
+        self.page_pending = False
+        print(f"Error loading products page: {error}")
 
     def on_canvas_resize(self, event):
-        self.canvas.itemconfig("all", width=event.width)
-        self.update_product_grid()
+        self.layout_scheduler.schedule()
 
     def on_resize(self, event):
-        self.canvas.configure(width=event.width)
-        self.update_product_grid()
+        # Only relayout the cards already loaded; resizing never touches the database
+        self.layout_scheduler.schedule()
 
     def update_product_grid(self, products=None):
         """Update the product grid with the given products"""
         if products is None:
-            products = self.get_products_from_db()
-            
-        # Clear existing products
-        for widget in self.products_container.winfo_children():
-            widget.destroy()
-        
-        # Recreate the grid with current window size
-        self.create_product_grid(self.products_container, products)
+            # Re-run the current filters in the background; this is called again with the result
+            self.filter_products()
+            return
 
-    def connect(self):
-        """Establish a new database connection"""
-        try:
-            if not self.connection or not self.connection.is_connected():
-                self.connection = get_db_connection()
-                if not self.connection:
-                    raise Exception("Failed to connect to database")
-        except Error as e:
-            print(f"Error connecting to database: {e}")
-            raise
-
-    def __del__(self):
-        if self.connection and self.connection.is_connected():
-            close_db_connection(self.connection)
+        # Rebind the visible cards at the current window size
+        self.product_grid.set_items(products)
 
     def get_products_from_db(self):
-        """Get all products from the database"""
-        return get_all_products()
-
-    def load_product_image(self, product_name, image_url=None):
-        """Load product image or placeholder if not available"""
+        """Get all products from the in-memory catalog cache"""
+        return get_catalog().get_products()
+
+    def load_product_image(self, product_name, image_url=None, callback=None):
+        """
+        Load product thumbnail or placeholder if not available.
+        Thumbnails are decoded in the background: if it is not cached yet, the
+        placeholder is returned and ``callback`` later receives the thumbnail.
+        """
+        assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
         try:
             # If image_url is provided, try to load it
             if image_url:
-                image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", image_url)
+                image_path = os.path.join(assets_dir, image_url)
                 if os.path.exists(image_path):
-                    try:
-                        image = tk.PhotoImage(file=image_path)
-                        # Resize the image to fit the card
-                        width = image.width()
-                        height = image.height()
-                        max_size = 200  # Maximum dimension for the image
-                        
-                        if width > height:
-                            subsample = max(1, width // max_size)
-                        else:
-                            subsample = max(1, height // max_size)
-                            
-                        image = image.subsample(subsample, subsample)
+                    image = self.thumbnails.request(image_path, callback or (lambda image: None))
+                    if image:
                         return image
-                    except tk.TclError as e:
-                        print(f"Error loading image for {product_name}: {e}")
             
-            # If no image_url or image not found, use placeholder
-            placeholder_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "Logo.png")
-            if os.path.exists(placeholder_path):
-                try:
-                    image = tk.PhotoImage(file=placeholder_path)
-                    image = image.subsample(4, 4)  # Make placeholder smaller
-                    return image
-                except tk.TclError as e:
-                    print(f"Error loading placeholder image: {e}")
-                    
-            return None
+            # Until then, or if no image_url or image not found, use placeholder
+            return self.thumbnails.get(os.path.join(assets_dir, "Logo.png"), factor=4)
         except Exception as e:
             print(f"Error in load_product_image: {e}")
             return None
 
-    def create_product_grid(self, parent, products):
-        # Create a frame for the grid
-        grid_frame = tk.Frame(parent, bg=BACKGROUND_COLOR)
-        grid_frame.pack(fill="both", expand=True, padx=20, pady=20)
+    def get_quantity(self, product_id):
+        """Get the selected quantity for a product"""
+        return self.quantities.get(product_id, 1)
 
-        # Calculate number of columns based on window width
-        window_width = self.winfo_width()
-        num_columns = max(3, window_width // 300)  # Minimum 3 columns
-        
-        # Calculate card dimensions
-        card_width = (window_width - 100) // num_columns
-        card_height = int(card_width * 1.4)
-
-        for i, product in enumerate(products):
-            row = i // num_columns
-            col = i % num_columns
-            
-            # Create product card with improved styling
-            card_frame = tk.Frame(grid_frame, bg=CARD_BACKGROUND, bd=1, relief="solid",
-                                width=card_width, height=card_height)
-            card_frame.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
-            card_frame.grid_propagate(False)
-            
-            # Configure grid weights
-            grid_frame.grid_columnconfigure(col, weight=1)
-            grid_frame.grid_rowconfigure(row, weight=1)
-            
-            # Product image
-            image = self.load_product_image(product["name"], product.get("image_path"))
-            if image:
-                image_label = tk.Label(card_frame, image=image, bg=CARD_BACKGROUND)
-                image_label.image = image  # Keep a reference
-                image_label.pack(pady=(10, 0))
-            
-            # Product details
-            details_frame = tk.Frame(card_frame, bg=CARD_BACKGROUND)
-            details_frame.pack(fill="both", expand=True, padx=20, pady=15)
-            
-            # Calculate font sizes based on card width
-            title_font_size = max(10, min(16, card_width // 20))
-            price_font_size = max(12, min(20, card_width // 18))
-            info_font_size = max(8, min(14, card_width // 25))
-            
-            # Product name
-            name = tk.Label(details_frame, text=product["name"],
-                          font=("Inter", title_font_size, "bold"),
-                          bg=CARD_BACKGROUND, fg=TEXT_COLOR,
-                          wraplength=card_width-40, justify="left")
-            name.pack(anchor="w", pady=(0, 10))
-            
-            # Price
-            price = tk.Label(details_frame, text=f"${product['price']:.2f}",
-                           font=("Inter", price_font_size, "bold"),
-                           bg=CARD_BACKGROUND, fg=PRIMARY_COLOR)
-            price.pack(anchor="w", pady=(0, 10))
-            
-            # Category
-            category_frame = tk.Frame(details_frame, bg=CARD_BACKGROUND)
-            category_frame.pack(anchor="w", pady=(0, 10))
-            
-            category = tk.Label(category_frame, text=product["category"],
-                              font=("Inter", info_font_size),
-                              bg=CARD_BACKGROUND, fg=TEXT_COLOR)
-            category.pack(side="left")
-            
-            # Stock status with color coding
-            stock_frame = tk.Frame(details_frame, bg=CARD_BACKGROUND)
-            stock_frame.pack(anchor="w", pady=(0, 10))
-            
-            stock_color = SUCCESS_COLOR if product["stock"] > 10 else WARNING_COLOR
-            stock = tk.Label(stock_frame, text=f"Stock: {product['stock']}",
-                           font=("Inter", info_font_size),
-                           bg=CARD_BACKGROUND, fg=stock_color)
-            stock.pack(side="left")
-            
-            # Add to Cart button with quantity selector
-            add_cart_frame = tk.Frame(card_frame, bg=CARD_BACKGROUND)
-            add_cart_frame.pack(fill="x", padx=20, pady=10, side="bottom")
-
-            # Quantity controls
-            quantity_frame = tk.Frame(add_cart_frame, bg=CARD_BACKGROUND)
-            quantity_frame.pack(side="left", padx=(0, 10))
-
-            # Store quantity variable in dictionary
-            self.quantity_vars[product["id"]] = tk.StringVar(value="1")
-
-            # Decrease quantity button
-            decrease_btn = tk.Button(quantity_frame, text="-", 
-                                   font=("Inter", 12, "bold"),
-                                   bg=PRIMARY_COLOR, fg="white",
-                                   activebackground=SECONDARY_COLOR, activeforeground="white",
-                                   command=lambda p=product: self.update_quantity(p["id"], -1))
-            decrease_btn.pack(side="left")
-
-            # Quantity display
-            quantity_label = tk.Label(quantity_frame, 
-                                    textvariable=self.quantity_vars[product["id"]],
-                                    font=("Inter", 12),
-                                    bg=CARD_BACKGROUND, fg=TEXT_COLOR,
-                                    width=3)
-            quantity_label.pack(side="left", padx=5)
-
-            # Increase quantity button
-            increase_btn = tk.Button(quantity_frame, text="+", 
-                                   font=("Inter", 12, "bold"),
-                                   bg=PRIMARY_COLOR, fg="white",
-                                   activebackground=SECONDARY_COLOR, activeforeground="white",
-                                   command=lambda p=product: self.update_quantity(p["id"], 1))
-            increase_btn.pack(side="left")
-
-            # Add to Cart button
-            add_btn = tk.Button(add_cart_frame, text="Add to Cart",
-                              font=("Inter", info_font_size, "bold"),
-                              bg=PRIMARY_COLOR, fg="white",
-                              activebackground=SECONDARY_COLOR, activeforeground="white",
-                              command=lambda p=product: self.add_to_cart(p, int(self.quantity_vars[p["id"]].get())))
-            add_btn.pack(side="right", fill="x", expand=True)
+    def set_quantity(self, product_id, quantity):
+        """Set the selected quantity for a product and show it on its card if visible"""
+        self.quantities[product_id] = quantity
+        card = self.product_grid.card_for(product_id)
+        if card:
+            card.quantity_var.set(str(quantity))
 
     def update_quantity(self, product_id, change):
         """Update the quantity for a product"""
-        if product_id in self.quantity_vars:
-            current_quantity = int(self.quantity_vars[product_id].get())
-            new_quantity = max(1, current_quantity + change)  # Ensure quantity is at least 1
-            self.quantity_vars[product_id].set(str(new_quantity))
+        new_quantity = max(1, self.get_quantity(product_id) + change)  # Ensure quantity is at least 1
+        self.set_quantity(product_id, new_quantity)
 
     def add_to_cart(self, product, quantity=1):
         """Add product to cart with specified quantity and show success message"""
         try:
-            if product["stock"] <= 0:
+            # Hold the stock for this customer before it goes into the cart; the
+            # reservation checks live stock rather than the possibly stale product
+            user_id = self.auth.current_user_id if self.auth else None
+            if user_id is not None:
+                if product.id in self.pending_holds:
+                    # One hold request per product at a time, so each one sets the
+                    # total the cart will hold after the previous one has landed
+                    self.pending_holds[product.id] += quantity
+                    return
+                self.pending_holds[product.id] = 0
+                in_cart = self.cart_screen.cart.get(product.id)
+                total = quantity + (in_cart.quantity if in_cart else 0)
+                get_executor().submit(reserve, user_id, product.id, total,
+                                      on_success=lambda result: self.on_reserved(user_id, product, quantity, result),
+                                      on_error=lambda error: self.on_reserve_error(user_id, product, error))
+                return
+
+            in_cart = self.cart_screen.cart.get(product.id)
+            total = quantity + (in_cart.quantity if in_cart else 0)
+
+            if product.stock <= 0:
                 messagebox.showwarning("Out of Stock", "This product is currently out of stock.")
                 return
                 
-            if quantity > product["stock"]:
+            if total > product.stock:
                 messagebox.showwarning("Insufficient Stock", 
-                                     f"Only {product['stock']} items available in stock.")
+                                     f"Only {product.stock} items available in stock.")
                 return
-                
-            # Add the product to cart with the specified quantity
-            for _ in range(quantity):
-                self.cart_screen.add_to_cart(product)
-                
-            # Update cart badge
-            current_count = int(self.cart_badge["text"])
-            self.cart_badge.config(text=str(current_count + quantity))
-                
-            messagebox.showinfo("Added to Cart", f"{quantity} {product['name']}(s) added to cart!")
-            # Reset quantity to 1 after adding to cart
-            self.quantity_vars[product["id"]].set("1")
+
+            self.confirm_add_to_cart(product, quantity)
         except Exception as e:
+            self.pending_holds.pop(product.id, None)
             print(f"Error adding product to cart: {e}")
             messagebox.showerror("Error", "Failed to add product to cart. Please try again.")
 
+    def on_reserved(self, user_id, product, quantity, result):
+        """Add the product to the cart once its stock is held"""
+        if user_id != self.auth.current_user_id:
+            return  # The user logged out meanwhile; the hold stays with their saved cart
+        queued = self.pending_holds.pop(product.id, 0)
+        success, available = result
+        if not success:
+            if available <= 0:
+                messagebox.showwarning("Out of Stock", "This product is currently out of stock.")
+                return
+            in_cart = self.cart_screen.cart.get(product.id)
+            available -= in_cart.quantity if in_cart else 0
+            messagebox.showwarning("Insufficient Stock",
+                                 f"Only {max(0, available)} more items available in stock.")
+            return
+        self.confirm_add_to_cart(product, quantity)
+        if queued:
+            self.add_to_cart(product, queued)
+
+    def on_reserve_error(self, user_id, product, error):
+        if user_id != self.auth.current_user_id:
+            return
+        self.pending_holds.pop(product.id, None)
+        print(f"Error reserving stock: {error}")
+        messagebox.showerror("Error", "Failed to add product to cart. Please try again.")
+
+    def confirm_add_to_cart(self, product, quantity):
+        """Put the product in the cart and show success message"""
+        # Add the product to cart with the specified quantity in one update
+        self.cart_screen.add_to_cart(product, quantity)
+            
+        messagebox.showinfo("Added to Cart", f"{quantity} {product.name}(s) added to cart!")
+        # Reset quantity to 1 after adding to cart
+        self.set_quantity(product.id, 1)
+
     def show_cart(self):
         """Show the cart screen"""
         self.grid_remove()
@@ -514,8 +579,23 @@ class ProductListScreen(tk.Frame):
         except Exception as e:
             print(f"Error updating user name: {e}")
 
+    def end_session(self):
+        """Forget the cart of a user who logged out or whose session expired"""
+        self.pending_holds.clear()
+        self.cart_screen.reset_cart()
+
+    def start_session(self):
+        """Show the products to a user who just logged in, with their saved cart"""
+        self.cart_screen.restore_cart()
+        self.show_products()
+
+    def destroy(self):
+        """Stop the thumbnail workers along with the window"""
+        self.thumbnails.shutdown()
+        super().destroy()
+
     def get_current_user(self):
-        """Get the current user's name from the Auth instance"""
-        if self.auth and self.auth.current_username:
-            return self.auth.current_username
+        """Get the current user's name from the session"""
+        if self.auth and self.auth.profile:
+            return self.auth.profile.display_name
         return "User"
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
-from services.database import get_db_connection, close_db_connection
+from services.executor import get_executor
+from services.registration import register_user
 from mysql.connector import Error
 
 # Colors
@@ -100,13 +101,13 @@ class SignupScreen(tk.Frame):
         self.building_entry.pack(padx=40, pady=(0, 10), ipady=6, fill="x")
 
         # Sign Up button
-        signup_button = tk.Button(
+        self.signup_button = tk.Button(
             center_frame, text="Sign Up", font=("Helvetica", 12, "bold"),
             bg=PRIMARY_COLOR, fg=BACKGROUND_COLOR,
             activebackground="#0056b3", activeforeground=BACKGROUND_COLOR,
             command=self.signup_action
         )
-        signup_button.pack(padx=40, pady=(20, 10), ipadx=10, ipady=6, fill="x")
+        self.signup_button.pack(padx=40, pady=(20, 10), ipadx=10, ipady=6, fill="x")
 
         # Footer
         footer = tk.Label(
@@ -134,56 +135,40 @@ class SignupScreen(tk.Frame):
             return
 
         try:
-            # Validate phone number
-            phone = int(phone)
+            # Validate phone number; it is stored as entered to keep leading zeros
+            int(phone)
             building = int(building)
         except ValueError:
             messagebox.showwarning("Invalid Input", "Phone number and building number must be numeric.")
             return
 
-        connection = None
-        try:
-            connection = get_db_connection()
-            if not connection:
-                raise Error("Failed to connect to database")
-                
-            cursor = connection.cursor()
-
-            # Check if username or email already exists
-            print("Checking for existing username/email...")
-            cursor.execute("""
-                SELECT id FROM users 
-                WHERE username = %s OR email = %s
-            """, (username, email))
-            
-            if cursor.fetchone():
-                messagebox.showerror("Sign Up Failed", "Username or email already exists.")
-                return
-
-            # Combine address components
-            full_address = f"{building} {street}, {city}"
-
-            # Insert new user
-            print("Inserting new user...")
-            cursor.execute("""
-                INSERT INTO users (username, password, email, name, phone_number, address)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (username, password, email, username, phone, full_address))
-            
-            connection.commit()
+        # Combine address components
+        full_address = f"{building} {street}, {city}"
+
+        # Write to the database off the Tk thread
+        self.signup_button.config(state="disabled")
+        get_executor().submit(register_user, username, password, email, phone, full_address,
+                              on_success=self.on_signup_result,
+                              on_error=self.on_signup_error, key="signup")
+
+    def on_signup_result(self, result):
+        self.signup_button.config(state="normal")
+        success, message = result
+        if success:
             print("User created successfully!")
-            messagebox.showinfo("Success", "Account created successfully!")
+            messagebox.showinfo("Success", message)
             self.switch_to_login()
+        else:
+            messagebox.showerror("Sign Up Failed", message)
 
-        except Error as e:
+    def on_signup_error(self, e):
+        self.signup_button.config(state="normal")
+        if isinstance(e, Error):
             print(f"Database Error during signup: {str(e)}")
             print(f"Error code: {e.errno}")
             print(f"SQL state: {e.sqlstate}")
             messagebox.showerror("Error", f"Database error: {str(e)}")
-        except Exception as e:
+        else:
             print(f"Unexpected Error during signup: {str(e)}")
             print(f"Error type: {type(e)}")
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-        finally:
-            if connection and connection.is_connected():
-                close_db_connection(connection) 
\ No newline at end of file
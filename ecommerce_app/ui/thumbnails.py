@@ -0,0 +1,200 @@
+# ui/thumbnails.py
+
+import base64
+import hashlib
+import io
+import os
+import tkinter as tk
+from collections import OrderedDict
+from services.executor import QueryExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it only PNG/GIF assets can be shown
+    Image = None
+
+
+def render_thumbnail(path, thumb_path, max_size, factor=None):
+    """
+    Produce the PNG thumbnail for ``path``, decoding and scaling it if not cached yet.
+    Runs on a worker thread and never touches Tk.
+    Args:
+        path (str): The source image (any format Pillow can read, e.g. JPEG or WEBP).
+        thumb_path (str): Where the cached PNG thumbnail lives.
+        max_size (int): Longest edge of the thumbnail when ``factor`` is None.
+        factor (int): Fixed downscale factor, or None to fit within ``max_size``.
+    Returns:
+        str: Base64-encoded PNG data, ready for ``tk.PhotoImage(data=...)``.
+    """
+    if os.path.exists(thumb_path):
+        with open(thumb_path, "rb") as f:
+            return base64.b64encode(f.read()).decode("ascii")
+
+    with Image.open(path) as source:
+        if factor:
+            size = (max(1, source.width // factor), max(1, source.height // factor))
+        else:
+            size = (max_size, max_size)
+        source.draft("RGB", size)  # lets the JPEG decoder skip detail we would throw away
+        image = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+        image.thumbnail(size)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    data = buffer.getvalue()
+
+    temp_path = f"{thumb_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, thumb_path)
+    except OSError as e:
+        print(f"Error caching thumbnail: {e}")
+    return base64.b64encode(data).decode("ascii")
+
+
+class ThumbnailCache:
+    """
+    Card-sized product thumbnails, scaled once and cached on disk and in memory.
+
+    A source image is decoded and scaled the first time it is requested, then
+    written as a PNG under ``cache_dir``. The file name is derived from the source
+    path, modification time and size plus the requested scale, so editing an asset
+    invalidates its thumbnail automatically. Decoded ``PhotoImage`` objects are kept
+    in a bounded LRU so rebuilding the grid reuses them without decoding anything.
+
+    ``request`` does the decoding and scaling on a worker pool with Pillow, which
+    also handles the JPEG and WEBP assets Tk cannot read, and hands the finished
+    PNG data back to the Tk thread. ``get`` is the synchronous path for small
+    PNG/GIF images such as the placeholder.
+    """
+
+    def __init__(self, cache_dir, max_size=200, memory_items=128, workers=2):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.memory_items = memory_items
+        self._images = OrderedDict()
+        self._failed = set()
+        self._waiting = {}
+        self._executor = QueryExecutor(max_workers=workers)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def bind(self, widget):
+        """Deliver decoded thumbnails through ``widget.after`` callbacks."""
+        self._executor.bind(widget)
+
+    def request(self, path, callback, factor=None):
+        """
+        Load a thumbnail in the background.
+        Args:
+            path (str): The source image.
+            callback (callable): Called on the Tk thread with the ``tk.PhotoImage``,
+                or with None if the image cannot be loaded.
+            factor (int): Fixed downscale factor, or None to fit within ``max_size``.
+        Returns:
+            tk.PhotoImage: The thumbnail if it is available right away (``callback`` is
+            not called), otherwise None.
+        """
+        try:
+            key = self._key(path, factor)
+        except OSError:
+            callback(None)
+            return None
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        if key in self._failed:
+            callback(None)
+            return None
+        if Image is None:
+            return self.get(path, factor)
+
+        # Several cards may show the same image; decode it once for all of them
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            return None
+        self._waiting[key] = [callback]
+        thumb_path = os.path.join(self.cache_dir, key + ".png")
+        self._executor.submit(render_thumbnail, path, thumb_path, self.max_size, factor,
+                              on_success=lambda data: self._deliver(key, path, data),
+                              on_error=lambda e: self._fail(key, path, e))
+        return None
+
+    def shutdown(self):
+        """Stop the decoding workers."""
+        self._executor.shutdown()
+
+    def _deliver(self, key, path, data):
+        try:
+            image = tk.PhotoImage(data=data)
+        except tk.TclError as e:
+            self._fail(key, path, e)
+            return
+        self._remember(key, image)
+        for callback in self._waiting.pop(key, []):
+            callback(image)
+
+    def _fail(self, key, path, error):
+        print(f"Error loading image {os.path.basename(path)}: {error}")
+        self._failed.add(key)
+        for callback in self._waiting.pop(key, []):
+            callback(None)
+
+    def _remember(self, key, image):
+        self._images[key] = image
+        if len(self._images) > self.memory_items:
+            self._images.popitem(last=False)
+
+    def get(self, path, factor=None):
+        """
+        Return a thumbnail for the image at ``path``.
+        Args:
+            path (str): The source image.
+            factor (int): Fixed subsample factor, or None to fit within ``max_size``.
+        Returns:
+            tk.PhotoImage: The thumbnail, or None if the image cannot be loaded.
+        """
+        try:
+            key = self._key(path, factor)
+        except OSError:
+            return None
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        if key in self._failed:
+            return None
+
+        thumb_path = os.path.join(self.cache_dir, key + ".png")
+        try:
+            if os.path.exists(thumb_path):
+                image = tk.PhotoImage(file=thumb_path)
+            else:
+                image = self._scale(tk.PhotoImage(file=path), factor)
+                self._store(image, thumb_path)
+        except tk.TclError as e:
+            print(f"Error loading image {os.path.basename(path)}: {e}")
+            self._failed.add(key)
+            return None
+
+        self._remember(key, image)
+        return image
+
+    def _key(self, path, factor):
+        stat = os.stat(path)
+        scale = f"x{factor}" if factor else f"max{self.max_size}"
+        raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{scale}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _scale(self, image, factor):
+        if factor is None:
+            factor = max(1, max(image.width(), image.height()) // self.max_size)
+        return image.subsample(factor, factor) if factor > 1 else image
+
+    def _store(self, image, thumb_path):
+        temp_path = thumb_path + ".tmp"
+        try:
+            image.write(temp_path, format="png")
+            os.replace(temp_path, thumb_path)
+        except (tk.TclError, OSError) as e:
+            print(f"Error caching thumbnail: {e}")